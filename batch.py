@@ -0,0 +1,394 @@
+# Modules
+import numpy as np
+
+# Files
+from bitboard import NUM_COLOURS, NUM_PIECE_TYPES
+from board import Board
+from constants import BOARD_HEIGHT, BOARD_WIDTH, Colours, PieceTypes
+from evaluation import (
+    ENDGAME_PIECE_SQUARE_TABLES, ENDGAME_PIECE_VALUES, FLIP_SQUARES, MAX_PHASE, PHASE_WEIGHTS, PIECE_SQUARE_TABLES,
+    PIECE_VALUES
+)
+from tables import (
+    BISHOP_DIRECTIONS, KING_DIRECTIONS, KNIGHT_DIRECTIONS, NUM_SQUARES, PAWN_DIRECTIONS, ROOK_DIRECTIONS
+)
+
+# Square encoding: 0 is empty, white pieces are their piece type plus one and black pieces are the negative
+MAX_CODE: int = NUM_PIECE_TYPES
+
+# Bitboard encoding: one bitboard per colour then piece type, white first
+NUM_BITBOARDS: int = NUM_COLOURS * NUM_PIECE_TYPES
+
+# Square code of each bitboard
+BITBOARD_CODES: np.ndarray = np.array(
+    [(pieceType + 1) * (1 if colour == Colours.WHITE.value else -1)
+     for colour in range(NUM_COLOURS) for pieceType in range(NUM_PIECE_TYPES)],
+    dtype=np.int8
+)
+
+# Bit of each square
+SQUARE_BITS: np.ndarray = np.uint64(1) << np.arange(NUM_SQUARES, dtype=np.uint64)
+
+# Set bits in each byte, to count the bits of bitboards
+BYTE_COUNTS: np.ndarray = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+# Functions
+def get_value_tables(values: tuple[int, ...], tables: tuple[tuple[int, ...], ...]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build the material and placement value of each square code on each square, from white's point of view.
+
+    Parameters:
+        values (tuple[int, ...]): Piece values, indexed by piece type
+        tables (tuple[tuple[int, ...], ...]): Piece-square tables, indexed by piece type
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Material and placement values, indexed by square code plus MAX_CODE then square
+    """
+    material: np.ndarray = np.zeros((2 * MAX_CODE + 1, NUM_SQUARES), dtype=np.int32)
+    placement: np.ndarray = np.zeros((2 * MAX_CODE + 1, NUM_SQUARES), dtype=np.int32)
+    for pieceType in range(NUM_PIECE_TYPES):
+        for colour, sign in ((Colours.WHITE.value, 1), (Colours.BLACK.value, -1)):
+            row: int = MAX_CODE + sign * (pieceType + 1)
+            material[row] = sign * values[pieceType]
+            for square in range(NUM_SQUARES):
+                placement[row, square] = sign * tables[pieceType][square ^ FLIP_SQUARES[colour]]
+    return material, placement
+
+def get_shifts(directions: tuple[tuple[int, int], ...]) -> list[tuple[int, np.uint64]]:
+    """
+    Build the bit shift of each direction, with the squares it can reach without wrapping around the board.
+
+    Parameters:
+        directions (tuple[tuple[int, int], ...]): x- y-directions of the steps
+
+    Returns:
+        list[tuple[int, np.uint64]]: Shift of the square index and bitboard of the reachable squares
+    """
+    shifts: list[tuple[int, np.uint64]] = []
+    for dx, dy in directions:
+        mask: int = 0
+        for y in range(BOARD_HEIGHT):
+            for x in range(BOARD_WIDTH):
+                if 0 <= x - dx < BOARD_WIDTH and 0 <= y - dy < BOARD_HEIGHT:
+                    mask |= 1 << (y * BOARD_WIDTH + x)
+        shifts.append((dy * BOARD_WIDTH + dx, np.uint64(mask)))
+    return shifts
+
+MATERIAL_VALUES, PLACEMENT_VALUES = get_value_tables(PIECE_VALUES, PIECE_SQUARE_TABLES)
+ENDGAME_MATERIAL_VALUES, ENDGAME_PLACEMENT_VALUES = get_value_tables(ENDGAME_PIECE_VALUES, ENDGAME_PIECE_SQUARE_TABLES)
+
+# Game phase added by each square code, indexed by square code plus MAX_CODE
+PHASE_VALUES: np.ndarray = np.array(
+    [PHASE_WEIGHTS[abs(code) - 1] if code else 0 for code in range(-MAX_CODE, MAX_CODE + 1)], dtype=np.int32
+)
+KNIGHT_SHIFTS: list[tuple[int, np.uint64]] = get_shifts(KNIGHT_DIRECTIONS)
+KING_SHIFTS: list[tuple[int, np.uint64]] = get_shifts(KING_DIRECTIONS)
+BISHOP_SHIFTS: list[tuple[int, np.uint64]] = get_shifts(BISHOP_DIRECTIONS)
+ROOK_SHIFTS: list[tuple[int, np.uint64]] = get_shifts(ROOK_DIRECTIONS)
+PAWN_ATTACK_SHIFTS: tuple[list[tuple[int, np.uint64]], ...] = tuple(
+    get_shifts(((-1, dy), (1, dy))) for dy in PAWN_DIRECTIONS
+)
+PAWN_PUSH_SHIFTS: tuple[list[tuple[int, np.uint64]], ...] = tuple(get_shifts(((0, dy),)) for dy in PAWN_DIRECTIONS)
+
+# Row reached by each colour's pawns' first single push, from where they can push again
+PAWN_DOUBLE_PUSH_ROWS: tuple[np.uint64, ...] = (
+    np.uint64(0xFF << (BOARD_HEIGHT - 3) * BOARD_WIDTH), np.uint64(0xFF << 2 * BOARD_WIDTH)
+)
+
+def shift(bitboards: np.ndarray, amount: int, mask: np.uint64) -> np.ndarray:
+    """
+    Move every set bit by a shift of the square index, dropping bits that leave or wrap around the board.
+
+    Parameters:
+        bitboards (np.ndarray): uint64 bitboards
+        amount (int): Shift of the square index, negative to shift down
+        mask (np.uint64): Squares that can be reached by the shift
+
+    Returns:
+        np.ndarray: Shifted bitboards
+    """
+    if amount >= 0:
+        return (bitboards << np.uint64(amount)) & mask
+    return (bitboards >> np.uint64(-amount)) & mask
+
+def get_step_attacks(bitboards: np.ndarray, shifts: list[tuple[int, np.uint64]]) -> np.ndarray:
+    """
+    Get the squares attacked by pieces that move a single step.
+
+    Parameters:
+        bitboards (np.ndarray): uint64 bitboards of the pieces
+        shifts (list[tuple[int, np.uint64]]): Shift of each step
+
+    Returns:
+        np.ndarray: uint64 bitboards of the attacked squares
+    """
+    attacks: np.ndarray = np.zeros_like(bitboards)
+    for amount, mask in shifts:
+        attacks |= shift(bitboards, amount, mask)
+    return attacks
+
+def get_slider_attacks(bitboards: np.ndarray, empty: np.ndarray, shifts: list[tuple[int, np.uint64]]) -> np.ndarray:
+    """
+    Get the squares attacked by sliding pieces, stopping each ray at the first occupied square.
+
+    Parameters:
+        bitboards (np.ndarray): uint64 bitboards of the pieces
+        empty (np.ndarray): uint64 bitboards of the empty squares
+        shifts (list[tuple[int, np.uint64]]): Shift of each direction
+
+    Returns:
+        np.ndarray: uint64 bitboards of the attacked squares, including the blocking squares
+    """
+    attacks: np.ndarray = np.zeros_like(bitboards)
+    for amount, mask in shifts:
+        ray: np.ndarray = bitboards
+        for _ in range(max(BOARD_WIDTH, BOARD_HEIGHT) - 1):
+            ray = shift(ray, amount, mask)
+            attacks |= ray
+            ray = ray & empty
+    return attacks
+
+def count_bits(bitboards: np.ndarray) -> np.ndarray:
+    """
+    Count the set bits of each bitboard.
+
+    Parameters:
+        bitboards (np.ndarray): uint64 bitboards
+
+    Returns:
+        np.ndarray: int32 counts, in the shape of the bitboards
+    """
+    octets: np.ndarray = np.ascontiguousarray(bitboards, dtype=np.uint64)[..., None].view(np.uint8)
+    return BYTE_COUNTS[octets].sum(axis=-1, dtype=np.int32)
+
+def encode_squares(boards: list[Board]) -> np.ndarray:
+    """
+    Encode the squares of many boards.
+
+    Parameters:
+        boards (list[Board]): Boards holding the positions
+
+    Returns:
+        np.ndarray: (N, 8, 8) int8 square codes, indexed by board, row then column
+    """
+    squares: np.ndarray = np.zeros((len(boards), BOARD_HEIGHT, BOARD_WIDTH), dtype=np.int8)
+    for index, board in enumerate(boards):
+        for y, row in enumerate(board.board):
+            for x, piece in enumerate(row):
+                if piece is not None:
+                    squares[index, y, x] = (piece.TYPE + 1) * (1 if piece.colour == Colours.WHITE.value else -1)
+    return squares
+
+def encode_bitboards(boards: list[Board]) -> np.ndarray:
+    """
+    Encode the bitboards of many boards.
+
+    Parameters:
+        boards (list[Board]): Boards holding the positions
+
+    Returns:
+        np.ndarray: (N, 12) uint64 bitboards, indexed by board then colour and piece type, white first
+    """
+    return np.array(
+        [[bitboard for pieces in board.bitboards.pieces for bitboard in pieces] for board in boards],
+        dtype=np.uint64
+    ).reshape(len(boards), NUM_BITBOARDS)
+
+def squares_to_bitboards(squares: np.ndarray) -> np.ndarray:
+    """
+    Convert square codes to bitboards.
+
+    Parameters:
+        squares (np.ndarray): (N, 8, 8) int8 square codes
+
+    Returns:
+        np.ndarray: (N, 12) uint64 bitboards
+    """
+    flat: np.ndarray = squares.reshape(len(squares), NUM_SQUARES)
+    bitboards: np.ndarray = np.empty((len(squares), NUM_BITBOARDS), dtype=np.uint64)
+    for index, code in enumerate(BITBOARD_CODES):
+        bitboards[:, index] = np.where(flat == code, SQUARE_BITS, np.uint64(0)).sum(axis=1, dtype=np.uint64)
+    return bitboards
+
+def bitboards_to_squares(bitboards: np.ndarray) -> np.ndarray:
+    """
+    Convert bitboards to square codes.
+
+    Parameters:
+        bitboards (np.ndarray): (N, 12) uint64 bitboards
+
+    Returns:
+        np.ndarray: (N, 8, 8) int8 square codes
+    """
+    bits: np.ndarray = (bitboards[:, :, None] >> np.arange(NUM_SQUARES, dtype=np.uint64)) & np.uint64(1)
+    squares: np.ndarray = (bits.astype(np.int8) * BITBOARD_CODES[None, :, None]).sum(axis=1, dtype=np.int8)
+    return squares.reshape(len(bitboards), BOARD_HEIGHT, BOARD_WIDTH)
+
+def get_material(squares: np.ndarray, endgame: bool = False) -> np.ndarray:
+    """
+    Score the material of many positions.
+
+    Parameters:
+        squares (np.ndarray): (N, 8, 8) int8 square codes
+        endgame (bool): Use the endgame piece values rather than the middlegame ones
+
+    Returns:
+        np.ndarray: (N,) int32 scores in centipawns from white's point of view
+    """
+    flat: np.ndarray = squares.reshape(len(squares), NUM_SQUARES).astype(np.intp) + MAX_CODE
+    values: np.ndarray = ENDGAME_MATERIAL_VALUES if endgame else MATERIAL_VALUES
+    return values[flat, np.arange(NUM_SQUARES)].sum(axis=1, dtype=np.int32)
+
+def get_placement(squares: np.ndarray, endgame: bool = False) -> np.ndarray:
+    """
+    Score the piece placement of many positions by the piece-square tables.
+
+    Parameters:
+        squares (np.ndarray): (N, 8, 8) int8 square codes
+        endgame (bool): Use the endgame tables rather than the middlegame ones
+
+    Returns:
+        np.ndarray: (N,) int32 scores in centipawns from white's point of view
+    """
+    flat: np.ndarray = squares.reshape(len(squares), NUM_SQUARES).astype(np.intp) + MAX_CODE
+    values: np.ndarray = ENDGAME_PLACEMENT_VALUES if endgame else PLACEMENT_VALUES
+    return values[flat, np.arange(NUM_SQUARES)].sum(axis=1, dtype=np.int32)
+
+def get_phase(squares: np.ndarray) -> np.ndarray:
+    """
+    Get the game phase of many positions.
+
+    Parameters:
+        squares (np.ndarray): (N, 8, 8) int8 square codes
+
+    Returns:
+        np.ndarray: (N,) int32 game phases, capped at MAX_PHASE
+    """
+    flat: np.ndarray = squares.reshape(len(squares), NUM_SQUARES).astype(np.intp) + MAX_CODE
+    return np.minimum(PHASE_VALUES[flat].sum(axis=1, dtype=np.int32), MAX_PHASE)
+
+def evaluate_batch(squares: np.ndarray, turns: np.ndarray = None) -> np.ndarray:
+    """
+    Statically evaluate many positions by material and piece placement, tapered by the game phase,
+    matching evaluation.evaluate.
+
+    Parameters:
+        squares (np.ndarray): (N, 8, 8) int8 square codes
+        turns (np.ndarray): (N,) enum values of the colour to move, white's point of view is used if not given
+
+    Returns:
+        np.ndarray: (N,) int32 scores in centipawns
+    """
+    midgame: np.ndarray = get_material(squares) + get_placement(squares)
+    endgame: np.ndarray = get_material(squares, True) + get_placement(squares, True)
+    phase: np.ndarray = get_phase(squares)
+    scores: np.ndarray = midgame * phase + endgame * (MAX_PHASE - phase)
+    if turns is not None:
+        scores = np.where(np.asarray(turns) == Colours.BLACK.value, -scores, scores)
+    return scores // MAX_PHASE
+
+def get_attacks(bitboards: np.ndarray) -> np.ndarray:
+    """
+    Get the squares attacked by each colour's pieces of each type, including squares defended by them.
+
+    Parameters:
+        bitboards (np.ndarray): (N, 12) uint64 bitboards
+
+    Returns:
+        np.ndarray: (N, 2, 6) uint64 bitboards of the attacked squares, indexed by board, colour then piece type
+    """
+    pieces: np.ndarray = bitboards.reshape(len(bitboards), NUM_COLOURS, NUM_PIECE_TYPES)
+    empty: np.ndarray = ~np.bitwise_or.reduce(bitboards, axis=1)
+    attacks: np.ndarray = np.zeros_like(pieces)
+    for colour in range(NUM_COLOURS):
+        attacks[:, colour, PieceTypes.PAWN.value] = get_step_attacks(
+            pieces[:, colour, PieceTypes.PAWN.value], PAWN_ATTACK_SHIFTS[colour]
+        )
+        attacks[:, colour, PieceTypes.KNIGHT.value] = get_step_attacks(
+            pieces[:, colour, PieceTypes.KNIGHT.value], KNIGHT_SHIFTS
+        )
+        attacks[:, colour, PieceTypes.BISHOP.value] = get_slider_attacks(
+            pieces[:, colour, PieceTypes.BISHOP.value], empty, BISHOP_SHIFTS
+        )
+        attacks[:, colour, PieceTypes.ROOK.value] = get_slider_attacks(
+            pieces[:, colour, PieceTypes.ROOK.value], empty, ROOK_SHIFTS
+        )
+        attacks[:, colour, PieceTypes.QUEEN.value] = get_slider_attacks(
+            pieces[:, colour, PieceTypes.QUEEN.value], empty, BISHOP_SHIFTS + ROOK_SHIFTS
+        )
+        attacks[:, colour, PieceTypes.KING.value] = get_step_attacks(
+            pieces[:, colour, PieceTypes.KING.value], KING_SHIFTS
+        )
+    return attacks
+
+def count_attacked(bitboards: np.ndarray, attacks: np.ndarray = None) -> np.ndarray:
+    """
+    Count the squares attacked by each colour.
+
+    Parameters:
+        bitboards (np.ndarray): (N, 12) uint64 bitboards
+        attacks (np.ndarray): Result of get_attacks, computed if not given
+
+    Returns:
+        np.ndarray: (N, 2) int32 counts, indexed by board then colour
+    """
+    if attacks is None:
+        attacks = get_attacks(bitboards)
+    return count_bits(np.bitwise_or.reduce(attacks, axis=2))
+
+def estimate_mobility(bitboards: np.ndarray, attacks: np.ndarray = None) -> np.ndarray:
+    """
+    Estimate the number of moves of each colour, from the squares their pieces attack that are not their own,
+    and their pawns' pushes. Squares reached by two pieces of the same type are counted once,
+    and legality is not checked.
+
+    Parameters:
+        bitboards (np.ndarray): (N, 12) uint64 bitboards
+        attacks (np.ndarray): Result of get_attacks, computed if not given
+
+    Returns:
+        np.ndarray: (N, 2) int32 estimates, indexed by board then colour
+    """
+    if attacks is None:
+        attacks = get_attacks(bitboards)
+    pieces: np.ndarray = bitboards.reshape(len(bitboards), NUM_COLOURS, NUM_PIECE_TYPES)
+    occupied: np.ndarray = np.bitwise_or.reduce(pieces, axis=2)
+    empty: np.ndarray = ~np.bitwise_or.reduce(occupied, axis=1)
+
+    mobility: np.ndarray = np.zeros((len(bitboards), NUM_COLOURS), dtype=np.int32)
+    for colour in range(NUM_COLOURS):
+        enemies: np.ndarray = occupied[:, 1 - colour]
+
+        # Pawns only move to attacked squares to capture
+        pawnAttacks: np.ndarray = attacks[:, colour, PieceTypes.PAWN.value] & enemies
+        pushes: np.ndarray = get_step_attacks(pieces[:, colour, PieceTypes.PAWN.value], PAWN_PUSH_SHIFTS[colour]) & empty
+        doublePushes: np.ndarray = get_step_attacks(
+            pushes & PAWN_DOUBLE_PUSH_ROWS[colour], PAWN_PUSH_SHIFTS[colour]
+        ) & empty
+        mobility[:, colour] = count_bits(pawnAttacks) + count_bits(pushes) + count_bits(doublePushes) + count_bits(
+            attacks[:, colour, PieceTypes.KNIGHT.value:] & ~occupied[:, colour, None]
+        ).sum(axis=1, dtype=np.int32)
+    return mobility
+
+def analyse_batch(boards: list[Board]) -> dict[str, np.ndarray]:
+    """
+    Compute the evaluation features of many boards.
+
+    Parameters:
+        boards (list[Board]): Boards holding the positions
+
+    Returns:
+        dict[str, np.ndarray]: (N,) material and placement from white's point of view, (N,) score from the point
+            of view of the side to move, and (N, 2) mobility estimates and attacked square counts, indexed by colour
+    """
+    squares: np.ndarray = encode_squares(boards)
+    bitboards: np.ndarray = squares_to_bitboards(squares)
+    turns: np.ndarray = np.array([board.turn for board in boards], dtype=np.int8)
+    attacks: np.ndarray = get_attacks(bitboards)
+    return {
+        "material": get_material(squares),
+        "placement": get_placement(squares),
+        "score": evaluate_batch(squares, turns),
+        "mobility": estimate_mobility(bitboards, attacks),
+        "attacked": count_attacked(bitboards, attacks)
+    }
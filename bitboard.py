@@ -0,0 +1,148 @@
+# Files
+from constants import BOARD_WIDTH, Colours, PieceTypes
+
+# Number of piece types and colours
+NUM_COLOURS: int = len(Colours)
+NUM_PIECE_TYPES: int = len(PieceTypes)
+
+# Functions
+def get_square(coord: (int, int)) -> int:
+    """
+    Convert a coordinate to a square index.
+
+    Parameters:
+        coord ((int, int)): x- y-coordinate of the square
+
+    Returns:
+        int: Index of the square, counting along the rows from the top left
+    """
+    x, y = coord
+    return y * BOARD_WIDTH + x
+
+def get_coord(square: int) -> (int, int):
+    """
+    Convert a square index to a coordinate.
+
+    Parameters:
+        square (int): Index of the square
+
+    Returns:
+        (int, int): x- y-coordinate of the square
+    """
+    y, x = divmod(square, BOARD_WIDTH)
+    return (x, y)
+
+def get_bit(coord: (int, int)) -> int:
+    """
+    Get the bitboard mask of a single coordinate.
+
+    Parameters:
+        coord ((int, int)): x- y-coordinate of the square
+
+    Returns:
+        int: Bitboard with only the coordinate's bit set
+    """
+    x, y = coord
+    return 1 << (y * BOARD_WIDTH + x)
+
+def get_coords(bitboard: int) -> list[tuple[int, int]]:
+    """
+    Get the coordinates of all the set bits in a bitboard.
+
+    Parameters:
+        bitboard (int): Bitboard to be read
+
+    Returns:
+        list[tuple[int, int]]: x- y-coordinates of the set bits
+    """
+    coords: list[tuple[int, int]] = []
+    while bitboard:
+        lowest: int = bitboard & -bitboard
+        coords.append(get_coord(lowest.bit_length() - 1))
+        bitboard ^= lowest
+    return coords
+
+
+class BitBoards(object):
+    """ Bitboard representation of the pieces on a board. """
+
+    def __init__(self) -> None:
+        """ Initialise empty bitboards. """
+        # One bitboard per colour and piece type
+        self.pieces: list[list[int]] = [[0] * NUM_PIECE_TYPES for _ in range(NUM_COLOURS)]
+
+        # Occupancy masks
+        self.occupied: list[int] = [0] * NUM_COLOURS
+        self.all: int = 0
+
+    def add(self, coord: (int, int), colour: int, piece_type: int) -> None:
+        """
+        Add a piece to the bitboards.
+
+        Parameters:
+            coord ((int, int)): x- y-coordinate of the piece
+            colour (int): Enum value of the piece's colour
+            piece_type (int): Enum value of the piece's type
+        """
+        bit: int = get_bit(coord)
+        self.pieces[colour][piece_type] |= bit
+        self.occupied[colour] |= bit
+        self.all |= bit
+
+    def remove(self, coord: (int, int), colour: int, piece_type: int) -> None:
+        """
+        Remove a piece from the bitboards.
+
+        Parameters:
+            coord ((int, int)): x- y-coordinate of the piece
+            colour (int): Enum value of the piece's colour
+            piece_type (int): Enum value of the piece's type
+        """
+        mask: int = ~get_bit(coord)
+        self.pieces[colour][piece_type] &= mask
+        self.occupied[colour] &= mask
+        self.all &= mask
+
+    def move(self, start: (int, int), end: (int, int), colour: int, piece_type: int) -> None:
+        """
+        Move a piece on the bitboards.
+
+        Parameters:
+            start ((int, int)): x- y-coordinate the piece is moving from
+            end ((int, int)): x- y-coordinate the piece is moving to
+            colour (int): Enum value of the piece's colour
+            piece_type (int): Enum value of the piece's type
+        """
+        change: int = get_bit(start) | get_bit(end)
+        self.pieces[colour][piece_type] ^= change
+        self.occupied[colour] ^= change
+        self.all ^= change
+
+def encode_move(move: tuple) -> int:
+    """
+    Pack a move into 16 bits: the starting square, the ending square and the promotion piece type.
+
+    Parameters:
+        move (tuple): Starting coordinate, ending coordinate and, for promotions, the piece type
+
+    Returns:
+        int: Encoded move, never 0
+    """
+    (startX, startY), (endX, endY) = move[0], move[1]
+    promotion: int = move[2] if len(move) > 2 else 0
+    return (startY * BOARD_WIDTH + startX) | (endY * BOARD_WIDTH + endX) << 6 | promotion << 12
+
+def decode_move(code: int) -> tuple:
+    """
+    Unpack a move packed by encode_move.
+
+    Parameters:
+        code (int): Encoded move
+
+    Returns:
+        tuple: Starting coordinate, ending coordinate and, for promotions, the piece type
+    """
+    start: tuple[int, int] = get_coord(code & 0x3F)
+    end: tuple[int, int] = get_coord(code >> 6 & 0x3F)
+    promotion: int = code >> 12
+    return (start, end, promotion) if promotion else (start, end)
@@ -2,13 +2,53 @@
 import operator
 
 # Constants
-from constants import BOARD_HEIGHT, BOARD_WIDTH
+from constants import BOARD_HEIGHT, BOARD_WIDTH, CastlingRights, Colours, PieceTypes, Termination
 
 # Exceptions
 from exceptions import EmptyCoordinateException
 
 # Files
-from pieces import Piece, BoardType
+from bitboard import BitBoards, get_bit
+from evaluation import ENDGAME_SCORES, MIDGAME_SCORES, PHASE_WEIGHTS
+from pieces import PIECE_CLASSES, Piece, Pieces, BoardType
+from tables import DARK_SQUARES, LIGHT_SQUARES, PAWN_ATTACK_MASKS, RAY_MASKS, RAYS, get_nearest_square
+from zobrist import CASTLING_KEYS, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY
+
+# Piece types used when making moves
+PAWN: int = PieceTypes.PAWN.value
+KNIGHT: int = PieceTypes.KNIGHT.value
+BISHOP: int = PieceTypes.BISHOP.value
+ROOK: int = PieceTypes.ROOK.value
+QUEEN: int = PieceTypes.QUEEN.value
+KING: int = PieceTypes.KING.value
+
+# Half-moves without a capture or pawn move that draw the game
+FIFTY_MOVE_PLIES: int = 100
+
+# Functions
+def get_castling_masks() -> list[int]:
+    """
+    Build the castling rights kept when a piece moves from or to each square.
+
+    Returns:
+        list[int]: Castling rights bit flags to keep, indexed by square
+    """
+    allRights: int = sum(right.value for right in CastlingRights)
+    masks: list[int] = [allRights] * (BOARD_WIDTH * BOARD_HEIGHT)
+    lost: dict[tuple[int, int], int] = {
+        (0, 0): CastlingRights.BLACK_QUEENSIDE.value,
+        (BOARD_WIDTH - 1, 0): CastlingRights.BLACK_KINGSIDE.value,
+        (Pieces.KING_COLUMN, 0): CastlingRights.BLACK_QUEENSIDE.value | CastlingRights.BLACK_KINGSIDE.value,
+        (0, BOARD_HEIGHT - 1): CastlingRights.WHITE_QUEENSIDE.value,
+        (BOARD_WIDTH - 1, BOARD_HEIGHT - 1): CastlingRights.WHITE_KINGSIDE.value,
+        (Pieces.KING_COLUMN, BOARD_HEIGHT - 1): CastlingRights.WHITE_QUEENSIDE.value | CastlingRights.WHITE_KINGSIDE.value
+    }
+    for (x, y), rights in lost.items():
+        masks[y * BOARD_WIDTH + x] &= ~rights
+    return masks
+
+CASTLING_MASKS: list[int] = get_castling_masks()
+
 
 class Board(BoardType):
     """ Board the game is played on."""
@@ -16,6 +56,32 @@ class Board(BoardType):
     def __init__(self) -> None:
         """ Initialise an empty board with the correct dimensions. """
         self.board: list[list[Piece]] = [[None] * BOARD_WIDTH for _ in range(BOARD_HEIGHT)]
+        self.bitboards: BitBoards = BitBoards()
+
+        # Each colour's pieces, indexed by colour
+        self.pieces: list[Pieces] = [None, None]
+
+        # Game state
+        self.turn: int = Colours.WHITE.value
+        self.castling: int = 0
+        self.en_passant: tuple[int, int] = None # Coordinate passed by the last pawn starting move
+        self.halfmove_clock: int = 0 # Moves since the last capture or pawn move
+        self.fullmove_number: int = 1
+
+        # Zobrist hash of the position, updated as the position changes
+        self.hash: int = CASTLING_KEYS[self.castling]
+
+        # Material and piece-square scores from white's point of view and the game phase,
+        # updated as pieces are added, removed and moved so evaluation does not scan the board
+        self.midgame_score: int = 0
+        self.endgame_score: int = 0
+        self.phase: int = 0
+
+        # Squares attacked by each colour, indexed by colour
+        self.attacked: list[int] = [0, 0]
+
+        # Records of the moves made, used to unmake them
+        self.undo_stack: list[tuple] = []
 
     def is_empty_coord(self, coord: (int, int)) -> bool:
         """
@@ -28,12 +94,21 @@ class Board(BoardType):
             bool: True is slot is empty, otherwise false. If the coordinate is invalid, return false.
         """
 
-        if self.is_in_bounds(coord):
-            try:
-                piece = self.get_piece(coord)
-            except EmptyCoordinateException:
-                return True
-        return False
+        return self.is_in_bounds(coord) and not self.bitboards.all & get_bit(coord)
+
+    def is_enemy_coord(self, coord: (int, int), colour: int) -> bool:
+        """
+        Check if the slot at the given coordinate holds a piece of the opposing colour.
+
+        Parameters:
+            coord ((int, int)): x- y-coordinate of the slot to be checked
+            colour (int): Enum value of the colour checking the slot
+
+        Returns:
+            bool: True if an opposing piece is in the slot, otherwise false. If the coordinate is invalid, return false.
+        """
+
+        return self.is_in_bounds(coord) and bool(self.bitboards.occupied[1 - colour] & get_bit(coord))
 
     def is_in_bounds(self, coord: (int, int)) -> bool:
         """
@@ -80,9 +155,105 @@ class Board(BoardType):
         """
         return tuple(map(operator.add, coord, direction))
 
+    def scan_ray(self, coord: (int, int), direction: (int, int)) -> tuple[tuple[tuple[int, int], ...], Piece]:
+        """
+        Scans from a coordinate in a direction until a piece or the edge of the board is reached.
+
+        Parameters:
+            coord ((int, int)): x- y-coordinate to scan from, not included in the scan
+            direction ((int, int)): x- y-direction to scan in
+
+        Returns:
+            tuple[tuple[tuple[int, int], ...], Piece]: x- y-coordinates of the empty squares passed
+                and the first piece found, or None if the edge of the board was reached
+        """
+        x, y = coord
+        square: int = y * BOARD_WIDTH + x
+        ray: tuple[tuple[int, int], ...] = RAYS[square][direction]
+
+        # Find the pieces on the ray
+        blockers: int = RAY_MASKS[square][direction] & self.bitboards.all
+        if not blockers:
+            return ray, None
+
+        blockerY, blockerX = divmod(get_nearest_square(blockers, direction), BOARD_WIDTH)
+        distance: int = max(abs(blockerX - x), abs(blockerY - y))
+        return ray[:distance - 1], self.board[blockerY][blockerX]
+
+    def get_slider_attacks(self, square: int, directions: tuple[tuple[int, int], ...]) -> int:
+        """
+        Gets the squares attacked by a sliding piece, up to and including the first piece in each direction.
+
+        Parameters:
+            square (int): Index of the sliding piece's square
+            directions (tuple[tuple[int, int], ...]): x- y-directions the piece slides in
+
+        Returns:
+            int: Bitboard of the attacked squares
+        """
+        occupied: int = self.bitboards.all
+        rays: dict[tuple[int, int], int] = RAY_MASKS[square]
+        attacks: int = 0
+        for direction in directions:
+            ray: int = rays[direction]
+            blockers: int = ray & occupied
+            if blockers:
+                # Remove the squares behind the nearest blocker
+                ray &= ~RAY_MASKS[get_nearest_square(blockers, direction)][direction]
+            attacks |= ray
+        return attacks
+
+    def refresh_attacks(self) -> None:
+        """ Recalculates the squares attacked by every piece on the board. """
+        for pieces in self.pieces:
+            if pieces is None:
+                continue
+            attacked: int = 0
+            for piece in pieces.get_pieces():
+                piece.attacks = piece.get_attacks()
+                attacked |= piece.attacks
+            self.attacked[pieces.colour] = attacked
+
+    def update_attacks(self, changed: int, moved: tuple[Piece, ...]) -> tuple[list[int], list[tuple[Piece, int]]]:
+        """
+        Updates the attacked squares after a move. Only the moved pieces and the sliding pieces
+        whose attacks reach a square that changed occupancy are recalculated.
+
+        Parameters:
+            changed (int): Bitboard of the squares that changed occupancy
+            moved (tuple[Piece, ...]): Pieces on the board that changed square
+
+        Returns:
+            tuple[list[int], list[tuple[Piece, int]]]: Previous attacked squares of each colour,
+                and the pieces that were recalculated with their previous attacks, used to undo the update
+        """
+        updates: list[tuple[Piece, int]] = []
+
+        # Sliding pieces blocked by or now passing through the changed squares
+        for pieces in self.pieces:
+            for piece in pieces.get_sliders():
+                if piece.attacks & changed:
+                    updates.append((piece, piece.attacks))
+                    piece.attacks = piece.get_attacks()
+
+        for piece in moved:
+            updates.append((piece, piece.attacks))
+            piece.attacks = piece.get_attacks()
+
+        # Combine each colour's attacks
+        previous: list[int] = self.attacked
+        self.attacked = [0, 0]
+        for pieces in self.pieces:
+            attacked: int = 0
+            for piece in pieces.get_pieces():
+                attacked |= piece.attacks
+            self.attacked[pieces.colour] = attacked
+
+        return previous, updates
+
     def get_piece_in_direction(self, coord: (int, int), direction: (int, int)) -> Piece:
         """ 
-        Recursively checks for a piece in a given direction.
+        Checks for a piece in a given direction.
 
         Parameters:
             coord ((int, int)): x- y-coordinate to check for a piece
@@ -97,13 +268,16 @@ class Board(BoardType):
         
         # Check bounds
         if not self.is_in_bounds(coord):
-            raise EmptyCoordinateException
+            raise EmptyCoordinateException(coord)
 
         # Get the piece
-        try:
-            return self.get_piece(coord)
-        except EmptyCoordinateException:
-            return self.get_piece_in_direction(self.get_new_coord(coord, direction), direction)
+        x, y = coord
+        piece: Piece = self.board[y][x]
+        if piece is None:
+            _, piece = self.scan_ray(coord, direction)
+            if piece is None:
+                raise EmptyCoordinateException(coord)
+        return piece
 
     def add_piece(self, piece: Piece) -> None:
         """
@@ -113,4 +287,274 @@ class Board(BoardType):
             piece (Piece): Piece to be added
         """
         x, y = piece.get_coord()
-        self.board[y][x] = piece
\ No newline at end of file
+        self.board[y][x] = piece
+        self.bitboards.add((x, y), piece.get_colour(), piece.TYPE)
+        square: int = y * BOARD_WIDTH + x
+        self.hash ^= PIECE_KEYS[piece.colour][piece.TYPE][square]
+        self.midgame_score += MIDGAME_SCORES[piece.colour][piece.TYPE][square]
+        self.endgame_score += ENDGAME_SCORES[piece.colour][piece.TYPE][square]
+        self.phase += PHASE_WEIGHTS[piece.TYPE]
+
+    def remove_piece(self, piece: Piece) -> None:
+        """
+        Removes the piece from the board.
+
+        Parameters:
+            piece (Piece): Piece to be removed
+        """
+        x, y = piece.get_coord()
+        self.board[y][x] = None
+        self.bitboards.remove((x, y), piece.get_colour(), piece.TYPE)
+        square: int = y * BOARD_WIDTH + x
+        self.hash ^= PIECE_KEYS[piece.colour][piece.TYPE][square]
+        self.midgame_score -= MIDGAME_SCORES[piece.colour][piece.TYPE][square]
+        self.endgame_score -= ENDGAME_SCORES[piece.colour][piece.TYPE][square]
+        self.phase -= PHASE_WEIGHTS[piece.TYPE]
+
+    def move_piece(self, piece: Piece, coord: (int, int)) -> None:
+        """
+        Moves the piece on the board. The destination must be empty.
+
+        Parameters:
+            piece (Piece): Piece to be moved
+            coord ((int, int)): x- y-coordinate to move the piece to
+        """
+        startX, startY = start = piece.get_coord()
+        endX, endY = coord
+        self.board[startY][startX] = None
+        self.board[endY][endX] = piece
+        self.bitboards.move(start, coord, piece.get_colour(), piece.TYPE)
+        startSquare: int = startY * BOARD_WIDTH + startX
+        endSquare: int = endY * BOARD_WIDTH + endX
+        keys: list[int] = PIECE_KEYS[piece.colour][piece.TYPE]
+        self.hash ^= keys[startSquare] ^ keys[endSquare]
+        scores: list[int] = MIDGAME_SCORES[piece.colour][piece.TYPE]
+        self.midgame_score += scores[endSquare] - scores[startSquare]
+        scores = ENDGAME_SCORES[piece.colour][piece.TYPE]
+        self.endgame_score += scores[endSquare] - scores[startSquare]
+        piece.move(endX, endY)
+
+    def set_castling(self, castling: int) -> None:
+        """
+        Sets the castling rights.
+
+        Parameters:
+            castling (int): Castling rights bit flags
+        """
+        self.hash ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+        self.castling = castling
+
+    def get_en_passant_key(self) -> int:
+        """
+        Gets the hash key of the en passant column. Only included when a pawn
+        can capture en passant, so otherwise identical positions hash the same.
+
+        Returns:
+            int: Hash key of the en passant column, or 0 if there is no en passant capture
+        """
+        if self.en_passant is None:
+            return 0
+        x, y = self.en_passant
+
+        # The side to move's pawns attack the square from where the opposing pawns would attack
+        if PAWN_ATTACK_MASKS[1 - self.turn][y * BOARD_WIDTH + x] & self.bitboards.pieces[self.turn][PAWN]:
+            return EN_PASSANT_KEYS[x]
+        return 0
+
+    def compute_hash(self) -> int:
+        """
+        Calculates the hash of the position from scratch.
+
+        Returns:
+            int: Zobrist hash of the position
+        """
+        positionHash: int = CASTLING_KEYS[self.castling] ^ self.get_en_passant_key()
+        if self.turn == Colours.BLACK.value:
+            positionHash ^= SIDE_KEY
+        for row in self.board:
+            for piece in row:
+                if piece is not None:
+                    positionHash ^= PIECE_KEYS[piece.colour][piece.TYPE][piece.get_square()]
+        return positionHash
+
+    def set_pieces(self, pieces: Pieces) -> None:
+        """
+        Sets the collection of a colour's pieces, which is kept up to date as moves are made.
+
+        Parameters:
+            pieces (Pieces): The colour's pieces
+        """
+        self.pieces[pieces.colour] = pieces
+
+    def make_move(self, start: (int, int), end: (int, int), promotion: int = None) -> None:
+        """
+        Makes a move, recording how to unmake it. The move is not validated.
+
+        Parameters:
+            start ((int, int)): x- y-coordinate of the piece to move
+            end ((int, int)): x- y-coordinate to move the piece to
+            promotion (int): Enum value of the piece type to promote a pawn to, defaults to a queen
+        """
+        startX, startY = start
+        endX, endY = end
+        piece: Piece = self.board[startY][startX]
+        captured: Piece = self.board[endY][endX]
+        colour: int = piece.colour
+        isPawn: bool = piece.TYPE == PAWN
+
+        # En passant captures the pawn beside the starting coordinate
+        if isPawn and end == self.en_passant:
+            captured = self.board[startY][endX]
+
+        castling: int = self.castling
+        enPassant: tuple[int, int] = self.en_passant
+        halfmoveClock: int = self.halfmove_clock
+        positionHash: int = self.hash
+        self.hash ^= self.get_en_passant_key()
+        moved: bool = piece.moved
+        changed: int = get_bit(start) | get_bit(end)
+        movedPieces: tuple[Piece, ...] = (piece,)
+        promoted: Piece = None
+
+        # Capture
+        if captured is not None:
+            changed |= get_bit(captured.get_coord())
+            self.remove_piece(captured)
+            captured.set_captured()
+            self.pieces[captured.colour].remove(captured)
+
+        self.move_piece(piece, end)
+
+        # Castling moves the rook to the square the king passed
+        if piece.TYPE == KING and abs(endX - startX) == 2:
+            rookX: int = BOARD_WIDTH - 1 if endX > startX else 0
+            rook: Piece = self.board[startY][rookX]
+            self.move_piece(rook, ((startX + endX) // 2, startY))
+            changed |= get_bit((rookX, startY)) | get_bit(rook.get_coord())
+            movedPieces = (piece, rook)
+
+        # Promotion replaces the pawn
+        if isPawn and endY in (0, BOARD_HEIGHT - 1):
+            self.remove_piece(piece)
+            pieces: Pieces = self.pieces[colour]
+            pieces.remove(piece)
+            promoted = PIECE_CLASSES[QUEEN if promotion is None else promotion](endX, endY, colour, self)
+            promoted.moved = True
+            pieces.add(promoted)
+            movedPieces = (promoted,)
+
+        # Update the game state
+        self.en_passant = (startX, (startY + endY) // 2) if isPawn and abs(endY - startY) == 2 else None
+        self.set_castling(castling & CASTLING_MASKS[startY * BOARD_WIDTH + startX] & CASTLING_MASKS[endY * BOARD_WIDTH + endX])
+        self.halfmove_clock = 0 if isPawn or captured is not None else self.halfmove_clock + 1
+        if colour == Colours.BLACK.value:
+            self.fullmove_number += 1
+        self.turn = 1 - colour
+        self.hash ^= SIDE_KEY ^ self.get_en_passant_key()
+
+        attackUpdates: tuple[list[int], list[tuple[Piece, int]]] = self.update_attacks(changed, movedPieces)
+        self.undo_stack.append(
+            (piece, start, end, captured, promoted, castling, enPassant, halfmoveClock, moved, attackUpdates, positionHash)
+        )
+
+    def unmake_move(self) -> None:
+        """ Unmakes the last move made. """
+        piece, start, end, captured, promoted, castling, enPassant, halfmoveClock, moved, attackUpdates, positionHash = self.undo_stack.pop()
+        startX, startY = start
+        endX, endY = end
+        colour: int = piece.colour
+
+        # Replace the promoted piece with the pawn
+        if promoted is not None:
+            self.remove_piece(promoted)
+            pieces: Pieces = self.pieces[colour]
+            pieces.remove(promoted)
+            self.add_piece(piece)
+            pieces.add(piece)
+
+        # Return the castled rook to its corner
+        if piece.TYPE == KING and abs(endX - startX) == 2:
+            rookX: int = BOARD_WIDTH - 1 if endX > startX else 0
+            rook: Piece = self.board[startY][(startX + endX) // 2]
+            self.move_piece(rook, (rookX, startY))
+            rook.moved = False
+
+        self.move_piece(piece, start)
+        piece.moved = moved
+
+        # Return the captured piece to its coordinate
+        if captured is not None:
+            captured.captured = False
+            self.add_piece(captured)
+            self.pieces[captured.colour].add(captured)
+
+        # Restore the game state
+        self.castling = castling
+        self.en_passant = enPassant
+        self.halfmove_clock = halfmoveClock
+        self.hash = positionHash
+        if colour == Colours.BLACK.value:
+            self.fullmove_number -= 1
+        self.turn = colour
+
+        # Restore the attacked squares, undoing the updates in reverse as a piece can be updated more than once
+        self.attacked, updates = attackUpdates
+        for updated, attacks in reversed(updates):
+            updated.attacks = attacks
+
+    def count_repetitions(self) -> int:
+        """
+        Counts the earlier occurrences of the position, from the hashes of the positions moves were made from.
+        Only positions since the last capture or pawn move are scanned, as no earlier position can occur again.
+
+        Returns:
+            int: Number of times the position occurred before
+        """
+        positionHash: int = self.hash
+        undoStack: list[tuple] = self.undo_stack
+        count: int = 0
+
+        # The same side is to move every second ply
+        for plies in range(2, min(self.halfmove_clock, len(undoStack)) + 1, 2):
+            if undoStack[-plies][-1] == positionHash:
+                count += 1
+        return count
+
+    def is_insufficient_material(self) -> bool:
+        """
+        Checks whether neither colour has the material to checkmate.
+
+        Returns:
+            bool: True if only kings remain with at most one knight or bishop, or with bishops all on one colour of square,
+                else false
+        """
+        white, black = self.bitboards.pieces
+        if white[PAWN] | black[PAWN] | white[ROOK] | black[ROOK] | white[QUEEN] | black[QUEEN]:
+            return False
+        knights: int = white[KNIGHT] | black[KNIGHT]
+        bishops: int = white[BISHOP] | black[BISHOP]
+        minors: int = knights | bishops
+        if not minors & (minors - 1):
+            return True
+        return not knights and (not bishops & LIGHT_SQUARES or not bishops & DARK_SQUARES)
+
+    def get_termination(self) -> int:
+        """
+        Checks whether the game has ended, with the cheapest checks first.
+        Finding whether there is a legal move stops at the first one rather than generating them all.
+
+        Returns:
+            int: Enum value of the way the game ended, or None if it has not
+        """
+        if self.is_insufficient_material():
+            return Termination.INSUFFICIENT_MATERIAL.value
+        if self.count_repetitions() >= 2:
+            return Termination.REPETITION.value
+
+        # Checkmate takes precedence over the fifty-move rule
+        pieces: Pieces = self.pieces[self.turn]
+        if not pieces.has_legal_move():
+            return Termination.CHECKMATE.value if pieces.king.in_check() else Termination.STALEMATE.value
+        if self.halfmove_clock >= FIFTY_MOVE_PLIES:
+            return Termination.FIFTY_MOVES.value
+        return None
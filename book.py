@@ -0,0 +1,259 @@
+# Modules
+import argparse, bisect, mmap, random, struct
+
+# Files
+from board import Board
+from constants import BOARD_HEIGHT, BOARD_WIDTH, PieceTypes
+from notation import get_move_name, iter_games, load_fen
+from perft import get_start_board
+from pieces import Piece, Pieces
+
+# Entries have the Polyglot layout: big-endian key, move, weight and learning data, sorted by key.
+# Keys are this program's position hashes rather than Polyglot's, so books are built with this module
+ENTRY_FORMAT: struct.Struct = struct.Struct(">QHHI")
+
+# Polyglot move layout, from the lowest bit: destination column and row, starting column and row, then promotion
+SQUARE_BITS: int = 6
+ROW_SHIFT: int = 3
+PROMOTION_SHIFT: int = 2 * SQUARE_BITS
+
+# Largest weight of a move
+MAX_WEIGHT: int = 0xFFFF
+
+class Book(object):
+    """ Opening book read from a memory-mapped file, so processes using the same book share one copy. """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open the book.
+
+        Parameters:
+            path (str): Path of the book file
+        """
+        self.path: str = path
+        with open(path, "rb") as file:
+            try:
+                self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty books cannot be mapped
+                self.data: mmap.mmap = None
+        self.size: int = len(self.data) // ENTRY_FORMAT.size if self.data is not None else 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of entries.
+
+        Returns:
+            int: Number of entries in the book
+        """
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        """
+        Get the key of an entry, so the book can be binary searched without reading every entry.
+
+        Parameters:
+            index (int): Index of the entry
+
+        Returns:
+            int: Key of the entry
+        """
+        return ENTRY_FORMAT.unpack_from(self.data, index * ENTRY_FORMAT.size)[0]
+
+    def close(self) -> None:
+        """ Close the book's file. """
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+            self.size = 0
+
+    def get_entries(self, key: int) -> list[tuple[int, int]]:
+        """
+        Get the entries of a position.
+
+        Parameters:
+            key (int): Hash of the position
+
+        Returns:
+            list[tuple[int, int]]: Encoded move and weight of each entry
+        """
+        entries: list[tuple[int, int]] = []
+        for index in range(bisect.bisect_left(self, key), self.size):
+            entryKey, move, weight, _ = ENTRY_FORMAT.unpack_from(self.data, index * ENTRY_FORMAT.size)
+            if entryKey != key:
+                break
+            entries.append((move, weight))
+        return entries
+
+    def get_moves(self, board: Board) -> list[tuple[tuple, int]]:
+        """
+        Get the legal book moves of a position.
+
+        Parameters:
+            board (Board): Board holding the position
+
+        Returns:
+            list[tuple[tuple, int]]: Each move and its weight
+        """
+        moves: list[tuple[tuple, int]] = []
+        pieces: Pieces = board.pieces[board.turn]
+        for code, weight in self.get_entries(board.hash):
+            move: tuple = decode_book_move(board, code)
+            # Check the move, as a different position can share the hash
+            if move is None or not pieces.is_possible_move(move):
+                continue
+            board.make_move(*move)
+            legal: bool = not pieces.king.in_check()
+            board.unmake_move()
+            if legal:
+                moves.append((move, weight))
+        return moves
+
+    def choose_move(self, board: Board) -> tuple:
+        """
+        Choose a book move, with the chance of each move proportional to its weight.
+
+        Parameters:
+            board (Board): Board holding the position
+
+        Returns:
+            tuple: Move as starting coordinate, ending coordinate and, for promotions, the piece type,
+                or None if the position is not in the book
+        """
+        moves: list[tuple[tuple, int]] = [(move, weight) for move, weight in self.get_moves(board) if weight]
+        if not moves:
+            return None
+        return random.choices([move for move, _ in moves], [weight for _, weight in moves])[0]
+
+# Functions
+def encode_book_move(board: Board, move: tuple) -> int:
+    """
+    Pack a move into the Polyglot layout, where castling is the king moving to its rook's square.
+
+    Parameters:
+        board (Board): Board holding the position before the move
+        move (tuple): Starting coordinate, ending coordinate and, for promotions, the piece type
+
+    Returns:
+        int: Encoded move
+    """
+    (startX, startY), (endX, endY) = move[0], move[1]
+    piece: Piece = board.board[startY][startX]
+    if piece.TYPE == PieceTypes.KING.value and abs(endX - startX) == 2:
+        endX = Pieces.ROOK_COLUMNS[endX > startX]
+
+    # Polyglot rows are counted from white's side, piece types match from the knight
+    code: int = endX | (BOARD_HEIGHT - 1 - endY) << ROW_SHIFT
+    code |= (startX | (BOARD_HEIGHT - 1 - startY) << ROW_SHIFT) << SQUARE_BITS
+    if len(move) > 2:
+        code |= move[2] << PROMOTION_SHIFT
+    return code
+
+def decode_book_move(board: Board, code: int) -> tuple:
+    """
+    Unpack a move packed in the Polyglot layout.
+
+    Parameters:
+        board (Board): Board holding the position before the move
+        code (int): Encoded move
+
+    Returns:
+        tuple: Starting coordinate, ending coordinate and, for promotions, the piece type,
+            or None if there is no piece to move
+    """
+    endX: int = code & (BOARD_WIDTH - 1)
+    endY: int = BOARD_HEIGHT - 1 - (code >> ROW_SHIFT & (BOARD_HEIGHT - 1))
+    startX: int = code >> SQUARE_BITS & (BOARD_WIDTH - 1)
+    startY: int = BOARD_HEIGHT - 1 - (code >> (SQUARE_BITS + ROW_SHIFT) & (BOARD_HEIGHT - 1))
+    promotion: int = code >> PROMOTION_SHIFT & 0x7
+
+    piece: Piece = board.board[startY][startX]
+    if piece is None:
+        return None
+
+    # The king moving onto its own rook is castling
+    target: Piece = board.board[endY][endX]
+    if piece.TYPE == PieceTypes.KING.value and target is not None and target.colour == piece.colour:
+        endX = startX + (2 if endX > startX else -2)
+
+    if promotion:
+        return ((startX, startY), (endX, endY), promotion)
+    return ((startX, startY), (endX, endY))
+
+def write_book(path: str, entries: dict[int, dict[int, int]]) -> int:
+    """
+    Write a book file, sorted by key then by weight with the heaviest first.
+
+    Parameters:
+        path (str): Path of the book file
+        entries (dict[int, dict[int, int]]): Weight of each encoded move, keyed by position hash
+
+    Returns:
+        int: Number of entries written
+    """
+    count: int = 0
+    with open(path, "wb") as file:
+        for key in sorted(entries):
+            for move, weight in sorted(entries[key].items(), key=lambda item: -item[1]):
+                file.write(ENTRY_FORMAT.pack(key, move, min(weight, MAX_WEIGHT), 0))
+                count += 1
+    return count
+
+def build_book(games, max_plies: int = 16, min_count: int = 1) -> dict[int, dict[int, int]]:
+    """
+    Count how often each move was played in the opening of games.
+
+    Parameters:
+        games (Iterable[list[tuple]]): Moves of each game from the starting position
+        max_plies (int): Plies of each game to include
+        min_count (int): Fewest times a move must be played to be included
+
+    Returns:
+        dict[int, dict[int, int]]: Number of times each encoded move was played, keyed by position hash
+    """
+    counts: dict[int, dict[int, int]] = {}
+    for moves in games:
+        board: Board = get_start_board()
+        for move in moves[:max_plies]:
+            code: int = encode_book_move(board, move)
+            positionMoves: dict[int, int] = counts.setdefault(board.hash, {})
+            positionMoves[code] = positionMoves.get(code, 0) + 1
+            board.make_move(*move)
+
+    return {
+        key: {move: count for move, count in moves.items() if count >= min_count}
+        for key, moves in counts.items()
+        if any(count >= min_count for count in moves.values())
+    }
+
+def main() -> None:
+    """ Build or read an opening book from the command line. """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Build or read an opening book.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build: argparse.ArgumentParser = commands.add_parser("build", help="build a book from binary self-play records")
+    build.add_argument("games", help="path of the self-play records")
+    build.add_argument("output", help="path of the book file")
+    build.add_argument("--plies", type=int, default=16, help="plies of each game to include")
+    build.add_argument("--min-count", type=int, default=1, help="fewest times a move must be played to be included")
+
+    probe: argparse.ArgumentParser = commands.add_parser("probe", help="show the book moves of a position")
+    probe.add_argument("book", help="path of the book file")
+    probe.add_argument("--fen", help="position in Forsyth-Edwards Notation, the starting position if not given")
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.command == "build":
+        entries: dict[int, dict[int, int]] = build_book(
+            (moves for _, moves in iter_games(args.games)), args.plies, args.min_count
+        )
+        print(f"Positions: {len(entries)}")
+        print(f"Entries: {write_book(args.output, entries)}")
+    else:
+        book: Book = Book(args.book)
+        board: Board = load_fen(args.fen) if args.fen else get_start_board()
+        for move, weight in book.get_moves(board):
+            print(f"{get_move_name(move)}: {weight}")
+        book.close()
+
+if __name__ == "__main__":
+    main()
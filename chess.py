@@ -9,6 +9,15 @@ from board import Board
 # Exceptions
 from exceptions import InvalidCoordinateException
 
+# Letters drawn on each piece type's sprite, indexed by piece type
+PIECE_LETTERS: str = "PNBRQK"
+
+# Event types handled by the game loop, the only ones queued
+HANDLED_EVENTS: tuple[int, ...] = (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.WINDOWEXPOSED)
+
+# Sprites of each piece, drawn once and reused, keyed by colour and piece type
+pieceSprites: dict[tuple[int, int], pygame.Surface] = {}
+
 # Functions
 def drawTiles(screen: pygame.Surface) -> None:
     """
@@ -33,6 +42,95 @@ def drawTiles(screen: pygame.Surface) -> None:
             pygame.draw.rect(screen, colour, (x, y, SQUARE_DIMENSIONS, SQUARE_DIMENSIONS))
 
 
+def createBoardSurface() -> pygame.Surface:
+    """
+    Draw the tiles once onto a surface, to be copied onto the display rather than drawn again.
+
+    Returns:
+        pygame.Surface: Surface of the empty board, the size of the display
+    """
+    surface: pygame.Surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    drawTiles(surface)
+    return surface
+
+
+def getPieceSprite(colour: int, pieceType: int) -> pygame.Surface:
+    """
+    Get the sprite of a piece, drawing it the first time it is needed.
+
+    Parameters:
+        colour (int): Enum value of the piece's colour
+        pieceType (int): Enum value of the piece's type
+
+    Returns:
+        pygame.Surface: Sprite of the piece, the size of a tile
+    """
+    key: tuple[int, int] = (colour, pieceType)
+    if key not in pieceSprites:
+        if colour == Colours.WHITE.value:
+            fill, outline = (230, 230, 230), (40, 40, 40)
+        else:
+            fill, outline = (40, 40, 40), (230, 230, 230)
+
+        sprite: pygame.Surface = pygame.Surface((SQUARE_DIMENSIONS, SQUARE_DIMENSIONS), pygame.SRCALPHA).convert_alpha()
+        centre: tuple[int, int] = (SQUARE_DIMENSIONS // 2, SQUARE_DIMENSIONS // 2)
+        radius: int = SQUARE_DIMENSIONS * 2 // 5
+        pygame.draw.circle(sprite, fill, centre, radius)
+        pygame.draw.circle(sprite, outline, centre, radius, 3)
+
+        font: pygame.font.Font = pygame.font.Font(None, SQUARE_DIMENSIONS // 2)
+        letter: pygame.Surface = font.render(PIECE_LETTERS[pieceType], True, outline)
+        sprite.blit(letter, letter.get_rect(center=centre))
+        pieceSprites[key] = sprite
+    return pieceSprites[key]
+
+
+def getTileRect(column: int, row: int) -> pygame.Rect:
+    """
+    Get the area of the display covered by a tile.
+
+    Parameters:
+        column (int): Column index of the tile
+        row (int): Row index of the tile
+
+    Returns:
+        pygame.Rect: Area of the tile
+    """
+    return pygame.Rect(UI_WIDTH + column * SQUARE_DIMENSIONS, UI_HEIGHT + row * SQUARE_DIMENSIONS,
+                       SQUARE_DIMENSIONS, SQUARE_DIMENSIONS)
+
+
+def drawChangedTiles(screen: pygame.Surface, boardSurface: pygame.Surface, board: Board,
+                     drawn: list[list[tuple[int, int]]]) -> list[pygame.Rect]:
+    """
+    Draw the tiles whose piece has changed since they were last drawn.
+
+    Parameters:
+        screen (pygame.Surface): The game display
+        boardSurface (pygame.Surface): Surface of the empty board
+        board (Board): The board being displayed
+        drawn (list[list[tuple[int, int]]]): What is drawn on each tile, updated with the tiles drawn
+
+    Returns:
+        list[pygame.Rect]: Areas of the display that were drawn
+    """
+    changed: list[pygame.Rect] = []
+    for row, pieces in enumerate(board.board):
+        for column, piece in enumerate(pieces):
+            contents: tuple[int, int] = None if piece is None else (piece.colour, piece.TYPE)
+            if contents == drawn[row][column]:
+                continue
+
+            # Restore the empty tile, then draw the piece on top
+            rect: pygame.Rect = getTileRect(column, row)
+            screen.blit(boardSurface, rect, rect)
+            if piece is not None:
+                screen.blit(getPieceSprite(piece.colour, piece.TYPE), rect)
+            drawn[row][column] = contents
+            changed.append(rect)
+    return changed
+
+
 def getTileIndex(coord: tuple[int, int]) -> tuple[int, int]:
     """
     Convert the mouse position to a tile index.
@@ -60,30 +158,57 @@ def getTileIndex(coord: tuple[int, int]) -> tuple[int, int]:
     return column, row
 
 
+def filterEvents() -> None:
+    """ Block every event type except those handled, so the others are never queued. """
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(HANDLED_EVENTS)
+
+
 def main() -> None:
     """ Setup the game display. """
     # Game Display
     pygame.init()
     screen: pygame.Surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clock: pygame.time.Clock = pygame.time.Clock()
 
     # Game Settings
     board: Board = Board()
     players: tuple(Player, Player) = (Player(Colours.WHITE.value, board), Player(Colours.BLACK.value, board))
-    drawTiles(screen)
+
+    # The empty board is drawn once, then only the tiles that change are drawn again
+    boardSurface: pygame.Surface = createBoardSurface()
+    screen.blit(boardSurface, (0, 0))
+    drawn: list[list[tuple[int, int]]] = [[None] * BOARD_WIDTH for _ in range(BOARD_HEIGHT)]
+    drawChangedTiles(screen, boardSurface, board, drawn)
+    pygame.display.flip()
+
+    # Only the events handled are queued
+    filterEvents()
 
     # Mouse settings
     mousePos = None
-    
+
     while True:
-        for event in pygame.event.get():
+        # Sleep until there is an event, rather than drawing frames while idle
+        events: list[pygame.event.Event] = [pygame.event.wait()] + pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            elif event.type == pygame.WINDOWEXPOSED:
+                # The window's contents were lost, so the whole display is updated
+                pygame.display.flip()
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 mousePos = pygame.mouse.get_pos()
             if event.type == pygame.MOUSEBUTTONUP and mousePos == pygame.mouse.get_pos():
                 mousePos = None
-        pygame.display.update()
+
+        changed: list[pygame.Rect] = drawChangedTiles(screen, boardSurface, board, drawn)
+        if changed:
+            pygame.display.update(changed)
+
+        # Limit the frame rate while events arrive quickly
+        clock.tick(FRAME_RATE)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -8,7 +8,32 @@ class Colours(Enum):
     WHITE: int = 0
     BLACK: int = 1
 
+# Piece types
+class PieceTypes(Enum):
+    PAWN: int = 0
+    KNIGHT: int = 1
+    BISHOP: int = 2
+    ROOK: int = 3
+    QUEEN: int = 4
+    KING: int = 5
+
+# Castling rights, as bit flags
+class CastlingRights(Enum):
+    WHITE_KINGSIDE: int = 1
+    WHITE_QUEENSIDE: int = 2
+    BLACK_KINGSIDE: int = 4
+    BLACK_QUEENSIDE: int = 8
+
+# Ways a game can end
+class Termination(Enum):
+    CHECKMATE: int = 0
+    STALEMATE: int = 1
+    REPETITION: int = 2 # Threefold repetition
+    FIFTY_MOVES: int = 3
+    INSUFFICIENT_MATERIAL: int = 4
+
 # Screen dimesions
 SCREEN_WIDTH = SCREEN_HEIGHT = 700 #pixels
 SQUARE_DIMENSIONS: int = 75 # pixels
 UI_WIDTH = UI_HEIGHT = 50 # pixels
+FRAME_RATE: int = 30 # Most frames drawn per second while there are events
@@ -0,0 +1,228 @@
+# Files
+from constants import Colours
+from pieces import BoardType
+from tables import NUM_SQUARES
+
+# Piece values in centipawns in the middlegame, indexed by piece type
+PIECE_VALUES: tuple[int, ...] = (100, 320, 330, 500, 900, 0)
+
+# Piece values in centipawns in the endgame, indexed by piece type
+ENDGAME_PIECE_VALUES: tuple[int, ...] = (120, 300, 320, 520, 950, 0)
+
+# Bonuses in centipawns in the middlegame for a piece on each square, indexed by piece type then square from
+# white's point of view. Rows are listed from the top of the board, so black's squares are read with the rows flipped
+PIECE_SQUARE_TABLES: tuple[tuple[int, ...], ...] = (
+    ( # Pawn
+          0,   0,   0,   0,   0,   0,   0,   0,
+         50,  50,  50,  50,  50,  50,  50,  50,
+         10,  10,  20,  30,  30,  20,  10,  10,
+          5,   5,  10,  25,  25,  10,   5,   5,
+          0,   0,   0,  20,  20,   0,   0,   0,
+          5,  -5, -10,   0,   0, -10,  -5,   5,
+          5,  10,  10, -20, -20,  10,  10,   5,
+          0,   0,   0,   0,   0,   0,   0,   0
+    ),
+    ( # Knight
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50
+    ),
+    ( # Bishop
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   5,   5,  10,  10,   5,   5, -10,
+        -10,   0,  10,  10,  10,  10,   0, -10,
+        -10,  10,  10,  10,  10,  10,  10, -10,
+        -10,   5,   0,   0,   0,   0,   5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20
+    ),
+    ( # Rook
+          0,   0,   0,   0,   0,   0,   0,   0,
+          5,  10,  10,  10,  10,  10,  10,   5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+         -5,   0,   0,   0,   0,   0,   0,  -5,
+          0,   0,   0,   5,   5,   0,   0,   0
+    ),
+    ( # Queen
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+         -5,   0,   5,   5,   5,   5,   0,  -5,
+          0,   0,   5,   5,   5,   5,   0,  -5,
+        -10,   5,   5,   5,   5,   5,   0, -10,
+        -10,   0,   5,   0,   0,   0,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20
+    ),
+    ( # King
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+         20,  20,   0,   0,   0,   0,  20,  20,
+         20,  30,  10,   0,   0,  10,  30,  20
+    )
+)
+
+# Bonuses in centipawns in the endgame for a piece on each square, laid out as PIECE_SQUARE_TABLES
+ENDGAME_PIECE_SQUARE_TABLES: tuple[tuple[int, ...], ...] = (
+    ( # Pawn
+          0,   0,   0,   0,   0,   0,   0,   0,
+         80,  80,  80,  80,  80,  80,  80,  80,
+         50,  50,  50,  50,  50,  50,  50,  50,
+         30,  30,  30,  30,  30,  30,  30,  30,
+         20,  20,  20,  20,  20,  20,  20,  20,
+         10,  10,  10,  10,  10,  10,  10,  10,
+          0,   0,   0,   0,   0,   0,   0,   0,
+          0,   0,   0,   0,   0,   0,   0,   0
+    ),
+    ( # Knight
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20,   0,   0,   0,   0, -20, -40,
+        -30,   0,  10,  15,  15,  10,   0, -30,
+        -30,   5,  15,  20,  20,  15,   5, -30,
+        -30,   0,  15,  20,  20,  15,   0, -30,
+        -30,   5,  10,  15,  15,  10,   5, -30,
+        -40, -20,   0,   5,   5,   0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50
+    ),
+    ( # Bishop
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   0,  10,  15,  15,  10,   0, -10,
+        -10,   0,  10,  15,  15,  10,   0, -10,
+        -10,   0,   5,  10,  10,   5,   0, -10,
+        -10,   0,   0,   0,   0,   0,   0, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20
+    ),
+    ( # Rook
+          0,   0,   0,   0,   0,   0,   0,   0,
+         10,  10,  10,  10,  10,  10,  10,  10,
+          0,   0,   0,   0,   0,   0,   0,   0,
+          0,   0,   0,   0,   0,   0,   0,   0,
+          0,   0,   0,   0,   0,   0,   0,   0,
+          0,   0,   0,   0,   0,   0,   0,   0,
+          0,   0,   0,   0,   0,   0,   0,   0,
+          0,   0,   0,   0,   0,   0,   0,   0
+    ),
+    ( # Queen
+        -20, -10, -10,  -5,  -5, -10, -10, -20,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+        -10,   5,  10,  10,  10,  10,   5, -10,
+         -5,   5,  10,  15,  15,  10,   5,  -5,
+         -5,   5,  10,  15,  15,  10,   5,  -5,
+        -10,   5,  10,  10,  10,  10,   5, -10,
+        -10,   0,   5,   5,   5,   5,   0, -10,
+        -20, -10, -10,  -5,  -5, -10, -10, -20
+    ),
+    ( # King
+        -50, -40, -30, -20, -20, -30, -40, -50,
+        -30, -20, -10,   0,   0, -10, -20, -30,
+        -30, -10,  20,  30,  30,  20, -10, -30,
+        -30, -10,  30,  40,  40,  30, -10, -30,
+        -30, -10,  30,  40,  40,  30, -10, -30,
+        -30, -10,  20,  30,  30,  20, -10, -30,
+        -30, -30,   0,   0,   0,   0, -30, -30,
+        -50, -30, -30, -30, -30, -30, -30, -50
+    )
+)
+
+# Game phase each piece type adds, indexed by piece type. The phase is MAX_PHASE with all pieces on the board
+# and falls towards the endgame as they are captured, weighting the middlegame and endgame scores
+PHASE_WEIGHTS: tuple[int, ...] = (0, 1, 1, 2, 4, 0)
+MAX_PHASE: int = 24
+
+# Square index bits flipped to read the tables for black, mirroring the rows
+FLIP_SQUARES: tuple[int, ...] = (0, 56)
+
+# Functions
+def get_square_scores(values: tuple[int, ...], tables: tuple[tuple[int, ...], ...]) -> list[list[list[int]]]:
+    """
+    Build the value of each colour's pieces on each square, including material, from white's point of view.
+
+    Parameters:
+        values (tuple[int, ...]): Piece values, indexed by piece type
+        tables (tuple[tuple[int, ...], ...]): Piece-square tables, indexed by piece type
+
+    Returns:
+        list[list[list[int]]]: Scores in centipawns, negative for black, indexed by colour, piece type then square
+    """
+    return [
+        [
+            [sign * (values[pieceType] + table[square ^ FLIP_SQUARES[colour.value]]) for square in range(NUM_SQUARES)]
+            for pieceType, table in enumerate(tables)
+        ]
+        for colour, sign in ((Colours.WHITE, 1), (Colours.BLACK, -1))
+    ]
+
+# Scores added to the board's running totals as pieces are added and removed
+MIDGAME_SCORES: list[list[list[int]]] = get_square_scores(PIECE_VALUES, PIECE_SQUARE_TABLES)
+ENDGAME_SCORES: list[list[list[int]]] = get_square_scores(ENDGAME_PIECE_VALUES, ENDGAME_PIECE_SQUARE_TABLES)
+
+def taper(midgame: int, endgame: int, phase: int, turn: int) -> int:
+    """
+    Blend the middlegame and endgame scores by the game phase.
+
+    Parameters:
+        midgame (int): Middlegame score from white's point of view
+        endgame (int): Endgame score from white's point of view
+        phase (int): Game phase, capped at MAX_PHASE as promotions can raise it
+        turn (int): Enum value of the colour to move
+
+    Returns:
+        int: Score in centipawns from the point of view of the side to move
+    """
+    phase = min(phase, MAX_PHASE)
+    score: int = midgame * phase + endgame * (MAX_PHASE - phase)
+
+    # Negated before rounding, so a position and its mirror score the same for the side to move
+    if turn == Colours.BLACK.value:
+        score = -score
+    return score // MAX_PHASE
+
+def evaluate(board: BoardType) -> int:
+    """
+    Statically evaluate the position by material and piece placement, from the totals the board keeps up to date.
+
+    Parameters:
+        board (Board): Board holding the position
+
+    Returns:
+        int: Score in centipawns from the point of view of the side to move
+    """
+    return taper(board.midgame_score, board.endgame_score, board.phase, board.turn)
+
+def compute_evaluation(board: BoardType) -> tuple[int, int, int]:
+    """
+    Calculates the middlegame and endgame scores and game phase from scratch.
+
+    Parameters:
+        board (Board): Board holding the position
+
+    Returns:
+        tuple[int, int, int]: Middlegame and endgame scores from white's point of view, and game phase
+    """
+    midgame: int = 0
+    endgame: int = 0
+    phase: int = 0
+    for colour in Colours:
+        for pieceType, bitboard in enumerate(board.bitboards.pieces[colour.value]):
+            phase += PHASE_WEIGHTS[pieceType] * bitboard.bit_count()
+            while bitboard:
+                lowest: int = bitboard & -bitboard
+                square: int = lowest.bit_length() - 1
+                midgame += MIDGAME_SCORES[colour.value][pieceType][square]
+                endgame += ENDGAME_SCORES[colour.value][pieceType][square]
+                bitboard ^= lowest
+    return midgame, endgame, phase
@@ -30,4 +30,21 @@ class InvalidCoordinateException(Exception):
         Parameters:
             coord ((int, int)): The invalid x, y position
         """
-        self.message: str = f'There is no coordinate at (x,y): {coord}.'
\ No newline at end of file
+        self.message: str = f'There is no coordinate at (x,y): {coord}.'
+
+class InvalidNotationException(Exception):
+    """
+    Exception raised for attempting to read invalid chess notation.
+
+    Attributes:
+        message -- explanation of the error
+    """
+
+    def __init__(self, notation: str):
+        """
+        Initialise the invalid notation exception.
+
+        Parameters:
+            notation (str): The notation that could not be read
+        """
+        self.message: str = f'The notation {notation!r} is invalid.'
@@ -0,0 +1,497 @@
+# Modules
+import mmap, re, struct
+
+# Files
+from bitboard import decode_move, encode_move
+from board import Board
+from constants import BOARD_HEIGHT, BOARD_WIDTH, CastlingRights, Colours, PieceTypes, Termination
+from pieces import PIECE_CLASSES, Piece, Pieces
+
+# Exceptions
+from exceptions import InvalidNotationException
+
+# Forsyth-Edwards Notation of the starting position
+START_FEN: str = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+# Letters of each piece type, indexed by piece type
+PIECE_LETTERS: str = "pnbrqk"
+
+# Letters of each castling right
+CASTLING_LETTERS: dict[str, int] = {
+    "K": CastlingRights.WHITE_KINGSIDE.value,
+    "Q": CastlingRights.WHITE_QUEENSIDE.value,
+    "k": CastlingRights.BLACK_KINGSIDE.value,
+    "q": CastlingRights.BLACK_QUEENSIDE.value
+}
+
+# Letters of each colour, indexed by colour
+COLOUR_LETTERS: str = "wb"
+
+# Compact encoding: a nibble per square, then the side to move and castling rights,
+# the en passant square, the halfmove clock and the fullmove number
+ENCODING_FORMAT: struct.Struct = struct.Struct(f"<{BOARD_WIDTH * BOARD_HEIGHT // 2}sBBBH")
+NO_SQUARE: int = 0xFF
+
+# Results of a game, indexed by their code in game records
+GAME_RESULTS: tuple[str, ...] = ("*", "1-0", "0-1", "1/2-1/2")
+
+# Game records are the result code and number of plies, followed by each move encoded by encode_move
+GAME_RECORD_HEADER: struct.Struct = struct.Struct("<BH")
+
+# Operations of Extended Position Description, an opcode then operands up to a semicolon, which can be quoted
+EPD_OPERATION: re.Pattern = re.compile(r'([A-Za-z][\w]*)\s*((?:"[^"]*"|[^;"])*);')
+
+# Functions
+def get_square_name(coord: (int, int)) -> str:
+    """
+    Get the algebraic name of a coordinate.
+
+    Parameters:
+        coord ((int, int)): x- y-coordinate of the square
+
+    Returns:
+        str: Name of the square, such as e4
+    """
+    x, y = coord
+    return f"{chr(ord('a') + x)}{BOARD_HEIGHT - y}"
+
+def parse_square(name: str) -> (int, int):
+    """
+    Get the coordinate of an algebraic square name.
+
+    Parameters:
+        name (str): Name of the square, such as e4
+
+    Returns:
+        (int, int): x- y-coordinate of the square
+
+    Raises:
+        InvalidNotationException: If the name is not a square on the board
+    """
+    if len(name) != 2 or not "a" <= name[0] <= chr(ord("a") + BOARD_WIDTH - 1) or not name[1].isdigit():
+        raise InvalidNotationException(name)
+    x: int = ord(name[0]) - ord("a")
+    y: int = BOARD_HEIGHT - int(name[1])
+    if not 0 <= y < BOARD_HEIGHT:
+        raise InvalidNotationException(name)
+    return (x, y)
+
+def get_move_name(move: tuple) -> str:
+    """
+    Get the long algebraic name of a move, as used by the Universal Chess Interface.
+
+    Parameters:
+        move (tuple): Starting coordinate, ending coordinate and, for promotions, the piece type
+
+    Returns:
+        str: Name of the move, such as e2e4 or e7e8q
+    """
+    name: str = get_square_name(move[0]) + get_square_name(move[1])
+    if len(move) > 2:
+        name += PIECE_LETTERS[move[2]]
+    return name
+
+def parse_move(name: str) -> tuple:
+    """
+    Get the move of a long algebraic name.
+
+    Parameters:
+        name (str): Name of the move, such as e2e4 or e7e8q
+
+    Returns:
+        tuple: Starting coordinate, ending coordinate and, for promotions, the piece type
+
+    Raises:
+        InvalidNotationException: If the name is not a move
+    """
+    if len(name) not in (4, 5):
+        raise InvalidNotationException(name)
+    start: tuple[int, int] = parse_square(name[:2])
+    end: tuple[int, int] = parse_square(name[2:4])
+    if len(name) == 4:
+        return (start, end)
+
+    promotion: int = PIECE_LETTERS.find(name[4].lower())
+    if promotion in (-1, PieceTypes.PAWN.value, PieceTypes.KING.value):
+        raise InvalidNotationException(name)
+    return (start, end, promotion)
+
+def load_fen(fen: str) -> Board:
+    """
+    Set up a board from Forsyth-Edwards Notation.
+
+    Parameters:
+        fen (str): Position in Forsyth-Edwards Notation, the move clocks are optional
+
+    Returns:
+        Board: Board holding the position, with both colours' pieces registered
+
+    Raises:
+        InvalidNotationException: If the notation is not a valid position
+    """
+    fields: list[str] = fen.split()
+    if len(fields) < 4:
+        raise InvalidNotationException(fen)
+    placement, turn, castling, enPassant = fields[:4]
+
+    # Piece placement, from the top row
+    placements: list[tuple[int, int, int, int]] = []
+    rows: list[str] = placement.split("/")
+    if len(rows) != BOARD_HEIGHT:
+        raise InvalidNotationException(fen)
+    for y, row in enumerate(rows):
+        x: int = 0
+        for letter in row:
+            if letter.isdigit():
+                x += int(letter)
+                continue
+
+            pieceType: int = PIECE_LETTERS.find(letter.lower())
+            if pieceType == -1 or x >= BOARD_WIDTH:
+                raise InvalidNotationException(fen)
+            colour: int = Colours.WHITE.value if letter.isupper() else Colours.BLACK.value
+            placements.append((x, y, colour, pieceType))
+            x += 1
+        if x != BOARD_WIDTH:
+            raise InvalidNotationException(fen)
+
+    # Game state
+    if turn not in COLOUR_LETTERS:
+        raise InvalidNotationException(fen)
+
+    rights: int = 0
+    if castling != "-":
+        for letter in castling:
+            if letter not in CASTLING_LETTERS:
+                raise InvalidNotationException(fen)
+            rights |= CASTLING_LETTERS[letter]
+
+    try:
+        halfmoveClock: int = int(fields[4]) if len(fields) > 4 else 0
+        fullmoveNumber: int = int(fields[5]) if len(fields) > 5 else 1
+    except ValueError:
+        raise InvalidNotationException(fen)
+
+    return setup_board(
+        placements, COLOUR_LETTERS.index(turn), rights, None if enPassant == "-" else parse_square(enPassant),
+        halfmoveClock, fullmoveNumber, fen
+    )
+
+def get_fen(board: Board) -> str:
+    """
+    Get the Forsyth-Edwards Notation of a board's position.
+
+    Parameters:
+        board (Board): Board holding the position
+
+    Returns:
+        str: Position in Forsyth-Edwards Notation
+    """
+    rows: list[str] = []
+    for row in board.board:
+        placement: str = ""
+        empty: int = 0
+        for piece in row:
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                placement += str(empty)
+                empty = 0
+            letter: str = PIECE_LETTERS[piece.TYPE]
+            placement += letter.upper() if piece.colour == Colours.WHITE.value else letter
+        if empty:
+            placement += str(empty)
+        rows.append(placement)
+
+    castling: str = "".join(letter for letter, right in CASTLING_LETTERS.items() if board.castling & right) or "-"
+    enPassant: str = "-" if board.en_passant is None else get_square_name(board.en_passant)
+    return " ".join((
+        "/".join(rows), COLOUR_LETTERS[board.turn], castling, enPassant,
+        str(board.halfmove_clock), str(board.fullmove_number)
+    ))
+
+def load_epd(line: str) -> tuple[Board, dict[str, str]]:
+    """
+    Set up a board from a line of Extended Position Description.
+
+    Parameters:
+        line (str): Position without move clocks, or with them as in Forsyth-Edwards Notation,
+            followed by operations such as bm Nf3; id "test 1";
+
+    Returns:
+        tuple[Board, dict[str, str]]: Board holding the position, and the operands of each opcode without quotes
+
+    Raises:
+        InvalidNotationException: If the line is not a valid position
+    """
+    fields: list[str] = line.split(maxsplit=4)
+    if len(fields) < 4:
+        raise InvalidNotationException(line)
+    rest: str = fields[4] if len(fields) > 4 else ""
+
+    # Move clocks written as in Forsyth-Edwards Notation
+    clocks: list[str] = rest.split(maxsplit=2)
+    if len(clocks) >= 2 and clocks[0].isdigit() and clocks[1].isdigit():
+        fields[4:] = clocks[:2]
+        rest = clocks[2] if len(clocks) > 2 else ""
+    else:
+        fields = fields[:4]
+
+    # Some files put the semicolons before each operation rather than after
+    rest = rest.strip().lstrip(";")
+    if rest and not rest.endswith(";"):
+        rest += ";"
+
+    operations: dict[str, str] = {}
+    for opcode, operands in EPD_OPERATION.findall(rest):
+        operands = operands.strip()
+        if len(operands) >= 2 and operands[0] == operands[-1] == '"':
+            operands = operands[1:-1]
+        operations[opcode] = operands
+
+    # Move clocks given as operations
+    if len(fields) == 4:
+        fields += [operations.get("hmvc", "0"), operations.get("fmvn", "1")]
+    return load_fen(" ".join(fields)), operations
+
+def iter_epd(path: str):
+    """
+    Read the positions of an Extended Position Description file one line at a time.
+    The file is memory-mapped where possible, so only the lines being read are loaded.
+    Blank lines and lines starting with # are skipped.
+
+    Parameters:
+        path (str): Path of the file
+
+    Returns:
+        Generator[tuple[Board, dict[str, str]]]: Board and operations of each position, as read by load_epd
+
+    Raises:
+        InvalidNotationException: If a line is not a valid position
+    """
+    with open(path, "rb") as file:
+        try:
+            lines = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and streams cannot be mapped
+            lines = None
+
+        try:
+            for line in iter(lines.readline, b"") if lines is not None else file:
+                text: str = line.decode().strip()
+                if text and not text.startswith("#"):
+                    yield load_epd(text)
+        finally:
+            if lines is not None:
+                lines.close()
+
+def setup_board(placements: list[tuple[int, int, int, int]], turn: int, castling: int, en_passant: (int, int),
+                halfmove_clock: int, fullmove_number: int, notation: str) -> Board:
+    """
+    Set up a board from the pieces and game state of a position.
+
+    Parameters:
+        placements (list[tuple[int, int, int, int]]): x- y-coordinate, enum value of the colour
+            and enum value of the piece type of each piece
+        turn (int): Enum value of the colour to move
+        castling (int): Castling rights bit flags
+        en_passant ((int, int)): x- y-coordinate passed by the last pawn starting move, or None
+        halfmove_clock (int): Moves since the last capture or pawn move
+        fullmove_number (int): Number of the current move
+        notation (str): Notation the position was read from, for errors
+
+    Returns:
+        Board: Board holding the position, with both colours' pieces registered
+
+    Raises:
+        InvalidNotationException: If a colour does not have exactly one king
+    """
+    board: Board = Board()
+    pieces: list[Pieces] = [Pieces(colour.value, board, setup=False) for colour in Colours]
+
+    for x, y, colour, pieceType in placements:
+        if pieceType == PieceTypes.KING.value and pieces[colour].king is not None:
+            raise InvalidNotationException(notation)
+        piece: Piece = PIECE_CLASSES[pieceType](x, y, colour, board)
+
+        # Pawns can only make their starting move from their starting row
+        if pieceType == PieceTypes.PAWN.value:
+            piece.moved = y != (BOARD_HEIGHT - 2 if colour == Colours.WHITE.value else 1)
+        pieces[colour].add(piece)
+    if any(colourPieces.king is None for colourPieces in pieces):
+        raise InvalidNotationException(notation)
+
+    board.turn = turn
+    board.castling = castling
+    board.en_passant = en_passant
+    board.halfmove_clock = halfmove_clock
+    board.fullmove_number = fullmove_number
+
+    board.refresh_attacks()
+    board.hash = board.compute_hash()
+    return board
+
+def encode_position(board: Board) -> bytes:
+    """
+    Pack a position into a compact encoding, cheap to send between processes.
+
+    Parameters:
+        board (Board): Board holding the position
+
+    Returns:
+        bytes: Encoded position
+    """
+    squares: bytearray = bytearray(BOARD_WIDTH * BOARD_HEIGHT // 2)
+    for y, row in enumerate(board.board):
+        for x, piece in enumerate(row):
+            if piece is not None:
+                # Piece types are stored from 1, so 0 is an empty square, with the colour above
+                square: int = y * BOARD_WIDTH + x
+                squares[square >> 1] |= (piece.colour << 3 | piece.TYPE + 1) << (4 * (square & 1))
+
+    enPassant: int = NO_SQUARE
+    if board.en_passant is not None:
+        enPassant = board.en_passant[1] * BOARD_WIDTH + board.en_passant[0]
+    return ENCODING_FORMAT.pack(
+        bytes(squares), board.turn | board.castling << 1, enPassant, min(board.halfmove_clock, 0xFF),
+        min(board.fullmove_number, 0xFFFF)
+    )
+
+def decode_position(data: bytes) -> Board:
+    """
+    Set up a board from a position packed by encode_position.
+
+    Parameters:
+        data (bytes): Encoded position
+
+    Returns:
+        Board: Board holding the position, with both colours' pieces registered
+
+    Raises:
+        InvalidNotationException: If the data is not a valid position
+    """
+    try:
+        squares, state, enPassant, halfmoveClock, fullmoveNumber = ENCODING_FORMAT.unpack(data)
+    except struct.error:
+        raise InvalidNotationException(data.hex())
+
+    placements: list[tuple[int, int, int, int]] = []
+    for square in range(BOARD_WIDTH * BOARD_HEIGHT):
+        nibble: int = squares[square >> 1] >> (4 * (square & 1)) & 0xF
+        if nibble:
+            pieceType: int = (nibble & 0x7) - 1
+            if pieceType >= len(PIECE_CLASSES):
+                raise InvalidNotationException(data.hex())
+            y, x = divmod(square, BOARD_WIDTH)
+            placements.append((x, y, nibble >> 3, pieceType))
+
+    return setup_board(
+        placements, state & 1, state >> 1,
+        None if enPassant == NO_SQUARE else (enPassant % BOARD_WIDTH, enPassant // BOARD_WIDTH),
+        halfmoveClock, fullmoveNumber, data.hex()
+    )
+
+def get_san(board: Board, move: tuple) -> str:
+    """
+    Get the standard algebraic name of a move, as used by Portable Game Notation.
+
+    Parameters:
+        board (Board): Board holding the position before the move, restored once named
+        move (tuple): Legal move as starting coordinate, ending coordinate and, for promotions, the piece type
+
+    Returns:
+        str: Name of the move, such as Nf3, exd5, e8=Q+ or O-O
+    """
+    (startX, startY), end = move[0], move[1]
+    piece: Piece = board.board[startY][startX]
+    pieces: Pieces = board.pieces[piece.colour]
+
+    if piece.TYPE == PieceTypes.KING.value and abs(end[0] - startX) == 2:
+        name: str = "O-O" if end[0] > startX else "O-O-O"
+    else:
+        capture: bool = board.board[end[1]][end[0]] is not None
+        if piece.TYPE == PieceTypes.PAWN.value:
+            capture = capture or end == board.en_passant
+            name: str = chr(ord("a") + startX) + "x" if capture else ""
+        else:
+            # Name the starting column, row or both if another piece of the type can move to the same square
+            others: list[tuple[int, int]] = [
+                other[0] for other in pieces.iter_legal_moves()
+                if other[1] == end and other[0] != move[0] and board.board[other[0][1]][other[0][0]].TYPE == piece.TYPE
+            ]
+            square: str = get_square_name(move[0])
+            if not others:
+                disambiguation: str = ""
+            elif all(x != startX for x, _ in others):
+                disambiguation: str = square[0]
+            elif all(y != startY for _, y in others):
+                disambiguation: str = square[1]
+            else:
+                disambiguation: str = square
+            name: str = PIECE_LETTERS[piece.TYPE].upper() + disambiguation + ("x" if capture else "")
+        name += get_square_name(end)
+        if len(move) > 2:
+            name += "=" + PIECE_LETTERS[move[2]].upper()
+
+    # Check or checkmate
+    board.make_move(*move)
+    opponent: Pieces = board.pieces[board.turn]
+    if opponent.king.in_check():
+        name += "+" if opponent.has_legal_move() else "#"
+    board.unmake_move()
+    return name
+
+def get_result(board: Board, termination: int) -> str:
+    """
+    Get the result of a game.
+
+    Parameters:
+        board (Board): Board holding the final position
+        termination (int): Enum value of the way the game ended, from Board.get_termination, or None if it has not
+
+    Returns:
+        str: Result of the game, one of GAME_RESULTS
+    """
+    if termination is None:
+        return GAME_RESULTS[0]
+    if termination == Termination.CHECKMATE.value:
+        return GAME_RESULTS[2] if board.turn == Colours.WHITE.value else GAME_RESULTS[1]
+    return GAME_RESULTS[3]
+
+def encode_game(result: str, moves: list[tuple]) -> bytes:
+    """
+    Pack a game from the starting position into a compact binary record.
+
+    Parameters:
+        result (str): Result of the game, one of GAME_RESULTS
+        moves (list[tuple]): Moves of the game
+
+    Returns:
+        bytes: Encoded game
+    """
+    return GAME_RECORD_HEADER.pack(GAME_RESULTS.index(result), len(moves)) \
+        + struct.pack(f"<{len(moves)}H", *(encode_move(move) for move in moves))
+
+def iter_games(path: str):
+    """
+    Read the games of a file of binary records one at a time.
+
+    Parameters:
+        path (str): Path of the file
+
+    Returns:
+        Generator[tuple[str, list[tuple]]]: Result and moves of each game
+
+    Raises:
+        InvalidNotationException: If the file ends part way through a record
+    """
+    with open(path, "rb") as file:
+        while header := file.read(GAME_RECORD_HEADER.size):
+            if len(header) < GAME_RECORD_HEADER.size:
+                raise InvalidNotationException(header.hex())
+            resultCode, plies = GAME_RECORD_HEADER.unpack(header)
+            data: bytes = file.read(2 * plies)
+            if len(data) < 2 * plies or resultCode >= len(GAME_RESULTS):
+                raise InvalidNotationException((header + data).hex())
+            yield GAME_RESULTS[resultCode], [decode_move(code) for code in struct.unpack(f"<{plies}H", data)]
@@ -0,0 +1,164 @@
+# Files
+from bitboard import NUM_PIECE_TYPES
+from board import Board
+from constants import BOARD_WIDTH, PieceTypes
+from evaluation import PIECE_VALUES
+from pieces import Piece, Pieces
+from tables import NUM_SQUARES
+
+# Plies from the root that killer moves are kept for
+MAX_PLY: int = 128
+
+# Killer moves kept for each ply
+NUM_KILLERS: int = 2
+
+PAWN: int = PieceTypes.PAWN.value
+
+class MoveOrdering(object):
+    """
+    Orders the moves of a search so those most likely to cause a cut-off are searched first:
+    the hash move, then captures by most valuable victim and least valuable attacker, then killer moves,
+    then quiet moves by how often they caused cut-offs. Each stage is only generated once the previous one is searched.
+    """
+
+    def __init__(self, board: Board) -> None:
+        """
+        Initialise the ordering with no killer moves or history.
+
+        Parameters:
+            board (Board): Board being searched
+        """
+        self.board: Board = board
+        self.killers: list[list[tuple]] = [[None] * NUM_KILLERS for _ in range(MAX_PLY)]
+
+        # Depth weighted count of cut-offs by each quiet move, indexed by colour, starting square then ending square
+        self.history: list[int] = [0] * (2 * NUM_SQUARES * NUM_SQUARES)
+
+    def clear(self) -> None:
+        """ Remove the killer moves and history. """
+        for killers in self.killers:
+            killers[:] = [None] * NUM_KILLERS
+        self.history = [0] * (2 * NUM_SQUARES * NUM_SQUARES)
+
+    def get_capture_score(self, move: tuple) -> int:
+        """
+        Score a capture or promotion, valuing the material gained most then the cheapest piece to make it.
+
+        Parameters:
+            move (tuple): Starting coordinate, ending coordinate and, for promotions, the piece type
+
+        Returns:
+            int: Score, higher to be searched first
+        """
+        (startX, startY), (endX, endY) = move[0], move[1]
+        board: Board = self.board
+        attacker: Piece = board.board[startY][startX]
+        victim: Piece = board.board[endY][endX]
+        if victim is not None:
+            gain: int = PIECE_VALUES[victim.TYPE]
+        elif attacker.TYPE == PAWN and move[1] == board.en_passant:
+            gain: int = PIECE_VALUES[PAWN]
+        else:
+            gain: int = 0
+        if len(move) > 2:
+            gain += PIECE_VALUES[move[2]] - PIECE_VALUES[PAWN]
+        return gain * NUM_PIECE_TYPES - attacker.TYPE
+
+    def get_history_index(self, colour: int, move: tuple) -> int:
+        """
+        Get the index of a move in the history.
+
+        Parameters:
+            colour (int): Enum value of the colour making the move
+            move (tuple): Starting coordinate, ending coordinate and, for promotions, the piece type
+
+        Returns:
+            int: Index in the history
+        """
+        (startX, startY), (endX, endY) = move[0], move[1]
+        return (colour * NUM_SQUARES + startY * BOARD_WIDTH + startX) * NUM_SQUARES + endY * BOARD_WIDTH + endX
+
+    def is_quiet(self, move: tuple) -> bool:
+        """
+        Checks whether a move neither captures nor promotes.
+
+        Parameters:
+            move (tuple): Starting coordinate, ending coordinate and, for promotions, the piece type
+
+        Returns:
+            bool: True if the move is quiet, else false
+        """
+        if len(move) > 2:
+            return False
+        (startX, startY), (endX, endY) = move
+        board: Board = self.board
+        if board.board[endY][endX] is not None:
+            return False
+        return not (move[1] == board.en_passant and board.board[startY][startX].TYPE == PAWN)
+
+    def iter_captures(self, pieces: Pieces):
+        """
+        Generate the captures and promotions of the side to move, best first, which may leave the king in check.
+
+        Parameters:
+            pieces (Pieces): Pieces of the side to move
+
+        Returns:
+            Generator[tuple]: Moves as starting coordinate, ending coordinate and, for promotions, the piece type
+        """
+        yield from sorted(pieces.iter_moves(True), key=self.get_capture_score, reverse=True)
+
+    def iter_moves(self, pieces: Pieces, ply: int, hash_move: tuple = None):
+        """
+        Generate the moves of the side to move in order, which may leave the king in check.
+        Each stage is generated when it is reached, so a cut-off skips generating the later stages.
+
+        Parameters:
+            pieces (Pieces): Pieces of the side to move
+            ply (int): Plies from the root
+            hash_move (tuple): Possible move to search first, or None
+
+        Returns:
+            Generator[tuple]: Moves as starting coordinate, ending coordinate and, for promotions, the piece type
+        """
+        searched: set[tuple] = set()
+        if hash_move is not None:
+            searched.add(hash_move)
+            yield hash_move
+
+        # Captures and promotions
+        captures: list[tuple] = sorted(pieces.iter_moves(True), key=self.get_capture_score, reverse=True)
+        for move in captures:
+            if move not in searched:
+                yield move
+        searched.update(captures)
+
+        # Quiet moves that caused cut-offs at the same ply, which are often also good here
+        if ply < MAX_PLY:
+            for killer in self.killers[ply]:
+                if killer is not None and killer not in searched and pieces.is_possible_move(killer):
+                    searched.add(killer)
+                    yield killer
+
+        # Remaining quiet moves, those that caused the most cut-offs first
+        history: list[int] = self.history
+        quiets: list[tuple] = [move for move in pieces.iter_moves() if move not in searched]
+        quiets.sort(key=lambda move: history[self.get_history_index(pieces.colour, move)], reverse=True)
+        yield from quiets
+
+    def add_cutoff(self, move: tuple, colour: int, depth: int, ply: int) -> None:
+        """
+        Record a quiet move causing a cut-off, so it is searched earlier in other positions.
+
+        Parameters:
+            move (tuple): Quiet move
+            colour (int): Enum value of the colour making the move
+            depth (int): Remaining depth of the search where it caused the cut-off
+            ply (int): Plies from the root
+        """
+        if ply < MAX_PLY:
+            killers: list[tuple] = self.killers[ply]
+            if killers[0] != move:
+                killers[1:] = killers[:-1]
+                killers[0] = move
+        self.history[self.get_history_index(colour, move)] += depth * depth
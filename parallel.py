@@ -0,0 +1,144 @@
+# Modules
+import argparse, time
+from concurrent.futures import ProcessPoolExecutor
+
+# Files
+from bitboard import decode_move, encode_move
+from board import Board
+from notation import decode_position, encode_position, get_move_name, load_fen
+from perft import get_start_board, perft
+from search import INFINITY, Search
+from transposition import TranspositionTable
+
+# Memory of each analysis worker's transposition table, in megabytes
+WORKER_HASH_MB: float = 16
+
+# Transposition table kept by each analysis worker process between tasks
+worker_table: TranspositionTable = None
+
+# Functions
+def perft_task(position: bytes, move: int, depth: int) -> int:
+    """
+    Count the leaf nodes below a first move, in a worker process.
+
+    Parameters:
+        position (bytes): Position encoded by encode_position
+        move (int): First move encoded by encode_move
+        depth (int): Depth in plies to count to, including the first move
+
+    Returns:
+        int: Number of leaf nodes
+    """
+    board: Board = decode_position(position)
+    board.make_move(*decode_move(move))
+    return perft(board, depth - 1)
+
+def analyse_task(position: bytes, move: int, depth: int) -> tuple[int, int]:
+    """
+    Score a first move by searching to a fixed depth, in a worker process.
+
+    Parameters:
+        position (bytes): Position encoded by encode_position
+        move (int): First move encoded by encode_move
+        depth (int): Depth in plies to search to, including the first move
+
+    Returns:
+        tuple[int, int]: Score of the move from the point of view of the side to move, and the nodes searched
+    """
+    global worker_table
+    if worker_table is None:
+        worker_table = TranspositionTable(WORKER_HASH_MB)
+
+    board: Board = decode_position(position)
+    board.make_move(*decode_move(move))
+    search: Search = Search(board, max_depth=depth, table=worker_table)
+    search.start_time = time.perf_counter()
+    score: int = -search.negamax(depth - 1, -INFINITY, INFINITY, 1)
+    return score, search.nodes
+
+def split_root(board: Board, depth: int, task: callable, workers: int = None) -> dict[tuple, object]:
+    """
+    Run a task for each legal first move across a pool of worker processes.
+    Workers are sent the compact position and move encodings rather than the board's objects.
+
+    Parameters:
+        board (Board): Board holding the position
+        depth (int): Depth in plies passed to each task
+        task (callable): Picklable function taking the encoded position, encoded move and depth
+        workers (int): Number of worker processes, the number of processors if not given
+
+    Returns:
+        dict[tuple, object]: Result of the task, keyed by the first move
+    """
+    position: bytes = encode_position(board)
+    moves: list[tuple] = board.pieces[board.turn].get_legal_moves()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures: list = [executor.submit(task, position, encode_move(move), depth) for move in moves]
+        return {move: future.result() for move, future in zip(moves, futures)}
+
+def parallel_perft(board: Board, depth: int, workers: int = None) -> dict[tuple, int]:
+    """
+    Count the leaf nodes below each first move, split across worker processes.
+
+    Parameters:
+        board (Board): Board holding the position
+        depth (int): Depth in plies to count to, including the first move
+        workers (int): Number of worker processes, the number of processors if not given
+
+    Returns:
+        dict[tuple, int]: Number of leaf nodes, keyed by the first move
+    """
+    if depth <= 1:
+        return {move: 1 for move in board.pieces[board.turn].get_legal_moves()}
+    return split_root(board, depth, perft_task, workers)
+
+def parallel_analyse(board: Board, depth: int, workers: int = None) -> tuple[tuple, int, dict[tuple, int], int]:
+    """
+    Search each first move to a fixed depth, split across worker processes.
+
+    Parameters:
+        board (Board): Board holding the position
+        depth (int): Depth in plies to search to, including the first move
+        workers (int): Number of worker processes, the number of processors if not given
+
+    Returns:
+        tuple[tuple, int, dict[tuple, int], int]: Best move, or None if there are no legal moves, its score,
+            the score of each first move and the total nodes searched
+    """
+    results: dict[tuple, tuple[int, int]] = split_root(board, depth, analyse_task, workers)
+    scores: dict[tuple, int] = {move: score for move, (score, _) in results.items()}
+    nodes: int = sum(count for _, count in results.values())
+    if not scores:
+        return None, 0, scores, nodes
+    bestMove: tuple = max(scores, key=scores.get)
+    return bestMove, scores[bestMove], scores, nodes
+
+def main() -> None:
+    """ Run parallel perft or analysis from the command line. """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Split the first moves across processes.")
+    parser.add_argument("mode", choices=("perft", "analyse"), help="count leaf nodes or search for the best move")
+    parser.add_argument("depth", type=int, help="depth in plies")
+    parser.add_argument("--fen", help="position in Forsyth-Edwards Notation, the starting position if not given")
+    parser.add_argument("--workers", type=int, help="number of worker processes, the number of processors if not given")
+    args: argparse.Namespace = parser.parse_args()
+
+    board: Board = load_fen(args.fen) if args.fen else get_start_board()
+    start: float = time.perf_counter()
+    if args.mode == "perft":
+        counts: dict[tuple, int] = parallel_perft(board, args.depth, args.workers)
+        for move, count in counts.items():
+            print(f"{get_move_name(move)}: {count}")
+        nodes: int = sum(counts.values())
+    else:
+        bestMove, score, scores, nodes = parallel_analyse(board, args.depth, args.workers)
+        for move, moveScore in sorted(scores.items(), key=lambda item: -item[1]):
+            print(f"{get_move_name(move)}: {moveScore}")
+        if bestMove is not None:
+            print(f"Best move: {get_move_name(bestMove)} ({score})")
+    elapsed: float = time.perf_counter() - start
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.2f}s")
+    print(f"Nodes/second: {nodes / elapsed if elapsed else 0:.0f}")
+
+if __name__ == "__main__":
+    main()
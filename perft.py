@@ -0,0 +1,186 @@
+# Modules
+import argparse, sys, time
+
+# Files
+from board import Board
+from constants import Colours
+from notation import get_fen, get_move_name, iter_epd, load_fen
+from pieces import Pieces
+
+# Standard test positions and their node counts from depth 1, in Forsyth-Edwards Notation
+POSITIONS: dict[str, tuple[str, list[int]]] = {
+    "kiwipete": (
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603, 193690690]
+    ),
+    "position3": (
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        [14, 191, 2812, 43238, 674624, 11030083]
+    ),
+    "position4": (
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        [6, 264, 9467, 422333, 15833292]
+    ),
+    "position5": (
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        [44, 1486, 62379, 2103487, 89941194]
+    ),
+    "position6": (
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594]
+    )
+}
+
+# Node counts of the starting position from depth 1
+START_COUNTS: list[int] = [20, 400, 8902, 197281, 4865609, 119060324]
+
+# Functions
+def get_start_board() -> Board:
+    """
+    Set up a board in the starting position.
+
+    Returns:
+        Board: Board with both colours' pieces in their starting position
+    """
+    board: Board = Board()
+    for colour in Colours:
+        Pieces(colour.value, board)
+    return board
+
+def perft(board: Board, depth: int) -> int:
+    """
+    Count the leaf nodes of the legal move tree.
+
+    Parameters:
+        board (Board): Board holding the position, restored once counted
+        depth (int): Depth in plies to count to
+
+    Returns:
+        int: Number of leaf nodes
+    """
+    moves: list[tuple] = board.pieces[board.turn].get_legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+
+    nodes: int = 0
+    for move in moves:
+        board.make_move(*move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+def divide(board: Board, depth: int) -> dict[str, int]:
+    """
+    Count the leaf nodes of the legal move tree below each first move.
+
+    Parameters:
+        board (Board): Board holding the position, restored once counted
+        depth (int): Depth in plies to count to, including the first move
+
+    Returns:
+        dict[str, int]: Number of leaf nodes, keyed by the long algebraic name of the first move
+    """
+    counts: dict[str, int] = {}
+    for move in board.pieces[board.turn].get_legal_moves():
+        board.make_move(*move)
+        counts[get_move_name(move)] = perft(board, depth - 1)
+        board.unmake_move()
+    return counts
+
+def run_suite(max_depth: int, max_nodes: int) -> bool:
+    """
+    Check the node counts of the starting position and standard test positions, printing the results.
+
+    Parameters:
+        max_depth (int): Deepest depth to check
+        max_nodes (int): Largest expected node count to check
+
+    Returns:
+        bool: True if every count matched, else false
+    """
+    cases: list[tuple[str, callable, list[int]]] = [("start", get_start_board, START_COUNTS)]
+    for name, (fen, counts) in POSITIONS.items():
+        cases.append((name, lambda fen=fen: load_fen(fen), counts))
+
+    passed: bool = True
+    for name, setup, counts in cases:
+        for depth, expected in enumerate(counts[:max_depth], 1):
+            if expected > max_nodes:
+                break
+            board: Board = setup()
+            start: float = time.perf_counter()
+            nodes: int = perft(board, depth)
+            elapsed: float = time.perf_counter() - start
+
+            result: str = "ok" if nodes == expected else f"FAIL (expected {expected})"
+            passed = passed and nodes == expected
+            print(f"{name} depth {depth}: {nodes} nodes in {elapsed:.2f}s, {nodes / elapsed:.0f} nodes/s {result}")
+    return passed
+
+def run_epd(path: str, max_depth: int, max_nodes: int) -> bool:
+    """
+    Check the node counts of the positions in an Extended Position Description file, printing the results.
+    The expected count at each depth is given by the D1, D2, ... operations.
+
+    Parameters:
+        path (str): Path of the file, read one position at a time
+        max_depth (int): Deepest depth to check
+        max_nodes (int): Largest expected node count to check
+
+    Returns:
+        bool: True if every count matched, else false
+    """
+    passed: bool = True
+    for board, operations in iter_epd(path):
+        fen: str = get_fen(board)
+        for depth in range(1, max_depth + 1):
+            if f"D{depth}" not in operations:
+                break
+            expected: int = int(operations[f"D{depth}"])
+            if expected > max_nodes:
+                break
+            nodes: int = perft(board, depth)
+            passed = passed and nodes == expected
+            result: str = "ok" if nodes == expected else f"FAIL (expected {expected})"
+            print(f"{fen} depth {depth}: {nodes} nodes {result}")
+    return passed
+
+def main() -> None:
+    """ Run perft from the command line. """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Count the leaf nodes of the move tree.")
+    parser.add_argument("depth", type=int, nargs="?", default=3, help="depth in plies")
+    parser.add_argument("--fen", help="position in Forsyth-Edwards Notation, the starting position if not given")
+    parser.add_argument("--position", choices=POSITIONS, help="standard test position to use")
+    parser.add_argument("--divide", action="store_true", help="show the node count below each first move")
+    parser.add_argument("--suite", action="store_true", help="check the standard test positions up to the depth")
+    parser.add_argument("--epd", help="check the node counts in an Extended Position Description file up to the depth")
+    parser.add_argument("--max-nodes", type=int, default=1000000, help="largest node count to check in the suite")
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.suite:
+        sys.exit(0 if run_suite(args.depth, args.max_nodes) else 1)
+    if args.epd:
+        sys.exit(0 if run_epd(args.epd, args.depth, args.max_nodes) else 1)
+
+    if args.position:
+        board: Board = load_fen(POSITIONS[args.position][0])
+    elif args.fen:
+        board: Board = load_fen(args.fen)
+    else:
+        board: Board = get_start_board()
+
+    start: float = time.perf_counter()
+    if args.divide:
+        counts: dict[str, int] = divide(board, args.depth)
+        for name, count in counts.items():
+            print(f"{name}: {count}")
+        nodes: int = sum(counts.values())
+    else:
+        nodes: int = perft(board, args.depth)
+    elapsed: float = time.perf_counter() - start
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.2f}s")
+    print(f"Nodes/second: {nodes / elapsed if elapsed else 0:.0f}")
+
+if __name__ == "__main__":
+    main()
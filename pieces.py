@@ -2,10 +2,12 @@
 import operator
 
 # Files
-from constants import BOARD_HEIGHT, BOARD_WIDTH, Colours
-
-# Exceptions
-from exceptions import EmptyCoordinateException
+from bitboard import get_coords
+from constants import BOARD_HEIGHT, BOARD_WIDTH, CastlingRights, Colours, PieceTypes
+from tables import (
+    ALL_SQUARES, BISHOP_DIRECTIONS, KING_ATTACK_MASKS, KING_DIRECTIONS, KING_MOVES, KNIGHT_ATTACK_MASKS, KNIGHT_MOVES,
+    PAWN_ATTACK_MASKS, PAWN_ATTACKS, PAWN_PUSHES, QUEEN_DIRECTIONS, RAY_MASKS, ROOK_DIRECTIONS
+)
 
 # Board type
 class BoardType(object):
@@ -16,6 +18,10 @@ class BoardType(object):
 class Piece(object):
     """ A generic piece on the board """
     MOVES = []
+    TYPE: int = None
+
+    # Fixed attributes instead of a per-piece dictionary, as many pieces are kept alive at once
+    __slots__ = ("x", "y", "colour", "captured", "moved", "attacks", "index", "board")
 
     def __init__(self, x: int, y: int, colour: int, board: BoardType) -> None:
         """
@@ -32,6 +38,8 @@ class Piece(object):
         self.colour: int = colour
         self.captured: bool = False
         self.moved: bool = False
+        self.attacks: int = 0 # Bitboard of the attacked squares, kept up to date by the board
+        self.index: int = -1 # Position in its collection's list of the piece type, kept up to date by the collection
         self.board = board
         self.board.add_piece(self)
 
@@ -44,6 +52,15 @@ class Piece(object):
         """
         return (self.x, self.y)
 
+    def get_square(self) -> int:
+        """
+        Get the index of the piece's square, used to read the precomputed move tables.
+
+        Returns:
+            int: Index of the square the piece is on
+        """
+        return self.y * BOARD_WIDTH + self.x
+
     def get_new_coord(self, coord: (int, int), direction: (int, int)) -> (int, int):
         """
         Get the coordinate of the next position.
@@ -101,9 +118,27 @@ class Piece(object):
 
         moves: list[tuple[int, int]] = []
         for move in self.MOVES:
-            moves += self.get_indefinite_moves(self.get_new_coord(self.get_coord(), move), move)
+            moves += self.get_indefinite_moves(self.get_coord(), move)
         return moves
 
+    def get_attacks(self) -> int:
+        """
+        Gets the squares the piece attacks, including squares defended by the piece.
+
+        Returns:
+            int: Bitboard of the attacked squares
+        """
+        return self.board.get_slider_attacks(self.get_square(), self.MOVES)
+
+    def get_captures(self) -> list[tuple[int, int]]:
+        """
+        Gets the moves that capture an opposing piece, read from the attacked squares without generating quiet moves.
+
+        Returns:
+            list[tuple[int, int]]: Array of x- y-coordinates of the opposing pieces that can be captured
+        """
+        return get_coords(self.attacks & self.board.bitboards.occupied[1 - self.colour])
+
     def validate_move(self, coord: (int, int)) -> bool:
         """ 
         Checks that the move is valid.
@@ -129,42 +164,36 @@ class Piece(object):
             bool: True if the attack is valid, else false
         """
 
-        # Check bounds
-        x, y = coord
-        if x < 0 or y < 0 or x >= BOARD_WIDTH or y >= BOARD_HEIGHT:
-            return False
-        
-        try: 
-            # Check that the piece is on the opposite team
-            return self.board.get_piece(coord).get_colour() != self.colour
-        except EmptyCoordinateException:
-            # Piece does not exist
-            return False
+        # Check that a piece on the opposite team is there
+        return self.board.is_enemy_coord(coord, self.colour)
 
     def get_indefinite_moves(self, coord: (int, int), direction: (int, int)) -> list[tuple[int, int]]:
         """ 
         Gets all the valid moves in a direction indefinitely till it is not valid.
         
         Parameters:
-            coord ((int, int)): x- y-coordinate of the move to be validated
+            coord ((int, int)): x- y-coordinate to move from, not included in the moves
             direction ((int, int)): x- y-direction of the the next move
 
         Return:
             list[tuple[int, int]]: Array of x- y-coordinates that the piece can move to
         """
 
-        # Check that the piece can attack and stop checking
-        if self.validate_attack(coord):
-            return [coord]
-        # Check that the current move is valid and continue checking
-        if self.validate_move(coord):
-            return [coord] + self.get_indefinite_moves(self.get_new_coord(coord, direction), direction)
-        # Current coordinate is invalid
-        return []
+        # Empty squares can be moved to
+        passed, blocker = self.board.scan_ray(coord, direction)
+        moves: list[tuple[int, int]] = list(passed)
+
+        # Check that the piece can attack the blocker
+        if blocker is not None and blocker.get_colour() != self.colour:
+            moves.append(blocker.get_coord())
+        return moves
 
 
 class Pawn(Piece):
-    """ The pawn piece. """  
+    """ The pawn piece. """
+    __slots__ = ()
+
+    TYPE: int = PieceTypes.PAWN.value
 
     def get_possible_moves(self) -> list[tuple[int, int]]:
         """ 
@@ -175,33 +204,59 @@ class Pawn(Piece):
         """
         
         moves: list[tuple[int, int]] = []
-
-        moveFactor = -1 if self.colour == Colours.WHITE.value else 1
+        square: int = self.get_square()
 
         # Regular move
-        MOVE: tuple[int, int] = (0, 1 * moveFactor)
-        coord: tuple[int, int] = self.get_new_coord(self.get_coord(), MOVE)
-        if self.validate_move(coord):
-            moves += [(coord)]
-
-        # Starting move
-        STARTING_MOVE: tuple[int, int] = (0, 2 * moveFactor)
-        coord: tuple[int, int] = self.get_new_coord(self.get_coord(), STARTING_MOVE)
-        if not self.has_moved() and self.validate_move(coord):
-            moves += [(coord)]
-
-        # Attacks
-        ATTACKS: list[tuple[int, int]] = [(-1, 1 * moveFactor), (1, 1 * moveFactor)]
-        for attack in ATTACKS:
-            coord: tuple[int, int] = self.get_new_coord(self.get_coord(), attack)
-            if self.validate_attack(coord):
-                moves += [(coord)]
+        pushes: tuple[tuple[int, int], ...] = PAWN_PUSHES[self.colour][square]
+        if pushes and self.validate_move(pushes[0]):
+            moves.append(pushes[0])
+
+            # Starting move, only if the square in front is also free
+            if len(pushes) > 1 and not self.has_moved() and self.validate_move(pushes[1]):
+                moves.append(pushes[1])
+
+        # Attacks, including en passant on the turn straight after the opposing pawn's starting move
+        for coord in PAWN_ATTACKS[self.colour][square]:
+            if self.validate_attack(coord) or (coord == self.board.en_passant and self.colour == self.board.turn):
+                moves.append(coord)
         
         return moves
 
+    def get_attacks(self) -> int:
+        """
+        Gets the squares the piece attacks, including squares defended by the piece.
+
+        Returns:
+            int: Bitboard of the attacked squares
+        """
+        return PAWN_ATTACK_MASKS[self.colour][self.get_square()]
+
+    def get_captures(self) -> list[tuple[int, int]]:
+        """
+        Gets the moves that capture an opposing piece, including en passant, and the promotions.
+
+        Returns:
+            list[tuple[int, int]]: Array of x- y-coordinates that the piece can move to
+        """
+        moves: list[tuple[int, int]] = []
+        square: int = self.get_square()
+
+        # Promotion without a capture
+        pushes: tuple[tuple[int, int], ...] = PAWN_PUSHES[self.colour][square]
+        if pushes and pushes[0][1] in (0, BOARD_HEIGHT - 1) and self.validate_move(pushes[0]):
+            moves.append(pushes[0])
+
+        for coord in PAWN_ATTACKS[self.colour][square]:
+            if self.validate_attack(coord) or (coord == self.board.en_passant and self.colour == self.board.turn):
+                moves.append(coord)
+        return moves
+
 
 class Knight(Piece):
     """ The knight piece. """
+    __slots__ = ()
+
+    TYPE: int = PieceTypes.KNIGHT.value
 
     def get_possible_moves(self) -> list[tuple[int, int]]:
         """ 
@@ -213,44 +268,57 @@ class Knight(Piece):
 
         moves: list[tuple[int, int]] = []
 
-        # Regular move
-        MOVES: list[tuple[int, int]] = [(-1, -2), (-1, 2), (1, -2), (-1, 2), (-2, -1), (-2, 1), (2, -1), (2, 1)]
-        for move in MOVES:
-            coord: tuple[int, int] = self.get_new_coord(self.get_coord(), move)
-            if self.validate_move(coord):
-                moves += [(coord)]
-
-        # Attacks
-        for attack in MOVES:
-            coord: tuple[int, int] = self.get_new_coord(self.get_coord(), attack)
-            if self.validate_attack(coord):
-                moves += [(coord)]
+        # Regular moves and attacks
+        for coord in KNIGHT_MOVES[self.get_square()]:
+            if self.validate_move(coord) or self.validate_attack(coord):
+                moves.append(coord)
 
         return moves
 
+    def get_attacks(self) -> int:
+        """
+        Gets the squares the piece attacks, including squares defended by the piece.
+
+        Returns:
+            int: Bitboard of the attacked squares
+        """
+        return KNIGHT_ATTACK_MASKS[self.get_square()]
+
 
 class Queen(Piece):
     """ The queen piece. """
+    __slots__ = ()
 
-    MOVES: list[tuple[int, int]] = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+    TYPE: int = PieceTypes.QUEEN.value
+    MOVES: tuple[tuple[int, int], ...] = QUEEN_DIRECTIONS
 
 
 class Bishop(Piece):
     """ The bishop piece. """
+    __slots__ = ()
 
-    MOVES: list[tuple[int, int]] = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+    TYPE: int = PieceTypes.BISHOP.value
+    MOVES: tuple[tuple[int, int], ...] = BISHOP_DIRECTIONS
 
 
 class Rook(Piece):
     """ The rook piece. """
+    __slots__ = ()
 
-    MOVES: list[tuple[int, int]] = [(-1, 0), (0, -1), (0, 1), (1, 0)]
+    TYPE: int = PieceTypes.ROOK.value
+    MOVES: tuple[tuple[int, int], ...] = ROOK_DIRECTIONS
 
 
 class King(Piece):
     """ The king piece. """
+    __slots__ = ("checked",)
 
-    MOVES: list[tuple[int, int]] = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (-1, 0)]
+    TYPE: int = PieceTypes.KING.value
+    MOVES: tuple[tuple[int, int], ...] = KING_DIRECTIONS
+    CASTLES: dict[tuple[int, int], tuple[tuple[int, int], int]] = { # Map rook's direction to king's move and white's castling right
+        (-1, 0): ((-2, 0), CastlingRights.WHITE_QUEENSIDE.value),
+        (1, 0): ((2, 0), CastlingRights.WHITE_KINGSIDE.value)
+    }
 
     def __init__(self, x: int, y: int, colour: int, board: BoardType) -> None:
         """
@@ -301,32 +369,50 @@ class King(Piece):
 
         moves: list[tuple[int, int]] = []
         # Regular moves and attacks
-        for move in self.MOVES:
-            coord: tuple[int, int] = self.get_new_coord(self.get_coord(), move)
+        for coord in KING_MOVES[self.get_square()]:
             if self.validate_move(coord) or self.validate_attack(coord):
-                moves += coord
+                moves.append(coord)
         
-        # Castling
-        if not self.has_moved():
-            CASTLES: dict[tuple[int, int], tuple[int, int]] = { # Map rook's direction to king's final coordinate
-                (-1, 0): (-2, 0),
-                (1, 0): (2, 0)
-            } 
-            for rookMove, kingMove in CASTLES.items():
-                rookCoord: tuple[int, int] = self.get_new_coord(self.get_coord(), rookMove)
-                
-                try:
-                    piece: Piece = self.board.get_piece_in_direction(rookCoord, rookMove)
-                except EmptyCoordinateException:
+        # Castling, not allowed out of check
+        rights: int = (self.board.castling >> (2 * self.colour)) & 3 # Black's rights are stored two bits above white's
+        if rights and not self.in_check():
+            for rookMove, (kingMove, right) in self.CASTLES.items():
+                if not rights & right:
                     continue
 
-                if piece is Rook and not piece.has_moved():
-                    coord: tuple[int, int] = self.get_new_coord(self.get_coord(), kingMove)
-                    if self.validate_move(coord):
-                        moves += coord
+                # Squares between the king and the corner rook must be empty
+                _, piece = self.board.scan_ray(self.get_coord(), rookMove)
+                if not isinstance(piece, Rook) or piece.x not in Pieces.ROOK_COLUMNS:
+                    continue
+
+                # King cannot pass through check
+                if self.is_coord_checked(self.get_new_coord(self.get_coord(), rookMove)):
+                    continue
+
+                coord: tuple[int, int] = self.get_new_coord(self.get_coord(), kingMove)
+                if self.validate_move(coord):
+                    moves.append(coord)
 
         return moves
 
+    def get_attacks(self) -> int:
+        """
+        Gets the squares the piece attacks, including squares defended by the piece.
+
+        Returns:
+            int: Bitboard of the attacked squares
+        """
+        return KING_ATTACK_MASKS[self.get_square()]
+
+    def get_captures(self) -> list[tuple[int, int]]:
+        """
+        Gets the moves that capture an opposing piece.
+
+        Returns:
+            list[tuple[int, int]]: Array of x- y-coordinates of the opposing pieces that can be captured
+        """
+        return [coord for coord in KING_MOVES[self.get_square()] if self.validate_attack(coord)]
+
     def in_check(self) -> bool:
         """ 
         Checks if the king is still in check.
@@ -334,7 +420,7 @@ class King(Piece):
         Returns:
             bool: True if the king's current coordinate is in check.
         """
-        return self.is_coord_checked(self.get_coord())
+        return bool(self.board.attacked[1 - self.colour] & (1 << self.get_square()))
 
     def is_coord_checked(self, coord: (int, int)) -> bool:
         """
@@ -347,33 +433,50 @@ class King(Piece):
             bool: True if the coordinate would put the king in check, else false
         """
 
-        # Check for recursive pieces
-        REC_DIRECTIONS: list[tuple[int, int]] = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+        bit: int = 1 << (coord[1] * BOARD_WIDTH + coord[0])
+        attacked: int = self.board.attacked[1 - self.colour]
+        if attacked & bit:
+            return True
 
-        for direction in REC_DIRECTIONS:
-            try:
-                piece: Piece = self.board.get_piece_in_direction(self.get_new_coord(coord, direction), direction)
-            except EmptyCoordinateException:
-                continue
+        # While in check, the king hides the squares behind it from the checking pieces
+        if attacked & (1 << self.get_square()):
+            return bool(self.get_hidden_squares() & bit)
 
-            if piece is not None and coord in piece.get_possible_moves():
-                return True
-        
-        # Check for knights
-        KNIGHT_DIRECTIONS: list[tuple[int, int]] = [(-1, -2), (-1, 2), (1, -2), (-1, 2), (-2, -1), (-2, 1), (2, -1), (2, 1)]
+        # Coordinate is clear
+        return False
 
-        for direction in KNIGHT_DIRECTIONS:
-            try:
-                piece: Piece = self.board.get_piece(self.get_new_coord(coord, direction))
-            except EmptyCoordinateException:
-                continue
+    def get_hidden_squares(self) -> int:
+        """
+        Gets the squares behind the king on the lines of the sliding pieces checking it.
+        These are not in the attack maps as the king blocks them, but the king cannot move there.
 
-            if piece is Knight:
-                return True
+        Returns:
+            int: Bitboard of the hidden squares
+        """
+
+        hidden: int = 0
+        bit: int = 1 << self.get_square()
+        for piece in self.board.pieces[1 - self.colour].get_sliders():
+            if piece.attacks & bit:
+                # Step from the king away from the checking piece
+                x: int = self.x + (self.x > piece.x) - (self.x < piece.x)
+                y: int = self.y + (self.y > piece.y) - (self.y < piece.y)
+                if 0 <= x < BOARD_WIDTH and 0 <= y < BOARD_HEIGHT:
+                    hidden |= 1 << (y * BOARD_WIDTH + x)
+        return hidden
+
+
+# Piece classes indexed by piece type
+PIECE_CLASSES: tuple[type, ...] = (Pawn, Knight, Bishop, Rook, Queen, King)
+
+# Piece types that attack along rays
+SLIDER_TYPES: tuple[int, ...] = (PieceTypes.BISHOP.value, PieceTypes.ROOK.value, PieceTypes.QUEEN.value)
+
+# Piece types a pawn can be promoted to, most valuable first
+PROMOTION_TYPES: tuple[int, ...] = (
+    PieceTypes.QUEEN.value, PieceTypes.ROOK.value, PieceTypes.BISHOP.value, PieceTypes.KNIGHT.value
+)
 
-        # Coordinate is clear
-        return False
-        
 
 class Pieces(object):
     """ Collection of pieces. """
@@ -383,14 +486,40 @@ class Pieces(object):
     QUEEN_COLUMN: list[int] = 3
     KING_COLUMN: list[int] = 4
 
-    def __init__(self, colour: int, board: BoardType) -> None:
+    def __init__(self, colour: int, board: BoardType, setup: bool = True) -> None:
         """
         Initialise player's pieces.
 
         Parameters:
             colour (int): Enum value of the piece's colour
             board (BoardType): Board the pieces are on
+            setup (bool): Place the pieces in their starting position, otherwise start with no pieces
+        """
+        self.colour: int = colour
+        self.board: BoardType = board
+
+        # Pieces of each type, indexed by piece type, with the king in its own list as well
+        self.types: list[list[Piece]] = [[] for _ in PIECE_CLASSES]
+        self.pawns: list[Pawn] = self.types[PieceTypes.PAWN.value]
+        self.knights: list[Knight] = self.types[PieceTypes.KNIGHT.value]
+        self.bishops: list[Bishop] = self.types[PieceTypes.BISHOP.value]
+        self.rooks: list[Rook] = self.types[PieceTypes.ROOK.value]
+        self.queens: list[Queen] = self.types[PieceTypes.QUEEN.value]
+        self.king: King = None
+
+        board.set_pieces(self)
+        if setup:
+            self.setup(board)
+
+    def setup(self, board: BoardType) -> None:
+        """
+        Place the pieces in their starting position.
+
+        Parameters:
+            board (BoardType): Board the pieces are on
         """
+        colour: int = self.colour
+
         # Row number
         front: int = 1
         back: int = 0
@@ -399,34 +528,229 @@ class Pieces(object):
             back: int = BOARD_HEIGHT - 1
 
         # Front row pieces
-        self.pawns: list[Pawn] = []
         for col in range(0, BOARD_WIDTH):
-            self.pawns.append(Pawn(col, front, colour, board))
+            self.add(Pawn(col, front, colour, board))
 
-        # Back row pieces
-        self.rooks: list[Rook] = []
-        self.knights: list[Knight] = []
-        self.bishops: list[Bishop] = []
-        self.queens: list[Queen] = []
-        
         # Rooks
         for col in self.ROOK_COLUMNS:
-            self.rooks.append(Rook(col, back, colour, board))
+            self.add(Rook(col, back, colour, board))
 
         # Knights
         for col in self.KNIGHT_COLUMNS:
-            self.knights.append(Knight(col, back, colour, board))
+            self.add(Knight(col, back, colour, board))
 
         # Bishops
         for col in self.BISHOP_COLUMNS:
-            self.bishops.append(Bishop(col, back, colour, board))
+            self.add(Bishop(col, back, colour, board))
 
         # Queen
-        self.queens.append(Queen(self.QUEEN_COLUMN, back, colour, board))
+        self.add(Queen(self.QUEEN_COLUMN, back, colour, board))
 
         # King
-        self.king: King = King(self.KING_COLUMN, back, colour, board)
-        
+        self.add(King(self.KING_COLUMN, back, colour, board))
+
+        # The starting position has full castling rights for the colour
+        board.set_castling(
+            board.castling | (CastlingRights.WHITE_KINGSIDE.value | CastlingRights.WHITE_QUEENSIDE.value) << (2 * colour)
+        )
+        board.refresh_attacks()
+
+    def get_type_list(self, piece_type: int) -> list[Piece]:
+        """
+        Gets the list holding the pieces of a type.
+
+        Parameters:
+            piece_type (int): Enum value of the piece type
+
+        Returns:
+            list[Piece]: Pieces of the type
+        """
+        return self.types[piece_type]
+
+    def get_pieces(self) -> list[Piece]:
+        """
+        Gets every piece in the collection.
+
+        Returns:
+            list[Piece]: Pieces in the collection, with the king last
+        """
+        pieces: list[Piece] = []
+        for typePieces in self.types:
+            pieces += typePieces
+        return pieces
+
+    def get_sliders(self) -> list[Piece]:
+        """
+        Gets the sliding pieces in the collection.
+
+        Returns:
+            list[Piece]: Bishops, rooks and queens
+        """
+        return self.bishops + self.rooks + self.queens
+
+    def add(self, piece: Piece) -> None:
+        """
+        Adds a piece to the end of its type's list.
+
+        Parameters:
+            piece (Piece): Piece to be added
+        """
+        typePieces: list[Piece] = self.types[piece.TYPE]
+        piece.index = len(typePieces)
+        typePieces.append(piece)
+        if piece.TYPE == PieceTypes.KING.value:
+            self.king = piece
+
+    def remove(self, piece: Piece) -> None:
+        """
+        Removes a piece from the collection in constant time, moving the last piece of its type into its place.
+
+        Parameters:
+            piece (Piece): Piece to be removed
+        """
+        typePieces: list[Piece] = self.types[piece.TYPE]
+        last: Piece = typePieces.pop()
+        if last is not piece:
+            typePieces[piece.index] = last
+            last.index = piece.index
+        piece.index = -1
+
+    def iter_moves(self, captures_only: bool = False):
+        """
+        Generates the possible moves one at a time, which may leave the king in check.
+        The board can be changed between moves, as long as it is restored before the next is generated.
+
+        Parameters:
+            captures_only (bool): Only generate captures and promotions, without generating the quiet moves
+
+        Returns:
+            Generator[tuple]: Moves as starting coordinate, ending coordinate and, for promotions, the piece type
+        """
+        # Iterate over a copy, as promotions made between moves reorder the piece lists
+        for piece in self.get_pieces():
+            pos: tuple[int, int] = piece.get_coord()
+            ends: list[tuple[int, int]] = piece.get_captures() if captures_only else piece.get_possible_moves()
+            if piece.TYPE == PieceTypes.PAWN.value:
+                for move in ends:
+                    if move[1] in (0, BOARD_HEIGHT - 1):
+                        for promotion in PROMOTION_TYPES:
+                            yield (pos, move, promotion)
+                    else:
+                        yield (pos, move)
+            else:
+                for move in ends:
+                    yield (pos, move)
+
+    def get_move_masks(self) -> tuple[int, dict[int, int]]:
+        """
+        Gets the squares the pieces other than the king can move to without leaving the king in check,
+        from the pieces checking the king and the pieces pinned against it.
+
+        Returns:
+            tuple[int, dict[int, int]]: Bitboard of the squares that capture or block the checking piece,
+                every square when not in check and none in double check,
+                and the bitboard of the ray each pinned piece can move along, keyed by the pinned piece's square
+        """
+        board: BoardType = self.board
+        king: King = self.king
+        kingSquare: int = king.get_square()
+        kingBit: int = 1 << kingSquare
+        enemy: Pieces = board.pieces[1 - self.colour]
+        checkMask: int = ALL_SQUARES
+        pins: dict[int, int] = {}
+
+        # Moves must capture a single checking piece or block its ray, and only the king can move out of double check
+        if board.attacked[1 - self.colour] & kingBit:
+            checkers: int = 0
+            for piece in enemy.get_pieces():
+                if piece.attacks & kingBit:
+                    checkers += 1
+                    if piece.TYPE in SLIDER_TYPES:
+                        checkMask = self.get_line(kingSquare, piece)
+                    else:
+                        checkMask = 1 << piece.get_square()
+            if checkers > 1:
+                return 0, pins
+
+        # A piece is pinned when it is the only piece between the king and an opposing slider lined up with it
+        occupied: int = board.bitboards.all
+        own: int = board.bitboards.occupied[self.colour]
+        for piece in enemy.get_sliders():
+            line: int = self.get_line(kingSquare, piece)
+            if not line:
+                continue
+            blockers: int = line & occupied & ~(1 << piece.get_square())
+            if blockers & own and not blockers & (blockers - 1):
+                pins[blockers.bit_length() - 1] = line
+        return checkMask, pins
+
+    def get_line(self, king_square: int, piece: Piece) -> int:
+        """
+        Gets the squares from the king to an opposing slider, if the slider moves along the line between them.
+
+        Parameters:
+            king_square (int): Square index of the king
+            piece (Piece): Opposing bishop, rook or queen
+
+        Returns:
+            int: Bitboard of the squares after the king up to and including the slider's, or 0 if they are not lined up
+        """
+        kingX: int = king_square % BOARD_WIDTH
+        kingY: int = king_square // BOARD_WIDTH
+        dx: int = (piece.x > kingX) - (piece.x < kingX)
+        dy: int = (piece.y > kingY) - (piece.y < kingY)
+        if (dx and dy and abs(piece.x - kingX) != abs(piece.y - kingY)) or (dx, dy) not in piece.MOVES:
+            return 0
+        return RAY_MASKS[king_square][(dx, dy)] ^ RAY_MASKS[piece.get_square()][(dx, dy)]
+
+    def iter_legal_moves(self, captures_only: bool = False):
+        """
+        Generates the moves that do not leave the king in check one at a time.
+        Moves are restricted by the checks and pins found once for the position, rather than by making each move.
+        The board can be changed between moves, as long as it is restored before the next is generated.
+
+        Parameters:
+            captures_only (bool): Only generate captures and promotions
+
+        Returns:
+            Generator[tuple]: Moves as starting coordinate, ending coordinate and, for promotions, the piece type
+        """
+        board: BoardType = self.board
+        king: King = self.king
+        checkMask, pins = self.get_move_masks()
+        for piece in self.get_pieces():
+            pos: tuple[int, int] = piece.get_coord()
+
+            # The king's moves are already checked against the attacked squares
+            if piece is king:
+                for move in piece.get_captures() if captures_only else piece.get_possible_moves():
+                    yield (pos, move)
+                continue
+
+            mask: int = checkMask & pins.get(piece.get_square(), ALL_SQUARES)
+            if not mask:
+                continue
+            ends: list[tuple[int, int]] = piece.get_captures() if captures_only else piece.get_possible_moves()
+            if piece.TYPE == PieceTypes.PAWN.value:
+                for move in ends:
+                    if move == board.en_passant and board.board[move[1]][move[0]] is None:
+                        # En passant removes two pawns from a row, which can uncover a check, so it is made to be checked
+                        board.make_move(pos, move)
+                        legal: bool = not king.in_check()
+                        board.unmake_move()
+                        if legal:
+                            yield (pos, move)
+                    elif mask & (1 << (move[1] * BOARD_WIDTH + move[0])):
+                        if move[1] in (0, BOARD_HEIGHT - 1):
+                            for promotion in PROMOTION_TYPES:
+                                yield (pos, move, promotion)
+                        else:
+                            yield (pos, move)
+            else:
+                for move in ends:
+                    if mask & (1 << (move[1] * BOARD_WIDTH + move[0])):
+                        yield (pos, move)
+
     def get_all_moves(self) -> list[tuple[int, int], tuple[int, int]]:
         """
         Gets all the possible moves.
@@ -434,48 +758,44 @@ class Pieces(object):
         Returns:
             list[tuple[int, int], tuple[int, int]]: list of all moves. 
                 First tuple is the current coordinate and
-                second tuple is the possible move coordinate
+                second tuple is the possible move coordinate.
+                Promotions have a third value, the enum value of the piece type promoted to
+        """
+        return list(self.iter_moves())
+
+    def get_legal_moves(self) -> list[tuple]:
         """
+        Gets the moves that do not leave the king in check.
 
-        def get_moves(piece: Piece) -> list[tuple[int, int], tuple[int, int]]:
-            posMoves = []
-            pos = piece.get_coord()
-            for move in piece.get_possible_moves():
-                posMoves.append((pos, move))
-            print(posMoves)
-            return posMoves
+        Returns:
+            list[tuple]: Moves as starting coordinate, ending coordinate and, for promotions, the piece type
+        """
+        return list(self.iter_legal_moves())
 
+    def has_legal_move(self) -> bool:
+        """
+        Checks whether there is a legal move, stopping at the first one found.
 
-        moves = []
-        # Pawns
-        print("Pawns:")
-        for pawn in self.pawns:
-            moves += get_moves(pawn)
-        
-        # Rooks
-        print("Rooks:")
-        for rook in self.rooks:
-            moves += get_moves(rook)
+        Returns:
+            bool: True if there is a move that does not leave the king in check, else false
+        """
+        return next(self.iter_legal_moves(), None) is not None
 
-        # Knights
-        print("Knights")
-        for knight in self.knights:
-            moves += get_moves(knight)
+    def is_possible_move(self, move: tuple) -> bool:
+        """
+        Checks that a move, such as one read from a table, is a possible move of the collection's pieces.
 
-        # Bishops
-        print("Bishops")
-        for bishop in self.bishops:
-            moves += get_moves(bishop)
-        
-        # Queen
-        print("Queens")
-        for queen in self.queens:
-            moves += get_moves(queen)
-        
-        # King
-        print("King")
-        moves += get_moves(self.king)
+        Parameters:
+            move (tuple): Starting coordinate, ending coordinate and, for promotions, the piece type
 
-        return moves
-        
-        
\ No newline at end of file
+        Returns:
+            bool: True if the move is possible, which may leave the king in check, else false
+        """
+        (x, y), end = move[0], move[1]
+        piece: Piece = self.board.board[y][x]
+        if piece is None or piece.colour != self.colour:
+            return False
+        promotes: bool = piece.TYPE == PieceTypes.PAWN.value and end[1] in (0, BOARD_HEIGHT - 1)
+        if promotes != (len(move) > 2) or (promotes and move[2] not in PROMOTION_TYPES):
+            return False
+        return end in piece.get_possible_moves()
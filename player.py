@@ -3,7 +3,11 @@ import random
 
 # Files
 from board import Board
+from book import Book
 from pieces import Pieces
+from search import Search
+from tablebase import Tablebases
+from transposition import TranspositionTable
 
 class Player(object):
     """ One of the players in the game. """
@@ -14,15 +18,39 @@ class Player(object):
 
         Parameters
             colour (int): The enum value of the player's colour
-            board (Board): The board the player is playing on
+            board (Board): The board the player is playing on, the colour's pieces are set up if it has none
         """
         self.colour: int = colour
-        self.pieces: Pieces = Pieces(colour, board)
+        self.board: Board = board
+        self.pieces: Pieces = board.pieces[colour] or Pieces(colour, board)
 
 
 class Bot(Player):
     """ Generic bot. """
-    
+
+    def __init__(self, colour: int, board: Board, book: Book = None) -> None:
+        """
+        Initialise the bot.
+
+        Parameters
+            colour (int): The enum value of the player's colour
+            board (Board): The board the player is playing on
+            book (Book): Opening book to play from while the position is in it, none is used if not given
+        """
+        super().__init__(colour, board)
+        self.book: Book = book
+
+    def get_book_move(self) -> tuple:
+        """
+        Choose a move from the opening book.
+
+        Returns:
+            tuple: Book move, or None if there is no book or the position is not in it
+        """
+        if self.book is None:
+            return None
+        return self.book.choose_move(self.board)
+
     def move(self):
         """
         Abstract method.
@@ -41,12 +69,44 @@ class RandBot(Bot):
         Returns:
             tuple[tuple[int, int], tuple[int, int]]: tuple of starting coordinates and ending coordinates
         """
-        possibleMoves = self.pieces.getAllMoves()
+        bookMove: tuple = self.get_book_move()
+        if bookMove is not None:
+            return bookMove
+
+        possibleMoves = self.pieces.get_legal_moves()
+        if not possibleMoves:
+            return None
         return possibleMoves[random.randrange(0, len(possibleMoves))]
 
 
 class SmartBot(Bot):
     """ Bot that strategically chooses moves. """
+
+    def __init__(self, colour: int, board: Board, max_time: float = 1.0, max_nodes: int = None,
+                 max_depth: int = None, hash_mb: float = 16, book: Book = None, tablebases: Tablebases = None,
+                 table: TranspositionTable = None) -> None:
+        """
+        Initialise the bot.
+
+        Parameters
+            colour (int): The enum value of the player's colour
+            board (Board): The board the player is playing on
+            max_time (float): Seconds the bot can search for each move
+            max_nodes (int): Nodes the bot can search for each move
+            max_depth (int): Plies the bot can search to for each move
+            hash_mb (float): Megabytes of memory for the transposition table
+            book (Book): Opening book to play from while the position is in it, none is used if not given
+            tablebases (Tablebases): Endgame tables to score positions in them exactly, none are used if not given
+            table (TranspositionTable): Table shared with other bots, one of hash_mb megabytes is allocated if not given
+        """
+        super().__init__(colour, board, book)
+        self.max_time: float = max_time
+        self.max_nodes: int = max_nodes
+        self.max_depth: int = max_depth
+        self.table: TranspositionTable = TranspositionTable(hash_mb) if table is None else table
+        self.tablebases: Tablebases = tablebases
+        self.search: Search = None # Most recent search, to read its statistics
+
     def move(self) -> tuple[tuple[int, int], tuple[int, int]]:
         """
         Strategically choose the next move.
@@ -54,4 +114,12 @@ class SmartBot(Bot):
         Returns:
             tuple[tuple[int, int], tuple[int, int]]: tuple of starting coordinates and ending coordinates
         """
-        pass
+        # No search is needed while in the book
+        bookMove: tuple = self.get_book_move()
+        if bookMove is not None:
+            return bookMove
+
+        self.search = Search(self.board, self.max_depth, self.max_time, self.max_nodes, table=self.table,
+                             tablebases=self.tablebases)
+        move, _ = self.search.search()
+        return move
@@ -0,0 +1,354 @@
+# Modules
+import time
+
+# Files
+from bitboard import decode_move, encode_move
+from board import Board
+from evaluation import evaluate
+from ordering import MoveOrdering
+from pieces import King, Pieces
+from tablebase import Outcome, Tablebases
+from transposition import Bound, TranspositionTable
+
+# Scores
+INFINITY: int = 1000000
+MATE_SCORE: int = 100000 # Mate at the root, reduced by the number of plies to the mate
+MATE_THRESHOLD: int = MATE_SCORE - 1000 # Scores beyond this are mates
+
+# Bound types
+EXACT: int = Bound.EXACT.value
+LOWER: int = Bound.LOWER.value
+UPPER: int = Bound.UPPER.value
+
+# Default depth limit when no other limit is given
+MAX_DEPTH: int = 64
+
+# Nodes searched between checks of the limits, a few milliseconds at the search's speed
+CHECK_INTERVAL: int = 128
+
+# Functions
+def score_to_table(score: int, ply: int) -> int:
+    """
+    Convert a score to be stored in the transposition table, making mate scores relative to the position.
+
+    Parameters:
+        score (int): Score relative to the root
+        ply (int): Plies from the root
+
+    Returns:
+        int: Score relative to the position
+    """
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+def score_from_table(score: int, ply: int) -> int:
+    """
+    Convert a score read from the transposition table to be relative to the root.
+
+    Parameters:
+        score (int): Score relative to the position
+        ply (int): Plies from the root
+
+    Returns:
+        int: Score relative to the root
+    """
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+class Search(object):
+    """ Negamax alpha-beta search with iterative deepening and quiescence search. """
+
+    def __init__(self, board: Board, max_depth: int = None, max_time: float = None, max_nodes: int = None,
+                 info: callable = None, table: TranspositionTable = None, tablebases: Tablebases = None) -> None:
+        """
+        Initialise the search.
+
+        Parameters:
+            board (Board): Board holding the position to search, which is restored once the search ends
+            max_depth (int): Maximum depth in plies, unlimited if a time or node limit is given
+            max_time (float): Wall-clock budget in seconds
+            max_nodes (int): Budget of nodes to search
+            info (callable): Called with the depth, score, nodes searched, nodes per second
+                and best move after each completed iteration
+            table (TranspositionTable): Table of results shared between searches, none is used if not given
+            tablebases (Tablebases): Endgame tables giving the exact score of positions in them, none are used if not given
+        """
+        self.board: Board = board
+        self.max_depth: int = max_depth or MAX_DEPTH
+        self.max_time: float = max_time
+        self.max_nodes: int = max_nodes
+        self.info: callable = info
+        self.table: TranspositionTable = table
+        self.tablebases: Tablebases = tablebases
+        self.ordering: MoveOrdering = MoveOrdering(board)
+
+        # Statistics
+        self.nodes: int = 0
+        self.cutoffs: int = 0 # Moves that scored at least beta
+        self.start_time: float = 0
+        self.elapsed: float = 0
+
+        # Set to end the search early
+        self.stopped: bool = False
+
+    def stop(self) -> None:
+        """ Stop the search, which returns the best move found so far. """
+        self.stopped = True
+
+    def get_nps(self) -> float:
+        """
+        Get the speed of the search.
+
+        Returns:
+            float: Nodes searched per second
+        """
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def check_limits(self) -> None:
+        """ Stop the search if the time or node budget has run out. """
+        self.elapsed = time.perf_counter() - self.start_time
+        if self.max_time is not None and self.elapsed >= self.max_time:
+            self.stopped = True
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            self.stopped = True
+
+    def search(self) -> tuple[tuple[tuple[int, int], tuple[int, int]], int]:
+        """
+        Search the position with iterative deepening until a limit is reached.
+
+        Returns:
+            tuple[tuple[tuple[int, int], tuple[int, int]], int]: Best move found, or None if there are no legal moves,
+                and its score in centipawns from the point of view of the side to move
+        """
+        self.nodes = 0
+        self.cutoffs = 0
+        self.stopped = False
+        self.start_time = time.perf_counter()
+        self.ordering.clear()
+        if self.table is not None:
+            self.table.new_search()
+
+        moves: list[tuple] = self.board.pieces[self.board.turn].get_legal_moves()
+        if not moves:
+            return None, self.negamax(1, -INFINITY, INFINITY, 0)
+        bestMove: tuple = self.get_hash_move(moves)
+        bestScore: int = 0
+
+        for depth in range(1, self.max_depth + 1):
+            # Search the previous best move first, so a partly searched iteration can still be used
+            moves.remove(bestMove)
+            moves.insert(0, bestMove)
+
+            alpha: int = -INFINITY
+            iterationMove: tuple = None
+            for move in moves:
+                self.board.make_move(*move)
+                score: int = -self.negamax(depth - 1, -INFINITY, -alpha, 1)
+                self.board.unmake_move()
+                if self.stopped:
+                    break
+                if score > alpha:
+                    alpha = score
+                    iterationMove = move
+
+            if iterationMove is not None:
+                bestMove, bestScore = iterationMove, alpha
+            if self.stopped:
+                break
+            if self.table is not None:
+                self.table.store(self.board.hash, depth, bestScore, EXACT, encode_move(bestMove))
+
+            self.elapsed = time.perf_counter() - self.start_time
+            if self.info is not None:
+                self.info(depth, bestScore, self.nodes, self.get_nps(), bestMove)
+
+            # Stop once a forced mate is found, or the moves were scored exactly by the endgame tables
+            if abs(bestScore) >= MATE_SCORE - MAX_DEPTH or self.probe_tablebases(0) is not None:
+                break
+
+        self.elapsed = time.perf_counter() - self.start_time
+        return bestMove, bestScore
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Search a position to a fixed depth.
+
+        Parameters:
+            depth (int): Remaining depth in plies
+            alpha (int): Lower bound of the score
+            beta (int): Upper bound of the score
+            ply (int): Plies from the root
+
+        Returns:
+            int: Score of the position from the point of view of the side to move
+        """
+        if depth <= 0:
+            return self.quiescence(alpha, beta, ply)
+
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self.check_limits()
+        if self.stopped:
+            return 0
+
+        # A position repeated since the last capture or pawn move can be repeated again, so is scored as a draw
+        if self.board.count_repetitions():
+            return 0
+
+        # Positions in the endgame tables need no search
+        score: int = self.probe_tablebases(ply)
+        if score is not None:
+            return score
+
+        board: Board = self.board
+        table: TranspositionTable = self.table
+        pieces: Pieces = board.pieces[board.turn]
+        hashMove: tuple = None
+
+        # Use a stored result if it was searched deep enough, otherwise search its best move first
+        if table is not None:
+            entry: tuple[int, int, int, int] = table.probe(board.hash)
+            if entry is not None:
+                entryDepth, entryScore, bound, entryMove = entry
+                if entryDepth >= depth:
+                    entryScore = score_from_table(entryScore, ply)
+                    if bound == EXACT or (bound == LOWER and entryScore >= beta) or (bound == UPPER and entryScore <= alpha):
+                        return entryScore
+                # A different position can share the hash, so the move is checked before it is made
+                if entryMove and pieces.is_possible_move(decode_move(entryMove)):
+                    hashMove = decode_move(entryMove)
+
+        king: King = pieces.king
+        originalAlpha: int = alpha
+        bestScore: int = -INFINITY
+        bestMove: tuple = None
+        for move in self.ordering.iter_moves(pieces, ply, hashMove):
+            board.make_move(*move)
+            if king.in_check():
+                board.unmake_move()
+                continue
+            score: int = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+
+            if self.stopped:
+                return 0
+            if score > bestScore:
+                bestScore = score
+                bestMove = move
+                if score >= beta:
+                    self.cutoffs += 1
+                    if self.ordering.is_quiet(move):
+                        self.ordering.add_cutoff(move, board.turn, depth, ply)
+                    break
+                if score > alpha:
+                    alpha = score
+
+        # Checkmate or stalemate
+        if bestMove is None:
+            return -MATE_SCORE + ply if king.in_check() else 0
+
+        if table is not None:
+            if bestScore >= beta:
+                bound: int = LOWER
+            elif bestScore <= originalAlpha:
+                bound: int = UPPER
+            else:
+                bound: int = EXACT
+            table.store(board.hash, depth, score_to_table(bestScore, ply), bound, encode_move(bestMove))
+        return bestScore
+
+    def quiescence(self, alpha: int, beta: int, ply: int) -> int:
+        """
+        Search captures until the position is quiet, so it is not evaluated in the middle of an exchange.
+
+        Parameters:
+            alpha (int): Lower bound of the score
+            beta (int): Upper bound of the score
+            ply (int): Plies from the root
+
+        Returns:
+            int: Score of the position from the point of view of the side to move
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self.check_limits()
+        if self.stopped:
+            return 0
+
+        score: int = self.probe_tablebases(ply)
+        if score is not None:
+            return score
+
+        # The side to move can choose not to capture
+        standPat: int = evaluate(self.board)
+        if standPat >= beta:
+            return standPat
+        if standPat > alpha:
+            alpha = standPat
+
+        board: Board = self.board
+        pieces: Pieces = board.pieces[board.turn]
+        king: King = pieces.king
+        for move in self.ordering.iter_captures(pieces):
+            board.make_move(*move)
+            if king.in_check():
+                board.unmake_move()
+                continue
+            score: int = -self.quiescence(-beta, -alpha, ply + 1)
+            board.unmake_move()
+
+            if self.stopped:
+                return 0
+            if score >= beta:
+                self.cutoffs += 1
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def probe_tablebases(self, ply: int) -> int:
+        """
+        Get the exact score of the position from the endgame tables.
+
+        Parameters:
+            ply (int): Plies from the root
+
+        Returns:
+            int: Score of the position from the point of view of the side to move,
+                or None if there are no tables or the position is not in them
+        """
+        if self.tablebases is None:
+            return None
+        entry: tuple[int, int] = self.tablebases.probe(self.board)
+        if entry is None:
+            return None
+        outcome, plies = entry
+        if outcome == Outcome.WIN.value:
+            return MATE_SCORE - ply - plies
+        if outcome == Outcome.LOSS.value:
+            return -MATE_SCORE + ply + plies
+        return 0
+
+    def get_hash_move(self, moves: list[tuple]) -> tuple:
+        """
+        Get the stored best move of the position.
+
+        Parameters:
+            moves (list[tuple]): Legal moves of the position, the first is used if there is no stored move
+
+        Returns:
+            tuple: Stored best move if it is one of the moves, otherwise the first move
+        """
+        if self.table is not None:
+            entry: tuple[int, int, int, int] = self.table.probe(self.board.hash)
+            if entry is not None and entry[3]:
+                move: tuple = decode_move(entry[3])
+                if move in moves:
+                    return move
+        return moves[0]
@@ -0,0 +1,218 @@
+# Modules
+import argparse, os, random, textwrap, time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+# Files
+from board import Board
+from book import Book
+from constants import Colours
+from notation import GAME_RESULTS, encode_game, get_result, get_san
+from player import Bot, RandBot, SmartBot
+from stats import STATS, enable_stats
+from transposition import TranspositionTable
+
+# Bots that can play, keyed by name
+BOTS: dict[str, type] = {
+    "rand": RandBot,
+    "smart": SmartBot
+}
+
+# Opening book opened by each worker process, keyed by path, sharing the mapped file between processes
+worker_books: dict[str, Book] = {}
+
+# Games queued for each worker process, so finished games are written as others are played
+GAMES_IN_FLIGHT: int = 4
+
+# Functions
+def create_bot(name: str, colour: int, board: Board, options: dict, book: Book = None,
+               table: TranspositionTable = None) -> Bot:
+    """
+    Create a bot playing on a board.
+
+    Parameters:
+        name (str): Name of the bot in BOTS
+        colour (int): Enum value of the bot's colour
+        board (Board): Board the bot plays on
+        options (dict): Search limits passed to bots that search
+        book (Book): Opening book, none is used if not given
+        table (TranspositionTable): Transposition table of bots that search, a new one is allocated if not given
+
+    Returns:
+        Bot: The bot
+    """
+    if BOTS[name] is SmartBot:
+        return SmartBot(colour, board, **options, book=book, table=table)
+    return BOTS[name](colour, board, book)
+
+def play_game(index: int, white: str, black: str, options: dict, max_plies: int, output_format: str,
+              seed: int, book_path: str = None, stats_dir: str = None) -> tuple[bytes, int, str]:
+    """
+    Play a game between two bots from the starting position, in a worker process.
+
+    Parameters:
+        index (int): Number of the game, from 0
+        white (str): Name of the white bot
+        black (str): Name of the black bot
+        options (dict): Search limits passed to bots that search
+        max_plies (int): Plies after which the game is stopped unfinished
+        output_format (str): "pgn" or "binary"
+        seed (int): Seed of the random moves, offset by the game number
+        book_path (str): Path of the opening book, none is used if not given
+        stats_dir (str): Directory to write the game's statistics to as game-<index>.json, none are recorded if not given
+
+    Returns:
+        tuple[bytes, int, str]: Game record in the output format, number of plies and result
+    """
+    random.seed(seed + index)
+    if stats_dir is not None:
+        enable_stats()
+        STATS.reset()
+    book: Book = None
+    if book_path is not None:
+        if book_path not in worker_books:
+            worker_books[book_path] = Book(book_path)
+        book = worker_books[book_path]
+
+    board: Board = Board()
+    bots: tuple[Bot, Bot] = (
+        create_bot(white, Colours.WHITE.value, board, options, book),
+        create_bot(black, Colours.BLACK.value, board, options, book)
+    )
+
+    moves: list[tuple] = []
+    names: list[str] = []
+    result: str = GAME_RESULTS[0]
+    while len(moves) < max_plies:
+        # Checkmate, stalemate or a draw by rule
+        termination: int = board.get_termination()
+        if termination is not None:
+            result = get_result(board, termination)
+            break
+
+        move: tuple = bots[board.turn].move()
+        if output_format == "pgn":
+            names.append(get_san(board, move))
+        moves.append(move)
+        board.make_move(*move)
+
+    if output_format == "pgn":
+        record: bytes = format_pgn(index, white, black, names, result).encode()
+    else:
+        record: bytes = encode_game(result, moves)
+    if stats_dir is not None:
+        STATS.dump(os.path.join(stats_dir, f"game-{index}.json"))
+    return record, len(moves), result
+
+def format_pgn(index: int, white: str, black: str, names: list[str], result: str) -> str:
+    """
+    Format a game in Portable Game Notation.
+
+    Parameters:
+        index (int): Number of the game, from 0
+        white (str): Name of the white bot
+        black (str): Name of the black bot
+        names (list[str]): Standard algebraic names of the moves
+        result (str): Result of the game
+
+    Returns:
+        str: The game's tags and moves
+    """
+    tags: dict[str, str] = {
+        "Event": "Self-play",
+        "Site": "?",
+        "Date": time.strftime("%Y.%m.%d"),
+        "Round": str(index + 1),
+        "White": white,
+        "Black": black,
+        "Result": result
+    }
+    moveText: list[str] = []
+    for ply, name in enumerate(names):
+        if ply % 2 == 0:
+            moveText.append(f"{ply // 2 + 1}.")
+        moveText.append(name)
+    moveText.append(result)
+
+    header: str = "".join(f'[{tag} "{value}"]\n' for tag, value in tags.items())
+    return f"{header}\n{textwrap.fill(' '.join(moveText), 80)}\n\n"
+
+def run(games: int, white: str, black: str, options: dict, output: str, output_format: str = "pgn",
+        max_plies: int = 500, workers: int = None, seed: int = 0, book_path: str = None,
+        stats_dir: str = None) -> dict[str, int]:
+    """
+    Play games across worker processes, writing each to the output file as it finishes.
+
+    Parameters:
+        games (int): Number of games to play
+        white (str): Name of the white bot
+        black (str): Name of the black bot
+        options (dict): Search limits passed to bots that search
+        output (str): Path of the output file
+        output_format (str): "pgn" or "binary"
+        max_plies (int): Plies after which a game is stopped unfinished
+        workers (int): Number of worker processes, the number of processors if not given
+        seed (int): Seed of the random moves
+        book_path (str): Path of the opening book, none is used if not given
+        stats_dir (str): Directory to write each game's statistics to, none are recorded if not given
+
+    Returns:
+        dict[str, int]: Number of games with each result
+    """
+    workers = workers or os.cpu_count()
+    if stats_dir is not None:
+        os.makedirs(stats_dir, exist_ok=True)
+    results: dict[str, int] = {result: 0 for result in GAME_RESULTS}
+    totalPlies: int = 0
+    start: float = time.perf_counter()
+
+    with open(output, "wb") as file, ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: set[Future] = set()
+        submitted: int = 0
+        while submitted < games or pending:
+            # Only queue a few games ahead, so memory does not grow with the number of games
+            while submitted < games and len(pending) < workers * GAMES_IN_FLIGHT:
+                pending.add(executor.submit(
+                    play_game, submitted, white, black, options, max_plies, output_format, seed, book_path, stats_dir
+                ))
+                submitted += 1
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record, plies, result = future.result()
+                file.write(record)
+                totalPlies += plies
+                results[result] += 1
+            file.flush()
+
+    elapsed: float = time.perf_counter() - start
+    print(f"Games: {games}")
+    print(f"Time: {elapsed:.2f}s")
+    print(f"Games/second: {games / elapsed if elapsed else 0:.2f}")
+    print(f"Average plies: {totalPlies / games if games else 0:.1f}")
+    print("Results: " + ", ".join(f"{result} {count}" for result, count in results.items()))
+    return results
+
+def main() -> None:
+    """ Run self-play from the command line. """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Play games between bots without a display.")
+    parser.add_argument("games", type=int, help="number of games to play")
+    parser.add_argument("output", help="path of the output file")
+    parser.add_argument("--white", choices=BOTS, default="rand", help="bot playing white")
+    parser.add_argument("--black", choices=BOTS, default="rand", help="bot playing black")
+    parser.add_argument("--format", choices=("pgn", "binary"), default="pgn", help="format of the output file")
+    parser.add_argument("--workers", type=int, help="number of worker processes, the number of processors if not given")
+    parser.add_argument("--max-plies", type=int, default=500, help="plies after which a game is stopped unfinished")
+    parser.add_argument("--time", type=float, default=0.1, help="seconds a searching bot has for each move")
+    parser.add_argument("--nodes", type=int, help="nodes a searching bot can search for each move")
+    parser.add_argument("--depth", type=int, help="plies a searching bot can search to for each move")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random moves")
+    parser.add_argument("--book", help="path of an opening book for the bots to play from")
+    parser.add_argument("--stats", help="directory to write each game's instrumentation statistics to as JSON")
+    args: argparse.Namespace = parser.parse_args()
+
+    options: dict = {"max_time": args.time, "max_nodes": args.nodes, "max_depth": args.depth}
+    run(args.games, args.white, args.black, options, args.output, args.format, args.max_plies, args.workers, args.seed,
+        args.book, args.stats)
+
+if __name__ == "__main__":
+    main()
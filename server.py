@@ -0,0 +1,421 @@
+# Modules
+import argparse, asyncio, itertools, json, multiprocessing, sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Files
+from bitboard import decode_move, encode_move
+from board import Board
+from constants import Colours, Termination
+from notation import (
+    COLOUR_LETTERS, GAME_RESULTS, decode_position, encode_position, get_fen, get_move_name, get_result, get_san, parse_move
+)
+from player import Bot, Player
+from selfplay import BOTS, create_bot
+from transposition import TranspositionTable
+
+# Exceptions
+from exceptions import InvalidNotationException
+
+# Name of a seat played by a connected client rather than a bot
+HUMAN: str = "human"
+
+# Search limits of the bots that search
+BOT_OPTIONS: dict = {"max_time": 0.5, "hash_mb": 4}
+
+# Transposition tables of each worker process, keyed by megabytes, kept between moves so later searches reuse their entries
+worker_tables: dict[float, TranspositionTable] = {}
+
+# Functions
+def bot_move_task(position: bytes, moves: list[int], name: str, options: dict) -> int:
+    """
+    Choose a bot's move, in a worker process.
+
+    Parameters:
+        position (bytes): Position encoded by encode_position, at the game's last capture or pawn move
+        moves (list[int]): Moves made since the position, encoded by encode_move, replayed so repetitions are seen
+        name (str): Name of the bot in BOTS
+        options (dict): Search limits passed to bots that search
+
+    Returns:
+        int: Move encoded by encode_move, or 0 if there is no move
+    """
+    hashMb: float = options.get("hash_mb", BOT_OPTIONS["hash_mb"])
+    if hashMb not in worker_tables:
+        worker_tables[hashMb] = TranspositionTable(hashMb)
+
+    board: Board = decode_position(position)
+    for code in moves:
+        board.make_move(*decode_move(code))
+    bot: Bot = create_bot(name, board.turn, board, options, table=worker_tables[hashMb])
+    move: tuple = bot.move()
+    return 0 if move is None else encode_move(move)
+
+async def send(writer: asyncio.StreamWriter, message: dict) -> None:
+    """
+    Send a message to a client, as a line of JSON, waiting while the client is behind on reading.
+
+    Parameters:
+        writer (asyncio.StreamWriter): Stream to the client
+        message (dict): Message to send
+
+    Raises:
+        ConnectionError: If the client has disconnected
+    """
+    if not writer.is_closing():
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+def get_field(message: dict, name: str):
+    """
+    Get a field of a client's message.
+
+    Parameters:
+        message (dict): Message from the client
+        name (str): Name of the field
+
+    Returns:
+        Value of the field
+
+    Raises:
+        ValueError: If the message does not have the field
+    """
+    if not isinstance(message, dict) or name not in message:
+        raise ValueError(f"The message is missing the field {name!r}.")
+    return message[name]
+
+class Game(object):
+    """ A game hosted by the server, with its own board and two players. """
+
+    def __init__(self, game_id: int, seats: tuple[str, str]) -> None:
+        """
+        Initialise the game from the starting position.
+
+        Parameters:
+            game_id (int): Number identifying the game
+            seats (tuple[str, str]): HUMAN or the name of a bot in BOTS, for each colour
+        """
+        self.id: int = game_id
+        self.seats: tuple[str, str] = seats
+        self.board: Board = Board()
+        self.players: tuple[Player, Player] = tuple(Player(colour.value, self.board) for colour in Colours)
+
+        # Position at the last capture or pawn move and the encoded moves since, sent to the bots so they see repetitions
+        self.root: bytes = encode_position(self.board)
+        self.moves: list[int] = []
+        self.clients: list[asyncio.StreamWriter] = [None, None] # Client playing each human seat
+        self.watchers: set[asyncio.StreamWriter] = set()
+        self.result: str = GAME_RESULTS[0]
+        self.termination: int = None # Enum value of the way the game ended
+        self.finished: bool = False
+        self.thinking: bool = False # Whether a bot's move is being chosen
+
+    def get_state(self, move: str = None, san: str = None) -> dict:
+        """
+        Get the message describing the game.
+
+        Parameters:
+            move (str): Long algebraic name of the last move, if one was just made
+            san (str): Standard algebraic name of the last move, if one was just made
+
+        Returns:
+            dict: Update message
+        """
+        return {
+            "type": "update", "game": self.id, "fen": get_fen(self.board), "turn": COLOUR_LETTERS[self.board.turn],
+            "move": move, "san": san, "result": self.result if self.finished else None,
+            "termination": Termination(self.termination).name.lower() if self.finished else None
+        }
+
+    async def broadcast(self, message: dict) -> None:
+        """
+        Send a message to the game's players and watchers, at the same time so one slow client does not delay the others.
+        Clients that have disconnected are skipped, and removed once their connection closes.
+
+        Parameters:
+            message (dict): Message to send
+        """
+        await asyncio.gather(*(send(writer, message) for writer in list(self.watchers)), return_exceptions=True)
+
+    async def make_move(self, move: tuple) -> None:
+        """
+        Make a legal move, then tell everyone in the game.
+
+        Parameters:
+            move (tuple): Starting coordinate, ending coordinate and, for promotions, the piece type
+        """
+        san: str = get_san(self.board, move)
+        self.board.make_move(*move)
+        if self.board.halfmove_clock == 0:
+            # No earlier position can occur again
+            self.root = encode_position(self.board)
+            self.moves = []
+        else:
+            self.moves.append(encode_move(move))
+        self.check_finished()
+        await self.broadcast(self.get_state(get_move_name(move), san))
+
+    def check_finished(self) -> None:
+        """ End the game by checkmate, stalemate or a draw by rule. """
+        self.termination = self.board.get_termination()
+        self.finished = self.termination is not None
+        self.result = get_result(self.board, self.termination)
+
+    def is_bot_turn(self) -> bool:
+        """
+        Checks whether a bot is to move.
+
+        Returns:
+            bool: True if the game is not over and the side to move is a bot, else false
+        """
+        return not self.finished and self.seats[self.board.turn] != HUMAN
+
+class GameServer(object):
+    """ Hosts many games over TCP, with the bots' moves chosen in a pool of worker processes. """
+
+    def __init__(self, workers: int = None, bot_options: dict = None) -> None:
+        """
+        Initialise the server.
+
+        Parameters:
+            workers (int): Number of worker processes for the bots, the number of processors if not given
+            bot_options (dict): Search limits passed to bots that search, BOT_OPTIONS if not given
+        """
+        self.games: dict[int, Game] = {}
+        self.ids: itertools.count = itertools.count(1)
+        # Workers are spawned rather than forked, so they do not hold copies of clients' sockets open
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.bot_options: dict = BOT_OPTIONS if bot_options is None else bot_options
+
+    async def serve(self, host: str, port: int) -> None:
+        """
+        Accept clients until cancelled.
+
+        Parameters:
+            host (str): Address to listen on
+            port (int): Port to listen on
+        """
+        server: asyncio.base_events.Server = await asyncio.start_server(self.handle_client, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Read a client's messages, one JSON object per line, until it disconnects.
+
+        Parameters:
+            reader (asyncio.StreamReader): Stream from the client
+            writer (asyncio.StreamWriter): Stream to the client
+        """
+        games: set[Game] = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    message: dict = json.loads(line)
+                    await self.handle_message(message, writer, games)
+                except (ValueError, TypeError, InvalidNotationException) as error:
+                    await send(writer, {"type": "error", "message": getattr(error, "message", str(error))})
+        except ConnectionError:
+            pass
+        finally:
+            # Free the client's seats
+            for game in games:
+                game.watchers.discard(writer)
+                game.clients = [None if client is writer else client for client in game.clients]
+                if not game.watchers and not game.thinking:
+                    self.games.pop(game.id, None)
+            writer.close()
+
+    async def handle_message(self, message: dict, writer: asyncio.StreamWriter, games: set[Game]) -> None:
+        """
+        Act on a client's message.
+
+        Parameters:
+            message (dict): Message with a type of new, join, watch or move
+            writer (asyncio.StreamWriter): Stream to the client
+            games (set[Game]): Games the client is in, updated with games joined
+
+        Raises:
+            ValueError: If the message is missing a field, names a game that does not exist or is not valid
+        """
+        kind: str = get_field(message, "type")
+        if kind == "new":
+            seats: tuple[str, str] = (message.get("white", HUMAN), message.get("black", HUMAN))
+            if any(seat != HUMAN and seat not in BOTS for seat in seats):
+                raise ValueError(f"Players must be {HUMAN} or one of {', '.join(BOTS)}.")
+            game: Game = Game(next(self.ids), seats)
+            self.games[game.id] = game
+            await self.join(game, writer, games, message.get("colour"))
+        elif kind in ("join", "watch"):
+            game: Game = self.get_game(message)
+            await self.join(game, writer, games, message.get("colour") if kind == "join" else None, kind == "watch")
+        elif kind == "move":
+            game: Game = self.get_game(message)
+            name: str = get_field(message, "move")
+            move: tuple = parse_move(name)
+            colour: int = game.board.turn
+            if game.finished or game.clients[colour] is not writer:
+                raise ValueError("It is not your move.")
+            if move not in game.players[colour].pieces.get_legal_moves():
+                raise ValueError(f"The move {name} is not legal.")
+            await game.make_move(move)
+        else:
+            raise ValueError(f"Unknown message type {kind!r}.")
+
+        self.schedule_bot(game)
+
+    def get_game(self, message: dict) -> Game:
+        """
+        Get the game named by a client's message.
+
+        Parameters:
+            message (dict): Message with the id of a game
+
+        Returns:
+            Game: The game
+
+        Raises:
+            ValueError: If the message does not name a game, or the game does not exist
+        """
+        gameId: int = get_field(message, "game")
+        game: Game = self.games.get(gameId) if isinstance(gameId, int) else None
+        if game is None:
+            raise ValueError(f"Unknown game {gameId}.")
+        return game
+
+    async def join(self, game: Game, writer: asyncio.StreamWriter, games: set[Game], colour: str = None,
+             watch: bool = False) -> None:
+        """
+        Add a client to a game, taking a free human seat unless watching, then send it the game.
+
+        Parameters:
+            game (Game): Game to join
+            writer (asyncio.StreamWriter): Stream to the client
+            games (set[Game]): Games the client is in, updated with the game
+            colour (str): Letter of the colour to play, any free seat if not given
+            watch (bool): Only watch the game
+
+        Raises:
+            ValueError: If there is no free seat of the colour
+        """
+        seat: int = None
+        if not watch:
+            free: list[int] = [
+                index for index, name in enumerate(game.seats)
+                if name == HUMAN and game.clients[index] is None and (colour is None or COLOUR_LETTERS[index] == colour)
+            ]
+            if not free and (colour is not None or HUMAN in game.seats):
+                raise ValueError("There is no free seat.")
+            if free:
+                seat = free[0]
+                game.clients[seat] = writer
+
+        game.watchers.add(writer)
+        games.add(game)
+        await send(writer, {"type": "joined", "game": game.id, "colour": None if seat is None else COLOUR_LETTERS[seat]})
+        await send(writer, game.get_state())
+
+    def schedule_bot(self, game: Game) -> None:
+        """
+        Start choosing a bot's move if one is to move, without waiting for it.
+
+        Parameters:
+            game (Game): Game that may have a bot to move
+        """
+        if game.is_bot_turn() and not game.thinking:
+            game.thinking = True
+            asyncio.get_running_loop().create_task(self.play_bot(game))
+
+    async def play_bot(self, game: Game) -> None:
+        """
+        Choose and make a bot's move in a worker process, then continue with the next bot's move if there is one.
+
+        Parameters:
+            game (Game): Game with a bot to move
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        try:
+            while game.is_bot_turn() and game.watchers:
+                code: int = await loop.run_in_executor(
+                    self.executor, bot_move_task, game.root, game.moves, game.seats[game.board.turn], self.bot_options
+                )
+                if not code:
+                    break
+                await game.make_move(decode_move(code))
+        finally:
+            game.thinking = False
+            if not game.watchers:
+                self.games.pop(game.id, None)
+
+async def run_client(host: str, port: int, white: str, black: str) -> None:
+    """
+    Play a game from the terminal, entering moves in long algebraic notation.
+
+    Parameters:
+        host (str): Address of the server
+        port (int): Port of the server
+        white (str): HUMAN or the name of the bot playing white
+        black (str): HUMAN or the name of the bot playing black
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    await send(writer, {"type": "new", "white": white, "black": black})
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    gameId: int = None
+
+    async def read_moves() -> None:
+        while True:
+            line: str = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            if line.strip():
+                await send(writer, {"type": "move", "game": gameId, "move": line.strip()})
+
+    inputTask: asyncio.Task = None
+    while line := await reader.readline():
+        message: dict = json.loads(line)
+        if message["type"] == "joined":
+            gameId = message["game"]
+            print(f"Game {gameId}, playing {message['colour'] or 'nothing'}")
+            if message["colour"] is not None:
+                inputTask = loop.create_task(read_moves())
+        elif message["type"] == "update":
+            if message["san"]:
+                print(f"Move: {message['san']}")
+            print(f"Position: {message['fen']}")
+            if message["result"]:
+                print(f"Result: {message['result']}")
+                break
+        else:
+            print(f"Error: {message['message']}")
+
+    if inputTask is not None:
+        inputTask.cancel()
+    writer.close()
+
+def main() -> None:
+    """ Run the server or a client from the command line. """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Host games over TCP.")
+    parser.add_argument("mode", choices=("serve", "play"), help="run the server, or play a game on it")
+    parser.add_argument("--host", default="127.0.0.1", help="address of the server")
+    parser.add_argument("--port", type=int, default=8765, help="port of the server")
+    parser.add_argument("--workers", type=int, help="number of bot worker processes, the number of processors if not given")
+    parser.add_argument("--time", type=float, default=BOT_OPTIONS["max_time"], help="seconds a searching bot has for each move")
+    parser.add_argument("--white", choices=(HUMAN, *BOTS), default=HUMAN, help="player of white when playing")
+    parser.add_argument("--black", choices=(HUMAN, *BOTS), default="rand", help="player of black when playing")
+    args: argparse.Namespace = parser.parse_args()
+
+    try:
+        if args.mode == "serve":
+            server: GameServer = GameServer(args.workers, {**BOT_OPTIONS, "max_time": args.time})
+            asyncio.run(server.serve(args.host, args.port))
+        else:
+            asyncio.run(run_client(args.host, args.port, args.white, args.black))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
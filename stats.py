@@ -0,0 +1,185 @@
+# Modules
+import functools, json, time
+
+# Files
+from board import Board
+from pieces import King, Knight, Pawn, Piece
+from search import Search
+from tablebase import Tablebases
+
+# Methods timed while enabled, as the class defining them and the method's name.
+# They are wrapped only while enabled, so there is no cost when disabled
+TIMED_METHODS: list[tuple[type, str]] = [
+    (Piece, "get_possible_moves"),
+    (Pawn, "get_possible_moves"),
+    (Knight, "get_possible_moves"),
+    (King, "get_possible_moves"),
+    (King, "is_coord_checked"),
+    (Board, "get_piece_in_direction"),
+    (Tablebases, "probe")
+]
+
+# Methods whose result is None on a miss, so their hits are counted
+CACHE_METHODS: set[str] = {"Tablebases.probe"}
+
+class Stats(object):
+    """ Calls and time spent in instrumented methods, and totals of the searches run. """
+
+    def __init__(self) -> None:
+        """ Initialise the statistics with nothing recorded. """
+        self.reset()
+
+    def reset(self) -> None:
+        """ Remove everything recorded. """
+        self.calls: dict[str, int] = {}
+        self.seconds: dict[str, float] = {}
+        self.hits: dict[str, int] = {}
+        self.searches: int = 0
+        self.search_seconds: float = 0
+        self.nodes: int = 0
+        self.cutoffs: int = 0
+        self.table_probes: int = 0
+        self.table_hits: int = 0
+
+    def add_call(self, name: str, seconds: float, hit: bool = False) -> None:
+        """
+        Record a call of an instrumented method.
+
+        Parameters:
+            name (str): Qualified name of the method
+            seconds (float): Time spent in the call, including the methods it called
+            hit (bool): Whether the call found what it looked up
+        """
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.seconds[name] = self.seconds.get(name, 0) + seconds
+        if hit:
+            self.hits[name] = self.hits.get(name, 0) + 1
+
+    def add_search(self, search: Search, seconds: float, table_probes: int, table_hits: int) -> None:
+        """
+        Record a completed search.
+
+        Parameters:
+            search (Search): The search
+            seconds (float): Time spent searching
+            table_probes (int): Transposition table probes made by the search
+            table_hits (int): Transposition table probes that found an entry
+        """
+        self.searches += 1
+        self.search_seconds += seconds
+        self.nodes += search.nodes
+        self.cutoffs += search.cutoffs
+        self.table_probes += table_probes
+        self.table_hits += table_hits
+
+    def to_dict(self) -> dict:
+        """
+        Get everything recorded, with rates worked out.
+
+        Returns:
+            dict: Calls, seconds and, for lookups, hit rate of each method, and the search totals
+        """
+        methods: dict[str, dict] = {}
+        for name, calls in sorted(self.calls.items(), key=lambda item: -self.seconds[item[0]]):
+            methods[name] = {"calls": calls, "seconds": self.seconds[name]}
+            if name in CACHE_METHODS:
+                methods[name]["hit_rate"] = self.hits.get(name, 0) / calls
+        return {
+            "methods": methods,
+            "search": {
+                "searches": self.searches,
+                "seconds": self.search_seconds,
+                "nodes": self.nodes,
+                "nps": self.nodes / self.search_seconds if self.search_seconds else 0.0,
+                "cutoffs": self.cutoffs,
+                "table_probes": self.table_probes,
+                "table_hit_rate": self.table_hits / self.table_probes if self.table_probes else 0.0
+            }
+        }
+
+    def dump(self, path: str) -> None:
+        """
+        Write everything recorded to a JSON file.
+
+        Parameters:
+            path (str): Path of the file
+        """
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+# Statistics recorded while enabled
+STATS: Stats = Stats()
+
+# Original methods, keyed by class and name, while enabled
+originals: dict[tuple[type, str], callable] = {}
+
+# Functions
+def time_method(name: str, method: callable) -> callable:
+    """
+    Wrap a method to record its calls and the time spent in them.
+
+    Parameters:
+        name (str): Qualified name of the method
+        method (callable): Method to wrap
+
+    Returns:
+        callable: Wrapped method
+    """
+    lookup: bool = name in CACHE_METHODS
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        start: float = time.perf_counter()
+        result = method(*args, **kwargs)
+        STATS.add_call(name, time.perf_counter() - start, lookup and result is not None)
+        return result
+    return timed
+
+def record_search(method: callable) -> callable:
+    """
+    Wrap Search.search to record its totals and the transposition table probes it made.
+
+    Parameters:
+        method (callable): Search.search
+
+    Returns:
+        callable: Wrapped method
+    """
+    @functools.wraps(method)
+    def recorded(search: Search) -> tuple:
+        table = search.table
+        probes, hits = (table.probes, table.hits) if table is not None else (0, 0)
+        start: float = time.perf_counter()
+        result: tuple = method(search)
+        seconds: float = time.perf_counter() - start
+        if table is not None:
+            probes, hits = table.probes - probes, table.hits - hits
+        STATS.add_search(search, seconds, probes, hits)
+        return result
+    return recorded
+
+def stats_enabled() -> bool:
+    """
+    Checks whether the instrumentation is enabled.
+
+    Returns:
+        bool: True if the methods are wrapped, else false
+    """
+    return bool(originals)
+
+def enable_stats() -> None:
+    """ Wrap the instrumented methods, so their calls are recorded in STATS. """
+    if stats_enabled():
+        return
+    for owner, name in TIMED_METHODS:
+        method: callable = owner.__dict__[name]
+        originals[owner, name] = method
+        setattr(owner, name, time_method(f"{owner.__name__}.{name}", method))
+    originals[Search, "search"] = Search.search
+    Search.search = record_search(Search.search)
+
+def disable_stats() -> None:
+    """ Restore the instrumented methods, leaving what was recorded in STATS. """
+    for (owner, name), method in originals.items():
+        setattr(owner, name, method)
+    originals.clear()
@@ -0,0 +1,379 @@
+# Modules
+import argparse, mmap, os, time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+
+# Files
+from bitboard import get_coord
+from board import Board
+from constants import BOARD_HEIGHT, BOARD_WIDTH, Colours, PieceTypes
+from notation import setup_board
+from pieces import Piece
+from tables import KING_ATTACK_MASKS, NUM_SQUARES
+
+# Outcomes for the side to move
+class Outcome(Enum):
+    DRAW: int = 0
+    WIN: int = 1
+    LOSS: int = 2
+    ILLEGAL: int = 3 # Index does not hold a legal position
+
+# Endgames of two kings and one other piece, keyed by name, generated in this order
+ENDGAMES: dict[str, int] = {
+    "KQK": PieceTypes.QUEEN.value,
+    "KRK": PieceTypes.ROOK.value,
+    "KPK": PieceTypes.PAWN.value
+}
+
+# Each entry is a byte: the outcome in the top two bits and the moves to mate, up to 63, in the rest
+OUTCOME_SHIFT: int = 6
+DISTANCE_MASK: int = (1 << OUTCOME_SHIFT) - 1
+
+# Positions are mirrored so the pivot, the pawn or else the stronger king, is on the left half of the board.
+# The index is the pivot's square on the left half, whether the weaker side is to move, then the other two squares
+HALF_WIDTH: int = BOARD_WIDTH // 2
+PIVOT_SQUARES: int = HALF_WIDTH * BOARD_HEIGHT
+PIVOT_ENTRIES: int = 2 * NUM_SQUARES * NUM_SQUARES
+TABLE_SIZE: int = PIVOT_SQUARES * PIVOT_ENTRIES
+
+# Square index bits flipped to mirror a square's column or row
+MIRROR_COLUMN: int = BOARD_WIDTH - 1
+MIRROR_ROW: int = (BOARD_HEIGHT - 1) * BOARD_WIDTH
+
+# File extension of the tables
+EXTENSION: str = ".tb"
+
+# Functions
+def get_index(piece_type: int, turn: int, strong_king: int, weak_king: int, piece: int) -> int:
+    """
+    Get the index of a position, with the stronger side as white.
+
+    Parameters:
+        piece_type (int): Enum value of the stronger side's other piece type
+        turn (int): 0 if the stronger side is to move, otherwise 1
+        strong_king (int): Square of the stronger side's king
+        weak_king (int): Square of the weaker side's king
+        piece (int): Square of the stronger side's other piece
+
+    Returns:
+        int: Index of the position in the table
+    """
+    isPawn: bool = piece_type == PieceTypes.PAWN.value
+    pivot: int = piece if isPawn else strong_king
+    if pivot % BOARD_WIDTH >= HALF_WIDTH:
+        strong_king ^= MIRROR_COLUMN
+        weak_king ^= MIRROR_COLUMN
+        piece ^= MIRROR_COLUMN
+        pivot ^= MIRROR_COLUMN
+
+    first, second = (strong_king, weak_king) if isPawn else (weak_king, piece)
+    pivotIndex: int = pivot // BOARD_WIDTH * HALF_WIDTH + pivot % BOARD_WIDTH
+    return ((pivotIndex * 2 + turn) * NUM_SQUARES + first) * NUM_SQUARES + second
+
+def get_position(piece_type: int, index: int) -> tuple[int, int, int, int]:
+    """
+    Get the position of an index.
+
+    Parameters:
+        piece_type (int): Enum value of the stronger side's other piece type
+        index (int): Index of the position in the table
+
+    Returns:
+        tuple[int, int, int, int]: Whether the weaker side is to move, and the squares of the stronger king,
+            weaker king and other piece
+    """
+    rest, second = divmod(index, NUM_SQUARES)
+    rest, first = divmod(rest, NUM_SQUARES)
+    pivotIndex, turn = divmod(rest, 2)
+    pivot: int = pivotIndex // HALF_WIDTH * BOARD_WIDTH + pivotIndex % HALF_WIDTH
+    if piece_type == PieceTypes.PAWN.value:
+        return turn, first, second, pivot
+    return turn, pivot, first, second
+
+def get_entry(outcome: int, plies: int) -> int:
+    """
+    Pack an outcome into an entry.
+
+    Parameters:
+        outcome (int): Enum value of the outcome for the side to move
+        plies (int): Plies to mate
+
+    Returns:
+        int: Entry byte
+    """
+    return outcome << OUTCOME_SHIFT | min((plies + 1) // 2, DISTANCE_MASK)
+
+def read_entry(entry: int) -> tuple[int, int]:
+    """
+    Unpack an entry.
+
+    Parameters:
+        entry (int): Entry byte
+
+    Returns:
+        tuple[int, int]: Enum value of the outcome for the side to move and plies to mate
+    """
+    outcome: int = entry >> OUTCOME_SHIFT
+    moves: int = entry & DISTANCE_MASK
+    if outcome == Outcome.WIN.value:
+        return outcome, 2 * moves - 1
+    if outcome == Outcome.LOSS.value:
+        return outcome, 2 * moves
+    return outcome, 0
+
+def get_successors(name: str, pivot_index: int, directory: str) -> list[tuple[int, bool, list[int]]]:
+    """
+    Find the positions reached by each legal move of the positions of a pivot square, in a worker process.
+
+    Parameters:
+        name (str): Name of the endgame in ENDGAMES
+        pivot_index (int): Index of the pivot's square on the left half of the board
+        directory (str): Directory of the tables already generated, read for pawn promotions
+
+    Returns:
+        list[tuple[int, bool, list[int]]]: Index of each legal position, whether the side to move is in check,
+            and the index of each position reached. Positions in other tables are the entry plus one, negated
+    """
+    pieceType: int = ENDGAMES[name]
+    tablebases: Tablebases = Tablebases(directory) if pieceType == PieceTypes.PAWN.value else None
+    strong: int = Colours.WHITE.value
+    weak: int = Colours.BLACK.value
+
+    # Pieces are moved around one board rather than setting up a board for each position
+    board: Board = setup_board(
+        [(0, BOARD_HEIGHT - 1, strong, PieceTypes.KING.value), (BOARD_WIDTH - 1, 0, weak, PieceTypes.KING.value),
+         (1, 1, strong, pieceType)], strong, 0, None, 0, 1, name
+    )
+    strongKing: Piece = board.pieces[strong].king
+    weakKing: Piece = board.pieces[weak].king
+    piece: Piece = board.pieces[strong].get_type_list(pieceType)[0]
+    placed: tuple[Piece, Piece, Piece] = (strongKing, weakKing, piece)
+
+    positions: list[tuple[int, bool, list[int]]] = []
+    start: int = pivot_index * PIVOT_ENTRIES
+    for index in range(start, start + PIVOT_ENTRIES):
+        turn, strongSquare, weakSquare, pieceSquare = get_position(pieceType, index)
+        if len({strongSquare, weakSquare, pieceSquare}) < 3 or KING_ATTACK_MASKS[strongSquare] & 1 << weakSquare:
+            continue
+        if pieceType == PieceTypes.PAWN.value and pieceSquare // BOARD_WIDTH in (0, BOARD_HEIGHT - 1):
+            continue
+
+        for placedPiece in placed:
+            board.remove_piece(placedPiece)
+        for placedPiece, square in zip(placed, (strongSquare, weakSquare, pieceSquare)):
+            placedPiece.x, placedPiece.y = get_coord(square)
+            board.add_piece(placedPiece)
+        piece.moved = piece.y != BOARD_HEIGHT - 2
+        board.turn = strong if turn == 0 else weak
+        board.refresh_attacks()
+
+        # The side not to move cannot be in check
+        if board.pieces[1 - board.turn].king.in_check():
+            continue
+
+        children: set[int] = set()
+        for move in board.pieces[board.turn].get_legal_moves():
+            end: int = move[1][1] * BOARD_WIDTH + move[1][0]
+            if end == pieceSquare:
+                # The weaker king captured the piece
+                children.add(-1 - get_entry(Outcome.DRAW.value, 0))
+            elif len(move) > 2:
+                # Promotions to a queen or rook continue in their table, others cannot mate
+                promoted: str = {PieceTypes.QUEEN.value: "KQK", PieceTypes.ROOK.value: "KRK"}.get(move[2])
+                entry: int = get_entry(Outcome.DRAW.value, 0)
+                if promoted is not None:
+                    entry = tablebases.read(promoted, get_index(ENDGAMES[promoted], 1, strongSquare, weakSquare, end))
+                children.add(-1 - entry)
+            elif turn == 0 and move[0] == strongKing.get_coord():
+                children.add(get_index(pieceType, 1, end, weakSquare, pieceSquare))
+            elif turn == 0:
+                children.add(get_index(pieceType, 1, strongSquare, weakSquare, end))
+            else:
+                children.add(get_index(pieceType, 0, strongSquare, end, pieceSquare))
+        positions.append((index, board.pieces[board.turn].king.in_check(), list(children)))
+
+    if tablebases is not None:
+        tablebases.close()
+    return positions
+
+def generate(name: str, directory: str, workers: int = None) -> bytearray:
+    """
+    Generate the table of an endgame by retrograde analysis, working back from the checkmates.
+
+    Parameters:
+        name (str): Name of the endgame in ENDGAMES
+        directory (str): Directory to write the table to, holding the tables already generated
+        workers (int): Number of worker processes finding the moves, the number of processors if not given
+
+    Returns:
+        bytearray: Entry of each index
+    """
+    table: bytearray = bytearray([get_entry(Outcome.ILLEGAL.value, 0)]) * TABLE_SIZE
+    remaining: array = array('i', [0]) * TABLE_SIZE # Moves not yet known to lose, so a position is lost once none remain
+    predecessors: dict[int, array] = {}
+    plies: dict[int, list[int]] = {0: []} # Positions resolved at each ply
+
+    # Moves into other tables resolve at the plies of their entries
+    externalWins: dict[int, list[int]] = {}
+    externalLosses: dict[int, list[int]] = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(get_successors, [name] * PIVOT_SQUARES, range(PIVOT_SQUARES), [directory] * PIVOT_SQUARES)
+        for positions in results:
+            for index, inCheck, children in positions:
+                table[index] = get_entry(Outcome.DRAW.value, 0)
+                remaining[index] = len(children)
+                if not children:
+                    # Checkmate, or stalemate which stays a draw
+                    if inCheck:
+                        table[index] = get_entry(Outcome.LOSS.value, 0)
+                        plies[0].append(index)
+                    continue
+
+                for child in children:
+                    if child >= 0:
+                        predecessors.setdefault(child, array('I')).append(index)
+                        continue
+                    outcome, childPlies = read_entry(-1 - child)
+                    if outcome == Outcome.LOSS.value:
+                        externalWins.setdefault(childPlies + 1, []).append(index)
+                    elif outcome == Outcome.WIN.value:
+                        externalLosses.setdefault(childPlies, []).append(index)
+
+    def resolve(index: int, outcome: int, ply: int) -> None:
+        table[index] = get_entry(outcome, ply)
+        plies.setdefault(ply, []).append(index)
+
+    # Positions are resolved a ply at a time, so wins are found at their shortest and losses at their longest
+    ply: int = 0
+    while ply in plies or any(key >= ply for key in externalWins) or any(key >= ply for key in externalLosses):
+        for index in externalWins.pop(ply, []):
+            if table[index] >> OUTCOME_SHIFT == Outcome.DRAW.value:
+                resolve(index, Outcome.WIN.value, ply)
+
+        for index in plies.get(ply, []):
+            lost: bool = table[index] >> OUTCOME_SHIFT == Outcome.LOSS.value
+            for parent in predecessors.get(index, ()):
+                if table[parent] >> OUTCOME_SHIFT != Outcome.DRAW.value:
+                    continue
+                if lost:
+                    resolve(parent, Outcome.WIN.value, ply + 1)
+                else:
+                    remaining[parent] -= 1
+                    if remaining[parent] == 0:
+                        resolve(parent, Outcome.LOSS.value, ply + 1)
+
+        for index in externalLosses.pop(ply, []):
+            if table[index] >> OUTCOME_SHIFT == Outcome.DRAW.value:
+                remaining[index] -= 1
+                if remaining[index] == 0:
+                    resolve(index, Outcome.LOSS.value, ply + 1)
+        plies.pop(ply, None)
+        ply += 1
+
+    with open(os.path.join(directory, name + EXTENSION), "wb") as file:
+        file.write(table)
+    return table
+
+class Tablebases(object):
+    """ Endgame tables read from memory-mapped files. """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Open the tables in a directory, skipping endgames without a table.
+
+        Parameters:
+            directory (str): Directory of the tables
+        """
+        self.directory: str = directory
+        self.tables: dict[int, mmap.mmap] = {} # Keyed by the stronger side's other piece type
+        for name, pieceType in ENDGAMES.items():
+            path: str = os.path.join(directory, name + EXTENSION)
+            if os.path.exists(path) and os.path.getsize(path) == TABLE_SIZE:
+                with open(path, "rb") as file:
+                    self.tables[pieceType] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """ Close the tables' files. """
+        for table in self.tables.values():
+            table.close()
+        self.tables = {}
+
+    def read(self, name: str, index: int) -> int:
+        """
+        Read an entry of a table.
+
+        Parameters:
+            name (str): Name of the endgame in ENDGAMES
+            index (int): Index of the position
+
+        Returns:
+            int: Entry byte
+        """
+        return self.tables[ENDGAMES[name]][index]
+
+    def probe(self, board: Board) -> tuple[int, int]:
+        """
+        Look up the outcome of a position.
+
+        Parameters:
+            board (Board): Board holding the position
+
+        Returns:
+            tuple[int, int]: Enum value of the outcome for the side to move and plies to mate,
+                or None if the position is not in a table
+        """
+        if board.bitboards.all.bit_count() != 3 or board.castling:
+            return None
+
+        # The stronger side has the piece other than the kings
+        for colour in (Colours.WHITE.value, Colours.BLACK.value):
+            for pieceType, table in self.tables.items():
+                pieceBitboard: int = board.bitboards.pieces[colour][pieceType]
+                if pieceBitboard:
+                    break
+            else:
+                continue
+            break
+        else:
+            return None
+
+        # Tables have the stronger side as white, so black's positions are flipped
+        flip: int = 0 if colour == Colours.WHITE.value else MIRROR_ROW
+        kings: list[int] = [bitboard[PieceTypes.KING.value] for bitboard in board.bitboards.pieces]
+        index: int = get_index(
+            pieceType, 0 if board.turn == colour else 1, (kings[colour].bit_length() - 1) ^ flip,
+            (kings[1 - colour].bit_length() - 1) ^ flip, (pieceBitboard.bit_length() - 1) ^ flip
+        )
+        outcome, plies = read_entry(table[index])
+        return None if outcome == Outcome.ILLEGAL.value else (outcome, plies)
+
+def main() -> None:
+    """ Generate endgame tables from the command line. """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Generate endgame tables.")
+    parser.add_argument("directory", help="directory to write the tables to")
+    parser.add_argument("--endgames", nargs="+", choices=ENDGAMES, default=list(ENDGAMES), help="endgames to generate")
+    parser.add_argument("--workers", type=int, help="number of worker processes, the number of processors if not given")
+    args: argparse.Namespace = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    tablebases: Tablebases = Tablebases(args.directory)
+    available: set[int] = set(tablebases.tables)
+    tablebases.close()
+    for name, pieceType in ENDGAMES.items():
+        # Pawn promotions are read from the queen and rook tables
+        needed: bool = "KPK" in args.endgames and pieceType != PieceTypes.PAWN.value and pieceType not in available
+        if name not in args.endgames and not needed:
+            continue
+        start: float = time.perf_counter()
+        table: bytearray = generate(name, args.directory, args.workers)
+        counts: dict[str, int] = {outcome.name: 0 for outcome in Outcome}
+        longest: int = 0
+        for entry in table:
+            counts[Outcome(entry >> OUTCOME_SHIFT).name] += 1
+            longest = max(longest, entry & DISTANCE_MASK)
+        print(f"{name}: {counts}, longest mate in {longest} moves, {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
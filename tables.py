@@ -0,0 +1,127 @@
+# Files
+from bitboard import get_bit, get_coord
+from constants import BOARD_HEIGHT, BOARD_WIDTH
+
+# Directions
+KNIGHT_DIRECTIONS: tuple[tuple[int, int], ...] = ((-1, -2), (-1, 2), (1, -2), (1, 2), (-2, -1), (-2, 1), (2, -1), (2, 1))
+ROOK_DIRECTIONS: tuple[tuple[int, int], ...] = ((-1, 0), (0, -1), (0, 1), (1, 0))
+BISHOP_DIRECTIONS: tuple[tuple[int, int], ...] = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+QUEEN_DIRECTIONS: tuple[tuple[int, int], ...] = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+KING_DIRECTIONS: tuple[tuple[int, int], ...] = QUEEN_DIRECTIONS
+
+# Forward direction of each colour's pawns, indexed by colour
+PAWN_DIRECTIONS: tuple[int, int] = (-1, 1)
+
+NUM_SQUARES: int = BOARD_WIDTH * BOARD_HEIGHT
+ALL_SQUARES: int = (1 << NUM_SQUARES) - 1 # Bitboard of every square
+LIGHT_SQUARES: int = sum(1 << square for square in range(NUM_SQUARES) if (square % BOARD_WIDTH + square // BOARD_WIDTH) % 2 == 0)
+DARK_SQUARES: int = ALL_SQUARES ^ LIGHT_SQUARES
+
+# Functions
+def is_in_bounds(coord: (int, int)) -> bool:
+    """
+    Checks if the given coordinate is in bounds.
+
+    Parameters:
+        coord ((int, int)): x- y-coordinate to be checked
+
+    Returns:
+        bool: True if coordinate is in bounds, else false
+    """
+    x, y = coord
+    return 0 <= x < BOARD_WIDTH and 0 <= y < BOARD_HEIGHT
+
+def get_targets(directions: tuple[tuple[int, int], ...]) -> list[tuple[tuple[int, int], ...]]:
+    """
+    Build the single step targets of every square.
+
+    Parameters:
+        directions (tuple[tuple[int, int], ...]): x- y-directions of the steps
+
+    Returns:
+        list[tuple[tuple[int, int], ...]]: x- y-coordinates reachable from each square
+    """
+    targets: list[tuple[tuple[int, int], ...]] = []
+    for square in range(NUM_SQUARES):
+        x, y = get_coord(square)
+        targets.append(tuple(
+            (x + dx, y + dy) for dx, dy in directions if is_in_bounds((x + dx, y + dy))
+        ))
+    return targets
+
+def get_rays() -> list[dict[tuple[int, int], tuple[tuple[int, int], ...]]]:
+    """
+    Build the ray of every square in every direction.
+
+    Returns:
+        list[dict[tuple[int, int], tuple[tuple[int, int], ...]]]: For each square, a map of the direction
+            to the x- y-coordinates passed in that direction, in order, until the edge of the board
+    """
+    rays: list[dict[tuple[int, int], tuple[tuple[int, int], ...]]] = []
+    for square in range(NUM_SQUARES):
+        x, y = get_coord(square)
+        squareRays: dict[tuple[int, int], tuple[tuple[int, int], ...]] = {}
+        for dx, dy in QUEEN_DIRECTIONS:
+            ray: list[tuple[int, int]] = []
+            coord: tuple[int, int] = (x + dx, y + dy)
+            while is_in_bounds(coord):
+                ray.append(coord)
+                coord = (coord[0] + dx, coord[1] + dy)
+            squareRays[(dx, dy)] = tuple(ray)
+        rays.append(squareRays)
+    return rays
+
+def get_masks(targets: list[tuple[tuple[int, int], ...]]) -> list[int]:
+    """
+    Convert the targets of every square to bitboards.
+
+    Parameters:
+        targets (list[tuple[tuple[int, int], ...]]): x- y-coordinates reachable from each square
+
+    Returns:
+        list[int]: Bitboard of the targets of each square
+    """
+    masks: list[int] = []
+    for coords in targets:
+        mask: int = 0
+        for coord in coords:
+            mask |= get_bit(coord)
+        masks.append(mask)
+    return masks
+
+def get_nearest_square(blockers: int, direction: (int, int)) -> int:
+    """
+    Get the square of the blocker nearest to the start of a ray.
+
+    Parameters:
+        blockers (int): Bitboard of the pieces on the ray, must not be empty
+        direction ((int, int)): x- y-direction of the ray
+
+    Returns:
+        int: Index of the nearest blocker's square
+    """
+    # Square indices increase along the ray if the direction is positive, so the nearest blocker is the lowest bit
+    if direction[1] * BOARD_WIDTH + direction[0] > 0:
+        return (blockers & -blockers).bit_length() - 1
+    return blockers.bit_length() - 1
+
+# Tables indexed by square, built once at import
+KNIGHT_MOVES: list[tuple[tuple[int, int], ...]] = get_targets(KNIGHT_DIRECTIONS)
+KING_MOVES: list[tuple[tuple[int, int], ...]] = get_targets(KING_DIRECTIONS)
+
+# Pawn tables are indexed by colour, then square
+PAWN_ATTACKS: tuple[list[tuple[tuple[int, int], ...]], ...] = tuple(
+    get_targets(((-1, forward), (1, forward))) for forward in PAWN_DIRECTIONS
+)
+PAWN_PUSHES: tuple[list[tuple[tuple[int, int], ...]], ...] = tuple(
+    get_targets(((0, forward), (0, 2 * forward))) for forward in PAWN_DIRECTIONS
+)
+
+KNIGHT_ATTACK_MASKS: list[int] = get_masks(KNIGHT_MOVES)
+KING_ATTACK_MASKS: list[int] = get_masks(KING_MOVES)
+PAWN_ATTACK_MASKS: tuple[list[int], ...] = tuple(get_masks(attacks) for attacks in PAWN_ATTACKS)
+
+RAYS: list[dict[tuple[int, int], tuple[tuple[int, int], ...]]] = get_rays()
+RAY_MASKS: list[dict[tuple[int, int], int]] = [
+    {direction: get_masks([ray])[0] for direction, ray in squareRays.items()} for squareRays in RAYS
+]
@@ -0,0 +1,5 @@
+# Modules
+import os, sys
+
+# The modules are at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+# Modules
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Files
+from batch import analyse_batch, encode_squares, evaluate_batch
+from board import Board
+from evaluation import compute_evaluation, evaluate
+from notation import get_fen, load_fen
+from perft import POSITIONS, get_start_board
+
+# Random moves played from each standard position to reach the positions checked
+PLIES: int = 40
+
+@pytest.fixture(scope="module")
+def boards() -> list[Board]:
+    """ Positions reached by random games from the starting position and the standard test positions. """
+    generator: random.Random = random.Random(0)
+    fens: list[str] = []
+    for board in [get_start_board()] + [load_fen(fen) for fen, _ in POSITIONS.values()]:
+        fens.append(get_fen(board))
+        for _ in range(PLIES):
+            moves: list[tuple] = board.pieces[board.turn].get_legal_moves()
+            if not moves:
+                break
+            board.make_move(*generator.choice(moves))
+            fens.append(get_fen(board))
+    return [load_fen(fen) for fen in fens]
+
+def test_evaluate_batch(boards: list[Board]) -> None:
+    """ Batch scores match the scalar evaluation from the side to move. """
+    turns: np.ndarray = np.array([board.turn for board in boards], dtype=np.int8)
+    scores: np.ndarray = evaluate_batch(encode_squares(boards), turns)
+    assert scores.tolist() == [evaluate(board) for board in boards]
+
+def test_analyse_batch(boards: list[Board]) -> None:
+    """ Material and placement are from white's point of view, and the score from the side to move. """
+    features: dict[str, np.ndarray] = analyse_batch(boards)
+    midgame: list[int] = [compute_evaluation(board)[0] for board in boards]
+    assert (features["material"] + features["placement"]).tolist() == midgame
+    assert features["score"].tolist() == [evaluate(board) for board in boards]
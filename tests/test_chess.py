@@ -0,0 +1,23 @@
+# Modules
+import os
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+# Files
+from chess import HANDLED_EVENTS, filterEvents
+
+@pytest.fixture
+def display():
+    """ A display on the dummy video driver, so no window is opened. """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    yield pygame.display.set_mode((1, 1))
+    pygame.quit()
+
+def test_filter_events(display: pygame.Surface) -> None:
+    """ Only the event types handled by the game loop are queued. """
+    filterEvents()
+    assert pygame.event.get_blocked(pygame.MOUSEMOTION)
+    assert pygame.event.get_blocked(pygame.KEYDOWN)
+    assert not any(pygame.event.get_blocked(eventType) for eventType in HANDLED_EVENTS)
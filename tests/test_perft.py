@@ -0,0 +1,29 @@
+# Modules
+import pytest
+
+# Files
+from board import Board
+from notation import get_fen, load_fen
+from perft import POSITIONS, START_COUNTS, get_start_board, perft
+
+# Largest node count checked, so the suite stays quick
+MAX_NODES: int = 200000
+
+# Name, setup and expected count of each position and depth checked
+CASES: list[tuple[str, callable, int, int]] = [
+    ("start", get_start_board, depth, expected) for depth, expected in enumerate(START_COUNTS, 1) if expected <= MAX_NODES
+] + [
+    (name, lambda fen=fen: load_fen(fen), depth, expected)
+    for name, (fen, counts) in POSITIONS.items()
+    for depth, expected in enumerate(counts, 1) if expected <= MAX_NODES
+]
+
+@pytest.mark.parametrize("name, setup, depth, expected", CASES, ids=[f"{case[0]}-{case[2]}" for case in CASES])
+def test_perft(name: str, setup: callable, depth: int, expected: int) -> None:
+    """ Legal move generation reaches the published node counts, and leaves the board as it was. """
+    board: Board = setup()
+    fen: str = get_fen(board)
+    key: int = board.hash
+    assert perft(board, depth) == expected
+    assert get_fen(board) == fen
+    assert board.hash == key
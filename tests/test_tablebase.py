@@ -0,0 +1,157 @@
+# Modules
+import random
+import pytest
+
+# Files
+from board import Board
+from constants import BOARD_WIDTH, Colours, PieceTypes
+from notation import get_move_name, load_fen
+from tablebase import ENDGAMES, Outcome, Tablebases, generate, get_index, read_entry
+
+# Random positions of each endgame checked against their successors
+SAMPLES: int = 200
+
+WIN: int = Outcome.WIN.value
+LOSS: int = Outcome.LOSS.value
+DRAW: int = Outcome.DRAW.value
+
+# Tables each pawn promotion continues in
+PROMOTIONS: dict[int, str] = {PieceTypes.QUEEN.value: "KQK", PieceTypes.ROOK.value: "KRK"}
+
+@pytest.fixture(scope="module")
+def tablebases(tmp_path_factory: pytest.TempPathFactory) -> Tablebases:
+    """ Tables of every endgame, generated in order so the pawn table reads the queen and rook tables. """
+    directory: str = str(tmp_path_factory.mktemp("tablebases"))
+    for name in ENDGAMES:
+        generate(name, directory)
+    tables: Tablebases = Tablebases(directory)
+    yield tables
+    tables.close()
+
+def get_fen(squares: dict[int, str], turn: str) -> str:
+    """
+    Get the Forsyth-Edwards Notation of a position without castling or en passant.
+
+    Parameters:
+        squares (dict[int, str]): Letter of the piece on each occupied square, indexed from a8
+        turn (str): w or b
+
+    Returns:
+        str: Position in Forsyth-Edwards Notation
+    """
+    rows: list[str] = []
+    for row in range(8):
+        text, empty = "", 0
+        for column in range(8):
+            letter: str = squares.get(row * 8 + column)
+            if letter is None:
+                empty += 1
+                continue
+            text += (str(empty) if empty else "") + letter
+            empty = 0
+        rows.append(text + (str(empty) if empty else ""))
+    return f"{'/'.join(rows)} {turn} - - 0 1"
+
+def get_random_board(generator: random.Random, piece: str, black: bool = False, pawn_row: int = None) -> Board:
+    """
+    Set up a random placement of two kings and one other piece, which may not be legal.
+
+    Parameters:
+        generator (random.Random): Source of the placement
+        piece (str): Upper case letter of the stronger side's other piece
+        black (bool): Whether black is the stronger side
+        pawn_row (int): Row of the piece, indexed from rank 8, any row a pawn can be on if not given
+
+    Returns:
+        Board: Board holding the position
+    """
+    letters: str = "K" + piece + "k"
+    if black:
+        letters = letters.swapcase()
+    strongKing, weakKing = generator.sample(range(64), 2)
+    if piece == "P":
+        row: int = pawn_row if pawn_row is not None else generator.randrange(1, 7)
+        if black:
+            row = 7 - row
+        pieceSquare: int = row * BOARD_WIDTH + generator.randrange(BOARD_WIDTH)
+    else:
+        pieceSquare: int = generator.randrange(64)
+    return load_fen(get_fen({pieceSquare: letters[1], strongKing: letters[0], weakKing: letters[2]}, generator.choice("wb")))
+
+@pytest.mark.parametrize("fen, expected", [
+    ("k6R/8/1K6/8/8/8/8/8 b - - 0 1", (LOSS, 0)), # Checkmated
+    ("k7/7R/1K6/8/8/8/8/8 w - - 0 1", (WIN, 1)), # Mate in one
+    ("K6r/8/1k6/8/8/8/8/8 w - - 0 1", (LOSS, 0)), # Checkmated, with black as the stronger side
+    ("8/8/8/8/8/2K5/8/kR6 b - - 0 1", (DRAW, 0)) # The undefended rook is captured
+])
+def test_probe(tablebases: Tablebases, fen: str, expected: tuple[int, int]) -> None:
+    """ Known positions have their expected outcomes. """
+    assert tablebases.probe(load_fen(fen)) == expected
+
+@pytest.mark.parametrize("fen, expected", [
+    ("8/8/8/2k5/7P/8/8/K7 w - - 0 1", WIN), # The king is outside the pawn's square, so cannot catch it
+    ("8/8/8/3k4/7P/8/8/K7 w - - 0 1", DRAW), # The king steps into the pawn's square and catches it
+    ("k7/8/1K6/P7/8/8/8/8 w - - 0 1", DRAW), # The weaker king holds the rook pawn's promotion square
+    ("k7/8/1K6/P7/8/8/8/8 b - - 0 1", DRAW),
+    ("4k3/8/4K3/8/4P3/8/8/8 w - - 0 1", WIN), # The stronger king is on a key square of the pawn
+    ("4k3/8/4K3/8/4P3/8/8/8 b - - 0 1", LOSS),
+    ("8/8/8/8/4p3/4k3/8/4K3 b - - 0 1", WIN) # As above, with black as the stronger side
+])
+def test_probe_pawn(tablebases: Tablebases, fen: str, expected: int) -> None:
+    """ Known king and pawn endgames have their expected outcomes. """
+    result: tuple[int, int] = tablebases.probe(load_fen(fen))
+    assert result is not None and result[0] == expected
+
+def test_probe_outside_tables(tablebases: Tablebases) -> None:
+    """ Positions not in a table are not scored. """
+    assert tablebases.probe(load_fen("k7/8/1K6/8/8/8/8/7B w - - 0 1")) is None
+    assert tablebases.probe(load_fen("k7/8/1K6/8/8/8/8/6RR w - - 0 1")) is None
+
+@pytest.mark.parametrize("piece", ["Q", "R", "P"])
+def test_probe_successors(tablebases: Tablebases, piece: str) -> None:
+    """ Outcomes of random positions agree with the outcomes of the positions after each legal move. """
+    generator: random.Random = random.Random(0)
+    checked: int = 0
+    while checked < SAMPLES:
+        # Half the pawn positions are a move from promoting, so their successors are in the other tables
+        pawnRow: int = 1 if piece == "P" and checked % 2 else None
+        board: Board = get_random_board(generator, piece, generator.random() < 0.5, pawnRow)
+        result: tuple[int, int] = tablebases.probe(board)
+        if result is None:
+            continue
+        checked += 1
+
+        children: list[tuple[int, int]] = []
+        for move in board.pieces[board.turn].get_legal_moves():
+            board.make_move(*move)
+            children.append(tablebases.probe(board) or (DRAW, 0)) # Capturing the piece or promoting to a minor piece draws
+            board.unmake_move()
+
+        outcome, plies = result
+        if outcome == WIN:
+            assert min(childPlies for childOutcome, childPlies in children if childOutcome == LOSS) == plies - 1
+        elif outcome == LOSS:
+            assert all(childOutcome == WIN for childOutcome, _ in children)
+            assert max((childPlies for _, childPlies in children), default=-1) == plies - 1
+        else:
+            assert all(childOutcome != LOSS for childOutcome, _ in children)
+
+def test_promotions(tablebases: Tablebases) -> None:
+    """ The queen and rook table entries read for pawn promotions are those probed after the promotion. """
+    generator: random.Random = random.Random(0)
+    checked: int = 0
+    while checked < SAMPLES:
+        board: Board = get_random_board(generator, "P", pawn_row=1)
+        if board.turn != Colours.WHITE.value or tablebases.probe(board) is None:
+            continue
+        kings: list[int] = [board.pieces[colour.value].king.get_square() for colour in Colours]
+        for move in board.pieces[board.turn].get_legal_moves():
+            if len(move) < 3 or move[2] not in PROMOTIONS:
+                continue
+            name: str = PROMOTIONS[move[2]]
+            end: int = move[1][1] * BOARD_WIDTH + move[1][0]
+            entry: int = tablebases.read(name, get_index(ENDGAMES[name], 1, kings[0], kings[1], end))
+            board.make_move(*move)
+            assert tablebases.probe(board) == read_entry(entry), get_move_name(move)
+            board.unmake_move()
+            checked += 1
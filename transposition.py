@@ -0,0 +1,134 @@
+# Modules
+from array import array
+from enum import Enum
+
+# Bound types of stored scores
+class Bound(Enum):
+    EXACT: int = 1
+    LOWER: int = 2 # Score failed high, the true score is at least this
+    UPPER: int = 3 # Score failed low, the true score is at most this
+
+# Entries are a 64-bit key and 64 bits of packed data
+ENTRY_BYTES: int = 16
+BUCKET_SIZE: int = 2 # Depth-preferred slot then always-replace slot
+
+# Packed data layout, from the lowest bit
+MOVE_BITS: int = 16
+SCORE_SHIFT: int = MOVE_BITS
+SCORE_BITS: int = 32
+SCORE_OFFSET: int = 1 << (SCORE_BITS - 1) # Stored scores are offset to be positive
+DEPTH_SHIFT: int = SCORE_SHIFT + SCORE_BITS
+BOUND_SHIFT: int = DEPTH_SHIFT + 8
+GENERATION_SHIFT: int = BOUND_SHIFT + 2
+GENERATION_MASK: int = 0x3F
+
+class TranspositionTable(object):
+    """ Fixed size table of search results, keyed by position hash. """
+
+    def __init__(self, size_mb: float = 16) -> None:
+        """
+        Initialise the table, allocating all of its memory.
+
+        Parameters:
+            size_mb (float): Memory of the entries in megabytes, rounded down to a power of two number of buckets
+        """
+        buckets: int = max(1, int(size_mb * (1 << 20)) // (ENTRY_BYTES * BUCKET_SIZE))
+        self.buckets: int = 1 << (buckets.bit_length() - 1)
+        self.mask: int = self.buckets - 1
+
+        # Keys and data are in separate arrays, with the slots of each bucket next to each other
+        self.keys: array = array('Q', [0]) * (self.buckets * BUCKET_SIZE)
+        self.data: array = array('Q', [0]) * (self.buckets * BUCKET_SIZE)
+
+        # Entries from older searches are replaced first
+        self.generation: int = 0
+
+        # Statistics
+        self.probes: int = 0
+        self.hits: int = 0
+        self.stores: int = 0
+
+    def clear(self) -> None:
+        """ Remove every entry. """
+        slots: int = len(self.keys)
+        self.keys = array('Q', [0]) * slots
+        self.data = array('Q', [0]) * slots
+        self.generation = 0
+
+    def new_search(self) -> None:
+        """ Start a new search, making the existing entries older. """
+        self.generation = (self.generation + 1) & GENERATION_MASK
+
+    def get_hit_rate(self) -> float:
+        """
+        Get the proportion of probes that found an entry.
+
+        Returns:
+            float: Hits divided by probes
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def probe(self, key: int) -> tuple[int, int, int, int]:
+        """
+        Find the entry of a position.
+
+        Parameters:
+            key (int): Hash of the position
+
+        Returns:
+            tuple[int, int, int, int]: Depth, score, enum value of the bound and encoded best move,
+                or None if the position is not stored
+        """
+        self.probes += 1
+        index: int = (key & self.mask) * BUCKET_SIZE
+        for slot in range(index, index + BUCKET_SIZE):
+            if self.keys[slot] == key:
+                self.hits += 1
+                data: int = self.data[slot]
+                return (
+                    data >> DEPTH_SHIFT & 0xFF,
+                    (data >> SCORE_SHIFT & 0xFFFFFFFF) - SCORE_OFFSET,
+                    data >> BOUND_SHIFT & 0x3,
+                    data & 0xFFFF
+                )
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: int) -> None:
+        """
+        Store the result of searching a position.
+
+        Parameters:
+            key (int): Hash of the position
+            depth (int): Depth searched in plies
+            score (int): Score found
+            bound (int): Enum value of the score's bound
+            move (int): Encoded best move, or 0 if there is none
+        """
+        self.stores += 1
+        index: int = (key & self.mask) * BUCKET_SIZE
+
+        # Keep the deeper entry in the first slot, unless it is the same position or from an older search
+        current: int = self.data[index]
+        currentKey: int = self.keys[index]
+        if currentKey != key and depth < (current >> DEPTH_SHIFT & 0xFF) \
+                and (current >> GENERATION_SHIFT) == self.generation:
+            index += 1
+        elif currentKey != key and current:
+            # The replaced entry moves to the always-replace slot, where it is still found until replaced
+            if not move and self.keys[index + 1] == key:
+                move = self.data[index + 1] & 0xFFFF
+            self.keys[index + 1] = currentKey
+            self.data[index + 1] = current
+
+        # Keep the existing best move if the new search did not find one
+        if not move and self.keys[index] == key:
+            move = self.data[index] & 0xFFFF
+
+        self.keys[index] = key
+        self.data[index] = (
+            move
+            | (score + SCORE_OFFSET) << SCORE_SHIFT
+            | min(depth, 0xFF) << DEPTH_SHIFT
+            | bound << BOUND_SHIFT
+            | self.generation << GENERATION_SHIFT
+        )
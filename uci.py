@@ -0,0 +1,346 @@
+# Modules
+import argparse, asyncio, sys, time
+
+# Files
+from bitboard import decode_move
+from board import Board
+from constants import Colours
+from notation import get_move_name, load_fen, parse_move
+from perft import get_start_board
+from search import MATE_SCORE, MATE_THRESHOLD, Search
+from tablebase import Tablebases
+from transposition import TranspositionTable
+
+# Exceptions
+from exceptions import InvalidNotationException
+
+ENGINE_NAME: str = "python-chess"
+ENGINE_AUTHOR: str = "Keith Dao"
+
+# Hash option, in megabytes
+DEFAULT_HASH_MB: int = 16
+MAX_HASH_MB: int = 1024
+
+# Moves assumed to remain when the time control does not say
+DEFAULT_MOVES_TO_GO: int = 30
+
+# Share of the increment used on each move
+INCREMENT_SHARE: float = 0.75
+
+# Seconds kept back from each move for reading and writing commands
+MOVE_OVERHEAD: float = 0.05
+
+# Shortest time given to a move, in seconds
+MIN_MOVE_TIME: float = 0.01
+
+# Functions
+def allocate_time(remaining: int, increment: int = 0, moves_to_go: int = None) -> float:
+    """
+    Divide the remaining time between the moves left in the time control.
+
+    Parameters:
+        remaining (int): Milliseconds left on the clock
+        increment (int): Milliseconds added to the clock after each move
+        moves_to_go (int): Moves until the next time control, DEFAULT_MOVES_TO_GO if not given
+
+    Returns:
+        float: Seconds to search the move for
+    """
+    budget: float = remaining / (moves_to_go or DEFAULT_MOVES_TO_GO) + increment * INCREMENT_SHARE
+    budget = min(budget, remaining - MOVE_OVERHEAD * 1000)
+    return max(budget / 1000, MIN_MOVE_TIME)
+
+def get_score_name(score: int) -> str:
+    """
+    Get the UCI name of a score.
+
+    Parameters:
+        score (int): Score in centipawns from the point of view of the side to move
+
+    Returns:
+        str: Score in centipawns, such as cp 35, or moves to mate, such as mate -2
+    """
+    if abs(score) < MATE_THRESHOLD:
+        return f"cp {score}"
+    moves: int = (MATE_SCORE - abs(score) + 1) // 2
+    return f"mate {moves if score > 0 else -moves}"
+
+def parse_go(tokens: list[str]) -> dict[str, int]:
+    """
+    Read the arguments of a go command.
+
+    Parameters:
+        tokens (list[str]): Words after go
+
+    Returns:
+        dict[str, int]: Value of each argument given, with ponder and infinite set to 1 when given
+    """
+    arguments: dict[str, int] = {}
+    tokens = iter(tokens)
+    for token in tokens:
+        if token in ("ponder", "infinite"):
+            arguments[token] = 1
+        elif token in ("wtime", "btime", "winc", "binc", "movestogo", "movetime", "depth", "nodes", "mate"):
+            arguments[token] = int(next(tokens))
+    return arguments
+
+def write(line: str) -> None:
+    """
+    Send a line to the interface.
+
+    Parameters:
+        line (str): Line to send, without a newline
+    """
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+class UciEngine(object):
+    """
+    Runs the search under the Universal Chess Interface.
+    Commands are read while searching, so a search can be stopped, and can ponder on the opponent's time.
+    """
+
+    def __init__(self, hash_mb: int = DEFAULT_HASH_MB, tablebases: Tablebases = None) -> None:
+        """
+        Initialise the engine in the starting position.
+
+        Parameters:
+            hash_mb (int): Megabytes of memory for the transposition table
+            tablebases (Tablebases): Endgame tables to score positions in them exactly, none are used if not given
+        """
+        self.board: Board = get_start_board()
+        self.table: TranspositionTable = TranspositionTable(hash_mb)
+        self.tablebases: Tablebases = tablebases
+        self.search: Search = None
+        self.task: asyncio.Task = None # Running search, which sends its best move when done
+
+        # While pondering or searching infinitely, the best move is held until stop or ponderhit
+        self.waiting: bool = False
+        self.released: asyncio.Event = None
+        self.ponder_time: float = None # Seconds to search for once a ponder move is played
+
+    async def run(self) -> None:
+        """ Read and act on commands until quit or the end of the input. """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.released = asyncio.Event()
+        while True:
+            line: str = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line or not await self.handle(line.split()):
+                break
+        await self.stop()
+
+    async def handle(self, tokens: list[str]) -> bool:
+        """
+        Act on a command.
+
+        Parameters:
+            tokens (list[str]): Words of the command
+
+        Returns:
+            bool: False if the command was quit, else true
+        """
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+        try:
+            if command == "uci":
+                write(f"id name {ENGINE_NAME}")
+                write(f"id author {ENGINE_AUTHOR}")
+                write(f"option name Hash type spin default {DEFAULT_HASH_MB} min 1 max {MAX_HASH_MB}")
+                write("option name Ponder type check default false")
+                write("option name TablebasePath type string default <empty>")
+                write("uciok")
+            elif command == "isready":
+                write("readyok")
+            elif command == "ucinewgame":
+                await self.stop()
+                await asyncio.get_running_loop().run_in_executor(None, self.table.clear)
+            elif command == "setoption":
+                await self.stop()
+                self.set_option(arguments)
+            elif command == "position":
+                await self.stop()
+                self.set_position(arguments)
+            elif command == "go":
+                await self.stop()
+                self.go(parse_go(arguments))
+            elif command == "stop":
+                await self.stop()
+            elif command == "ponderhit":
+                self.ponder_hit()
+            elif command == "quit":
+                return False
+            else:
+                write(f"info string Unknown command {command}")
+        except (ValueError, StopIteration, InvalidNotationException) as error:
+            write(f"info string Invalid command: {getattr(error, 'message', error)}")
+        return True
+
+    def set_option(self, arguments: list[str]) -> None:
+        """
+        Change an option.
+
+        Parameters:
+            arguments (list[str]): Words after setoption, as name <name> value <value>
+
+        Raises:
+            ValueError: If the value is not valid for the option
+        """
+        text: str = " ".join(arguments)
+        name, _, value = text.removeprefix("name ").partition(" value ")
+        name = name.strip().lower()
+        if name == "hash":
+            self.table = TranspositionTable(min(max(int(value), 1), MAX_HASH_MB))
+        elif name == "tablebasepath":
+            if self.tablebases is not None:
+                self.tablebases.close()
+            self.tablebases = Tablebases(value.strip()) if value.strip() not in ("", "<empty>") else None
+
+    def set_position(self, arguments: list[str]) -> None:
+        """
+        Set up a position.
+
+        Parameters:
+            arguments (list[str]): Words after position, as startpos or fen <fen>, then optionally moves <moves>
+
+        Raises:
+            InvalidNotationException: If the position or a move is not valid
+        """
+        if "moves" in arguments:
+            index: int = arguments.index("moves")
+            arguments, moves = arguments[:index], arguments[index + 1:]
+        else:
+            moves: list[str] = []
+
+        board: Board = get_start_board() if arguments[:1] == ["startpos"] else load_fen(" ".join(arguments[1:]))
+        for name in moves:
+            move: tuple = parse_move(name)
+            if move not in board.pieces[board.turn].get_legal_moves():
+                raise InvalidNotationException(name)
+            board.make_move(*move)
+        self.board = board
+
+    def go(self, arguments: dict[str, int]) -> None:
+        """
+        Start searching the position, without waiting for the search to end.
+
+        Parameters:
+            arguments (dict[str, int]): Arguments of the go command
+        """
+        white: bool = self.board.turn == Colours.WHITE.value
+        maxTime: float = None
+        if "movetime" in arguments:
+            maxTime = max(arguments["movetime"] / 1000 - MOVE_OVERHEAD, MIN_MOVE_TIME)
+        elif ("wtime" if white else "btime") in arguments:
+            maxTime = allocate_time(
+                arguments["wtime" if white else "btime"], arguments.get("winc" if white else "binc", 0),
+                arguments.get("movestogo")
+            )
+
+        # Ponder without a time limit, which starts once the opponent plays the ponder move
+        self.waiting = "ponder" in arguments or "infinite" in arguments
+        self.ponder_time = maxTime if "ponder" in arguments else None
+        if self.waiting:
+            maxTime = None
+        self.released.clear()
+
+        depth: int = arguments.get("depth")
+        if "mate" in arguments:
+            depth = arguments["mate"] * 2 - 1 if depth is None else min(depth, arguments["mate"] * 2 - 1)
+        self.search = Search(self.board, depth, maxTime, arguments.get("nodes"), self.send_info, self.table,
+                             self.tablebases)
+        self.task = asyncio.get_running_loop().create_task(self.run_search(self.search))
+
+    async def run_search(self, search: Search) -> None:
+        """
+        Search in a thread, so commands are still read, then send the best move.
+
+        Parameters:
+            search (Search): Search to run
+        """
+        move, _ = await asyncio.get_running_loop().run_in_executor(None, search.search)
+
+        # A search that ends on its own while pondering or searching infinitely waits to be told to stop
+        if self.waiting:
+            await self.released.wait()
+
+        if move is None:
+            write("bestmove 0000")
+            return
+        ponderMove: tuple = self.get_ponder_move(move)
+        if ponderMove is None:
+            write(f"bestmove {get_move_name(move)}")
+        else:
+            write(f"bestmove {get_move_name(move)} ponder {get_move_name(ponderMove)}")
+
+    async def stop(self) -> None:
+        """ Stop the search, if there is one, and wait for its best move to be sent. """
+        if self.task is None:
+            return
+        self.waiting = False
+        self.released.set()
+        self.search.stop()
+        await self.task
+        self.task = None
+
+    def ponder_hit(self) -> None:
+        """ Continue the ponder search as a normal search, now the opponent has played the ponder move. """
+        if self.task is None or not self.waiting:
+            return
+        self.waiting = False
+        self.released.set()
+        if self.ponder_time is not None:
+            # The limit counts from the start of the search, so time spent pondering is added
+            self.search.max_time = time.perf_counter() - self.search.start_time + self.ponder_time
+
+    def send_info(self, depth: int, score: int, nodes: int, nps: float, move: tuple) -> None:
+        """
+        Send the result of a completed iteration of the search.
+
+        Parameters:
+            depth (int): Depth of the iteration
+            score (int): Score of the best move
+            nodes (int): Nodes searched so far
+            nps (float): Nodes searched per second
+            move (tuple): Best move
+        """
+        write(
+            f"info depth {depth} score {get_score_name(score)} nodes {nodes} nps {int(nps)} "
+            f"time {int(self.search.elapsed * 1000)} pv {get_move_name(move)}"
+        )
+
+    def get_ponder_move(self, move: tuple) -> tuple:
+        """
+        Get the expected reply to a move, from the transposition table.
+
+        Parameters:
+            move (tuple): Move the engine plays
+
+        Returns:
+            tuple: Legal reply stored as the best move of the position after the move, or None if there is none
+        """
+        reply: tuple = None
+        self.board.make_move(*move)
+        entry: tuple[int, int, int, int] = self.table.probe(self.board.hash)
+        if entry is not None and entry[3]:
+            stored: tuple = decode_move(entry[3])
+            if stored in self.board.pieces[self.board.turn].get_legal_moves():
+                reply = stored
+        self.board.unmake_move()
+        return reply
+
+def main() -> None:
+    """ Run the engine under the Universal Chess Interface, reading commands from standard input. """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Run the engine under the Universal Chess Interface.")
+    parser.add_argument("--hash", type=int, default=DEFAULT_HASH_MB, help="megabytes of memory for the transposition table")
+    parser.add_argument("--tablebases", help="directory of the endgame tables, none are used if not given")
+    args: argparse.Namespace = parser.parse_args()
+
+    tablebases: Tablebases = Tablebases(args.tablebases) if args.tablebases else None
+    try:
+        asyncio.run(UciEngine(args.hash, tablebases).run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Modules
+import random
+
+# Files
+from bitboard import NUM_COLOURS, NUM_PIECE_TYPES
+from constants import BOARD_HEIGHT, BOARD_WIDTH, CastlingRights
+
+# Seed for the keys, fixed so hashes are the same across processes and runs
+SEED: int = 0x5EED
+
+# Functions
+def get_keys() -> tuple[list[list[list[int]]], int, list[int], list[int]]:
+    """
+    Generate the random 64-bit keys that make up a position's hash.
+
+    Returns:
+        tuple[list[list[list[int]]], int, list[int], list[int]]: Keys of each piece indexed by colour, piece type then square,
+            key of black to move, keys of each combination of castling rights and keys of each en passant column
+    """
+    generator: random.Random = random.Random(SEED)
+    pieceKeys: list[list[list[int]]] = [
+        [[generator.getrandbits(64) for _ in range(BOARD_WIDTH * BOARD_HEIGHT)] for _ in range(NUM_PIECE_TYPES)]
+        for _ in range(NUM_COLOURS)
+    ]
+    sideKey: int = generator.getrandbits(64)
+
+    # Each castling right has a key, combined for every set of rights
+    rightKeys: dict[int, int] = {right.value: generator.getrandbits(64) for right in CastlingRights}
+    castlingKeys: list[int] = []
+    for rights in range(1 << len(CastlingRights)):
+        key: int = 0
+        for right, rightKey in rightKeys.items():
+            if rights & right:
+                key ^= rightKey
+        castlingKeys.append(key)
+
+    enPassantKeys: list[int] = [generator.getrandbits(64) for _ in range(BOARD_WIDTH)]
+    return pieceKeys, sideKey, castlingKeys, enPassantKeys
+
+PIECE_KEYS, SIDE_KEY, CASTLING_KEYS, EN_PASSANT_KEYS = get_keys()